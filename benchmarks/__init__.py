@@ -0,0 +1,4 @@
+"""Performance benchmarks of the vault's hot paths.
+
+Run from the repository root with python -m benchmarks. See README.md.
+"""
@@ -0,0 +1,102 @@
+"""Entry point of python -m benchmarks."""
+
+import argparse
+import json
+import os
+import sys
+
+try:
+    import network_saver
+except ImportError:
+    sys.path.insert(
+        0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'python')
+    )
+
+import network_saver.storage
+
+import benchmarks.run
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build command line parser.
+
+    Returns:
+        argparse.ArgumentParser: Parser of benchmark options.
+    """
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Time the vault on a synthetic vault.'
+    )
+    parser.add_argument('--users', type=int, default=10, help='Users.')
+    parser.add_argument(
+        '--networks', type=int, default=100, help='Networks per user.'
+    )
+    parser.add_argument(
+        '--cpio-size', type=int, default=16 * 1024,
+        help='Approximate CPIO file size in bytes.'
+    )
+    parser.add_argument(
+        '--notes-length', type=int, default=80,
+        help='Approximate description length in characters.'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='Runs per timing.'
+    )
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    parser.add_argument(
+        '--compression', choices=network_saver.storage.COMPRESSIONS,
+        help='Compression to store generated networks with.'
+    )
+    parser.add_argument(
+        '--deduplicate', action='store_true',
+        help='Store generated networks in the object store.'
+    )
+    parser.add_argument(
+        '--vault', help='Benchmark a copy of this vault instead of generating one.'
+    )
+    parser.add_argument('--output', help='File to write json results to.')
+    parser.add_argument(
+        '--compare', help='Json results of a previous run to compare against.'
+    )
+    return parser
+
+
+def main(argv: list[str]=None) -> int:
+    """Run benchmarks.
+
+    Args:
+        argv list: Command line arguments, defaults to sys.argv.
+    Returns:
+        int: Exit code, 1 if comparing found a regression.
+    """
+
+    args: argparse.Namespace = build_parser().parse_args(argv)
+    settings: dict = dict()
+    if args.compression:
+        settings['compression'] = args.compression
+    if args.deduplicate:
+        settings['deduplicate'] = True
+
+    results: dict = benchmarks.run.run(
+        users=args.users, networks=args.networks, cpio_size=args.cpio_size,
+        notes_length=args.notes_length, repeat=args.repeat,
+        vault_dir=args.vault, settings=settings, seed=args.seed
+    )
+    if args.output:
+        with open(args.output, 'w') as output_f:
+            json.dump(results, output_f, indent=4)
+
+    if args.compare:
+        with open(args.compare, 'r') as baseline_f:
+            baseline: dict = json.load(baseline_f)
+        lines: list[str] = benchmarks.run.compare(baseline, results)
+    else:
+        lines = benchmarks.run.compare(dict(results=dict()), results)
+    for line in lines:
+        print(line)
+    return int(any(line.endswith('REGRESSION') for line in lines))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
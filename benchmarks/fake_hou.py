@@ -0,0 +1,35 @@
+"""Local stand-in for the hou calls made on the save and load paths.
+
+Copying writes the synthetic CPIO of the "selected" network to
+$HOUDINI_TEMP_DIR the way Houdini does, and pasting reads it back, so the
+file I/O around them can be timed outside of Houdini.
+"""
+
+import os
+
+
+class Node(object):
+    """Stand-in for a node selected in, or the root of, a network editor."""
+    def __init__(self, context: str, cpio: bytes=b'') -> None:
+        self.context: str = context
+        self.cpio: bytes = cpio
+
+
+def applicationVersionString() -> str:
+    return '20.0.506'
+
+
+def _get_clipboard_file(context: str) -> str:
+    return os.path.join(
+        os.environ['HOUDINI_TEMP_DIR'], '{}_copy.cpio'.format(context)
+    )
+
+
+def copyNodesToClipboard(nodes: list[Node]) -> None:
+    with open(_get_clipboard_file(nodes[0].context), 'wb') as clipboard_f:
+        clipboard_f.write(nodes[0].cpio)
+
+
+def pasteNodesFromClipboard(network: Node) -> int:
+    with open(_get_clipboard_file(network.context), 'rb') as clipboard_f:
+        return len(clipboard_f.read())
@@ -0,0 +1,166 @@
+"""Generator of synthetic vaults shaped like tests/fixtures/_test.
+
+Each user folder holds a networks.json and one <network>.cpio per network.
+CPIO files are HouNC record streams with a node_type record followed by
+.init/.def/.parm records per node, padded out to the requested size with
+parameter data, so they exercise the same code paths as real clipboard
+dumps.
+"""
+
+import json
+import os
+import random
+import string
+
+RECORD_MAGIC = b'HouNC\x1a'
+
+CONTEXTS = ('OBJ', 'SOP', 'DOP', 'LOP', 'VOP', 'COP2')
+CATEGORIES = {
+    'OBJ': ('Object', 'geo'),
+    'SOP': ('Sop', 'attribwrangle'),
+    'DOP': ('Dop', 'pyrosolver'),
+    'LOP': ('Lop', 'sopimport'),
+    'VOP': ('Vop', 'bind'),
+    'COP2': ('Cop2', 'blur')
+}
+VERSIONS = ('19.5.435', '19.5.640', '20.0.506', '20.0.590')
+WORDS = (
+    'pyro', 'smoke', 'fire', 'flip', 'tank', 'ocean', 'rig', 'crowd', 'rbd',
+    'debris', 'vellum', 'cloth', 'hair', 'terrain', 'scatter', 'instance',
+    'shot', 'setup', 'library', 'wip', 'final', 'lookdev', 'cache', 'sim'
+)
+
+NODE_SIZE = 2048
+
+
+def _record(name: str, data: bytes, rng: random.Random) -> bytes:
+    """Build single HouNC record.
+
+    Args:
+        name string: Record name.
+        data bytes: Record data.
+        rng random.Random: Random source for the header.
+    Returns:
+        bytes: Record.
+    """
+
+    header: bytes = ''.join(rng.choice('0123456789abcdef') for _ in range(28)).encode()
+    return RECORD_MAGIC + header + name.encode() + b'\0' + data
+
+
+def make_cpio(context: str, size: int, rng: random.Random) -> bytes:
+    """Build synthetic CPIO contents.
+
+    Args:
+        context string: Network category, one of CONTEXTS.
+        size int: Approximate size in bytes.
+        rng random.Random: Random source.
+    Returns:
+        bytes: Raw CPIO contents.
+    """
+
+    category, node_type = CATEGORIES[context]
+    records: list[bytes] = [_record('node_type', category.encode() + b'\n', rng)]
+    total: int = len(records[0])
+    index: int = 0
+    while total < size:
+        index += 1
+        node: str = '{}{}'.format(node_type, index)
+        position: bytes = 'position {:.5f} {:.5f}\n'.format(
+            rng.uniform(-20, 20), rng.uniform(-20, 20)
+        ).encode()
+        parm: bytes = ''.join(
+            '{} [ 0 locks=0 ] ( {:.6f} )\n'.format(
+                rng.choice(WORDS), rng.random()
+            ) for _ in range(max(1, min(NODE_SIZE, size - total) // 32))
+        ).encode()
+        for record in (
+                _record(node + '.init', 'type = {}\nmatchesdef = 0\n'.format(
+                    node_type
+                ).encode(), rng),
+                _record(node + '.def', b'comment ""\n' + position, rng),
+                _record(node + '.parm', b'{\nversion 0.8\n' + parm + b'}\n', rng)
+            ):
+            records.append(record)
+            total += len(record)
+    return b''.join(records)
+
+
+def make_notes(length: int, rng: random.Random) -> str:
+    """Build synthetic network description.
+
+    Args:
+        length int: Approximate length in characters.
+        rng random.Random: Random source.
+    Returns:
+        str: Description.
+    """
+
+    words: list[str] = list()
+    total: int = 0
+    while total < length:
+        word: str = rng.choice(WORDS)
+        words.append(word)
+        total += len(word) + 1
+    return ' '.join(words)[:length]
+
+
+def make_network_name(index: int, rng: random.Random) -> str:
+    """Build synthetic, unique network name.
+
+    Args:
+        index int: Unique index of network within its user.
+        rng random.Random: Random source.
+    Returns:
+        str: Network name.
+    """
+
+    return '{}_{}_{}'.format(rng.choice(WORDS), rng.choice(WORDS), index)
+
+
+def generate_vault(
+        vault_dir: str, users: int=10, networks: int=100,
+        cpio_size: int=16 * 1024, notes_length: int=80, seed: int=0
+    ) -> dict:
+    """Write synthetic vault of users x networks.
+
+    Args:
+        vault_dir string: Path-like object representing vault to create.
+        users int: Number of users.
+        networks int: Number of networks per user.
+        cpio_size int: Approximate size of each CPIO file in bytes.
+        notes_length int: Approximate length of each description.
+        seed int: Seed making the vault reproducible.
+    Returns:
+        dict: Map of user names to their networks.json contents.
+    """
+
+    rng: random.Random = random.Random(seed)
+    # a handful of distinct CPIO files per context, as real vaults hold many
+    # variants of the same setups
+    cpio_pool: dict[str, list[bytes]] = {
+        context: [make_cpio(context, cpio_size, rng) for _ in range(4)]
+        for context in CONTEXTS
+    }
+    vault: dict[str, dict] = dict()
+    for user_index in range(users):
+        user: str = 'user_{}'.format(
+            ''.join(rng.choice(string.ascii_lowercase) for _ in range(6))
+        ) + str(user_index)
+        user_dir: str = os.path.join(vault_dir, user)
+        os.makedirs(user_dir, exist_ok=True)
+        data: dict[str, dict] = dict()
+        for network_index in range(networks):
+            name: str = make_network_name(network_index, rng)
+            context: str = rng.choice(CONTEXTS)
+            data[name] = {
+                'context': context,
+                'notes': make_notes(notes_length, rng),
+                'version': rng.choice(VERSIONS)
+            }
+            with open(os.path.join(user_dir, name + '.cpio'), 'wb') as cpio_f:
+                cpio_f.write(rng.choice(cpio_pool[context]))
+        with open(os.path.join(user_dir, 'networks.json'), 'w') as vault_f:
+            json.dump(data, vault_f, indent=4)
+        vault[user] = data
+    return vault
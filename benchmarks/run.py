@@ -0,0 +1,379 @@
+"""Timings of the vault's hot paths over a synthetic vault.
+
+Each benchmark mirrors what the GUIs do, with hou calls replaced by the
+local stand-in:
+
+    read_network_vault  parse every user's vault json
+    list_users          what NetLoadDialog._populate_users lists
+    list_networks       what NetLoadDialog.refresh_networks lists, per user
+    search              build the vault's search index, then query it
+    save                NetSaveDialog.save_network, copy to vault json entry
+    delete              NetLoadDialog.remove_network
+    load_staging        fetch a network file for pasting, then paste it
+
+Cold runs drop the in-process caches, the catalog and the local cache
+first. The OS file cache is left alone, so cold runs against a local disk
+understate what a share costs.
+"""
+
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+import network_saver.catalog
+import network_saver.local_cache
+import network_saver.search
+import network_saver.storage
+import network_saver.utility
+
+import benchmarks.fake_hou
+import benchmarks.generate
+
+QUERIES = ('pyro', 'smoke sim', 'f', 'lib wip', 'sop 20', 'nothing_matches')
+
+REGRESSION_RATIO = 1.2
+
+
+def _summarize(times: list[float]) -> dict:
+    """Summarize durations of repeated runs.
+
+    Args:
+        times list: Durations in seconds.
+    Returns:
+        dict: Run count and min, median, mean and max durations in ms.
+    """
+
+    return {
+        'runs': len(times),
+        'min': min(times) * 1000,
+        'median': statistics.median(times) * 1000,
+        'mean': statistics.mean(times) * 1000,
+        'max': max(times) * 1000
+    }
+
+
+def timed(func, repeat: int=5, setup=None) -> dict:
+    """Time given function.
+
+    Args:
+        func callable: Function to time.
+        repeat int: Number of runs.
+        setup callable: Function run untimed before every run.
+    Returns:
+        dict: Summary of durations.
+    """
+
+    times: list[float] = list()
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start: float = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return _summarize(times)
+
+
+def drop_caches(vault_dir: str) -> None:
+    """Drop in-process caches and the catalog of given vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    network_saver.utility.invalidate_vault_cache()
+    network_saver.search.drop_index(vault_dir)
+    catalog_file: str = network_saver.catalog.get_catalog_file(vault_dir)
+    if os.path.isfile(catalog_file):
+        os.remove(catalog_file)
+
+
+def bench_reads(vault_dir: str, users: list[str], repeat: int) -> dict:
+    """Time listing and parsing paths, cold and warm."""
+
+    vault_files: list[str] = [
+        network_saver.utility.get_vault_file(user=user, vault_dir=vault_dir)
+        for user in users
+    ]
+
+    def read_all():
+        for vault_file in vault_files:
+            network_saver.utility.read_network_vault(vault_file, 'r')
+
+    def list_all():
+        for user in users:
+            network_saver.catalog.list_networks(user=user, vault_dir=vault_dir)
+
+    def list_users():
+        network_saver.catalog.list_users(vault_dir)
+
+    results: dict = dict()
+    for name, func in (
+            ('read_network_vault', read_all),
+            ('list_users', list_users),
+            ('list_networks', list_all)
+        ):
+        results[name] = {
+            'cold': timed(func, repeat, lambda: drop_caches(vault_dir)),
+            'warm': timed(func, repeat)
+        }
+    return results
+
+
+def bench_search(vault_dir: str, repeat: int) -> dict:
+    """Time building the search index and querying it."""
+
+    cold: dict = timed(
+        lambda: network_saver.search.index_vault(vault_dir), repeat,
+        lambda: drop_caches(vault_dir)
+    )
+    index: network_saver.search.SearchIndex = \
+        network_saver.search.index_vault(vault_dir)
+    times: list[float] = list()
+    for _ in range(repeat):
+        for query in QUERIES:
+            start: float = time.perf_counter()
+            index.search(query)
+            times.append(time.perf_counter() - start)
+    return {'search': {'cold': cold, 'warm': _summarize(times)}}
+
+
+def bench_save_delete(
+        vault_dir: str, temp_dir: str, count: int, cpio_size: int
+    ) -> dict:
+    """Time saving networks to, then removing them from, a fresh user."""
+
+    user: str = 'bench_user'
+    vault_file: str = network_saver.utility.get_vault_file(
+        user=user, vault_dir=vault_dir
+    )
+    cpio: bytes = benchmarks.generate.make_cpio(
+        'SOP', cpio_size, random.Random(1)
+    )
+    selection: list = [benchmarks.fake_hou.Node('SOP', cpio)]
+    names: list[str] = ['bench_network_{}'.format(index) for index in range(count)]
+
+    save_times: list[float] = list()
+    for name in names:
+        start: float = time.perf_counter()
+        network_saver.utility.read_network_vault(vault_file, 'w')
+        network_data: dict = {
+            'context': 'SOP', 'notes': 'benchmark',
+            'version': benchmarks.fake_hou.applicationVersionString()
+        }
+        benchmarks.fake_hou.copyNodesToClipboard(selection)
+        network_saver.storage.store_network_file(
+            os.path.join(temp_dir, 'SOP_copy.cpio'),
+            os.path.join(vault_dir, user, name + '.cpio'),
+            compression=network_saver.storage.get_compression(vault_dir),
+            deduplicate=network_saver.storage.is_deduplicated(vault_dir),
+            vault_dir=vault_dir
+        )
+        network_saver.utility.put_network_data(
+            name, network_data, user=user, vault_dir=vault_dir
+        )
+        save_times.append(time.perf_counter() - start)
+
+    delete_times: list[float] = list()
+    for name in names:
+        start: float = time.perf_counter()
+        network_saver.utility.delete_network_data(
+            name, user=user, vault_dir=vault_dir
+        )
+        network_saver.utility.remove_cpio_file(
+            name, user=user, vault_dir=vault_dir
+        )
+        delete_times.append(time.perf_counter() - start)
+
+    shutil.rmtree(os.path.join(vault_dir, user))
+    return {
+        'save': {'warm': _summarize(save_times)},
+        'delete': {'warm': _summarize(delete_times)}
+    }
+
+
+def bench_load_staging(
+        vault_dir: str, temp_dir: str, vault: dict, count: int
+    ) -> dict:
+    """Time fetching network files for pasting, cold and warm."""
+
+    targets: list[tuple] = [
+        (user, name, data['context'])
+        for user, networks in vault.items()
+        for name, data in networks.items()
+    ][:count]
+    cache: network_saver.local_cache.LocalCache = \
+        network_saver.local_cache.LocalCache(
+            cache_dir=os.path.join(temp_dir, 'local_cache')
+        )
+
+    def stage_all():
+        for user, name, context in targets:
+            cache.extract(
+                os.path.join(vault_dir, user, name + '.cpio'),
+                os.path.join(temp_dir, '{}_copy.cpio'.format(context)),
+                vault_dir=vault_dir
+            )
+            benchmarks.fake_hou.pasteNodesFromClipboard(
+                benchmarks.fake_hou.Node(context)
+            )
+
+    return {'load_staging': {
+        'cold': timed(stage_all, 1, cache.clear),
+        'warm': timed(stage_all, 1)
+    }}
+
+
+def _restore_vault(vault_dir: str, vault: dict, settings: dict) -> None:
+    """Apply given settings to generated vault, re-storing its network files.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+        vault dict: Map of user names to their networks.json contents.
+        settings dict: Vault settings.
+    """
+
+    internal_dir: str = network_saver.utility.get_internal_dir(vault_dir)
+    os.makedirs(internal_dir, exist_ok=True)
+    with open(os.path.join(internal_dir, 'settings.json'), 'w') as settings_f:
+        json.dump(settings, settings_f)
+    for user, data in vault.items():
+        for network_name in data:
+            network_file: str = os.path.join(
+                vault_dir, user, network_name + '.cpio'
+            )
+            network_saver.storage.store_network_file(
+                network_file, network_file,
+                compression=settings.get('compression', 'none'),
+                deduplicate=settings.get('deduplicate', False),
+                vault_dir=vault_dir
+            )
+
+
+def get_version() -> str:
+    """Describe version of the code being benchmarked.
+
+    Returns:
+        str: Output of git describe, or 'unknown' outside of a checkout.
+    """
+
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'],
+            cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(
+        users: int=10, networks: int=100, cpio_size: int=16 * 1024,
+        notes_length: int=80, repeat: int=5, vault_dir: str=None,
+        settings: dict=None, seed: int=0
+    ) -> dict:
+    """Generate a synthetic vault, unless given one, and time every path.
+
+    Args:
+        users int: Number of users to generate.
+        networks int: Number of networks per user to generate.
+        cpio_size int: Approximate size of each CPIO file in bytes.
+        notes_length int: Approximate length of each description.
+        repeat int: Number of runs per timing.
+        vault_dir string: Path-like object representing existing vault to
+                          benchmark a copy of instead of generating one.
+        settings dict: Vault settings to store generated networks with.
+        seed int: Seed making the vault reproducible.
+    Returns:
+        dict: Benchmark parameters and timings in ms.
+    """
+
+    temp_dir: str = tempfile.mkdtemp(prefix='network_vault_bench_')
+    old_temp_dir: str = os.environ.get('HOUDINI_TEMP_DIR')
+    os.environ['HOUDINI_TEMP_DIR'] = temp_dir
+    try:
+        start: float = time.perf_counter()
+        if vault_dir is None:
+            vault_dir = os.path.join(temp_dir, 'vault')
+            vault: dict = benchmarks.generate.generate_vault(
+                vault_dir, users=users, networks=networks, cpio_size=cpio_size,
+                notes_length=notes_length, seed=seed
+            )
+            if settings:
+                _restore_vault(vault_dir, vault, settings)
+        else:
+            # never benchmark a live vault in place, the runs write to it
+            vault_dir = shutil.copytree(
+                vault_dir, os.path.join(temp_dir, 'vault')
+            )
+            vault = {
+                user: network_saver.utility.read_user_data(user, vault_dir)
+                for user in network_saver.utility.list_user_dirs(vault_dir)
+            }
+        generate_time: float = time.perf_counter() - start
+
+        results: dict = dict()
+        results.update(bench_reads(vault_dir, list(vault), repeat))
+        results.update(bench_search(vault_dir, repeat))
+        results.update(bench_save_delete(
+            vault_dir, temp_dir, max(repeat, 10), cpio_size
+        ))
+        results.update(bench_load_staging(
+            vault_dir, temp_dir, vault, max(repeat, 20)
+        ))
+        return {
+            'version': get_version(),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'parameters': {
+                'users': len(vault),
+                'networks': sum(len(data) for data in vault.values()),
+                'cpio_size': cpio_size,
+                'notes_length': notes_length,
+                'repeat': repeat,
+                'settings': settings or dict(),
+                'generate_seconds': generate_time
+            },
+            'results': results
+        }
+    finally:
+        if old_temp_dir is None:
+            del os.environ['HOUDINI_TEMP_DIR']
+        else:
+            os.environ['HOUDINI_TEMP_DIR'] = old_temp_dir
+        network_saver.utility.invalidate_vault_cache()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def compare(old: dict, new: dict, ratio: float=REGRESSION_RATIO) -> list[str]:
+    """Compare median timings of two benchmark runs.
+
+    Args:
+        old dict: Results of baseline run.
+        new dict: Results of run to check.
+        ratio float: Slowdown past which a timing counts as a regression.
+    Returns:
+        list: Lines describing each timing, regressions flagged.
+    """
+
+    lines: list[str] = list()
+    for name, phases in new['results'].items():
+        for phase, summary in phases.items():
+            baseline: dict = old['results'].get(name, dict()).get(phase)
+            if baseline is None:
+                lines.append('{:<20} {:<5} {:>10.3f} ms (new)'.format(
+                    name, phase, summary['median']
+                ))
+                continue
+            change: float = summary['median'] / max(baseline['median'], 1e-6)
+            lines.append('{:<20} {:<5} {:>10.3f} -> {:>10.3f} ms x{:.2f}{}'.format(
+                name, phase, baseline['median'], summary['median'], change,
+                '  REGRESSION' if change > ratio else ''
+            ))
+    return lines
@@ -0,0 +1,8 @@
+"""Entry point of python -m network_saver."""
+
+import sys
+
+import network_saver.cli
+
+if __name__ == '__main__':
+    sys.exit(network_saver.cli.main())
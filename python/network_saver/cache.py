@@ -0,0 +1,135 @@
+"""In-process cache of parsed vault files, validated against their stamps."""
+
+from collections import OrderedDict
+import os
+import threading
+
+MAX_ENTRIES = 64
+
+
+def _copy(data: dict) -> dict:
+    """Copy parsed vault data deep enough that callers may freely mutate it.
+
+    Vault data maps network names to flat dicts of strings, so copying two
+    levels down is a full copy at a fraction of the cost of copy.deepcopy.
+
+    Args:
+        data dict: Parsed vault data.
+    Returns:
+        dict: Independent copy of given data.
+    """
+
+    return {
+        key: dict(value) if isinstance(value, dict) else value
+        for key, value in data.items()
+    }
+
+
+class StampedCache(object):
+    """Bounded LRU cache of parsed files keyed by path.
+
+    Entries are only served while the stamp they were stored under still
+    matches the stamp of the file on disk.
+    """
+    def __init__(self, max_entries: int=MAX_ENTRIES) -> None:
+        """Initializes cache.
+
+        Args:
+            max_entries int: Number of files kept before evicting the least
+                             recently used one.
+        """
+
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        """Normalize given path so aliases share a single entry."""
+
+        return os.path.normcase(os.path.abspath(path))
+
+    def get(self, path: str, stamp: str) -> dict:
+        """Fetch copy of cached data for given path.
+
+        Args:
+            path string: Path-like object representing cached file.
+            stamp string: Current stamp of given file.
+        Returns:
+            dict: Cached data, or None if missing or stale.
+        """
+
+        key: str = self._key(path)
+        with self._lock:
+            entry: tuple = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != stamp:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return _copy(entry[1])
+
+    def put(self, path: str, stamp: str, data: dict) -> None:
+        """Store copy of given data for given path.
+
+        Args:
+            path string: Path-like object representing cached file.
+            stamp string: Stamp of given file the data was read at.
+            data dict: Parsed contents of given file.
+        """
+
+        if stamp is None:
+            self.invalidate(path)
+            return
+        key: str = self._key(path)
+        with self._lock:
+            self._entries[key] = (stamp, _copy(data))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def update(
+            self, path: str, stamp: str, new_stamp: str, func: callable
+        ) -> None:
+        """Apply given change to cached data in place and restamp it.
+
+        Lets writers that know exactly how a file changed keep its entry
+        warm without re-parsing it. Given change must be the only one made
+        between both stamps, or the entry ends up missing changes under a
+        stamp that keeps it looking current. Entries not matching given
+        stamp are dropped instead.
+
+        Args:
+            path string: Path-like object representing cached file.
+            stamp string: Stamp of given file prior to the change.
+            new_stamp string: Stamp of given file after the change.
+            func callable: Applies the change to the cached data.
+        """
+
+        key: str = self._key(path)
+        with self._lock:
+            entry: tuple = self._entries.pop(key, None)
+            if entry is None or entry[0] != stamp or new_stamp is None:
+                return
+            func(entry[1])
+            self._entries[key] = (new_stamp, entry[1])
+
+    def invalidate(self, path: str=None) -> None:
+        """Drop cached data for given path, or every path if none given.
+
+        Args:
+            path string: Path-like object representing cached file.
+        """
+
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(path), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+VAULT_CACHE: StampedCache = StampedCache()
@@ -0,0 +1,351 @@
+"""SQLite catalog indexing the networks saved by every user in a vault.
+
+Every change recorded here is passed on to the vault's search index too.
+"""
+
+from contextlib import closing
+from getpass import getuser
+import json
+import os
+import sqlite3
+
+import network_saver.search
+import network_saver.utility
+
+CATALOG_NAME = 'catalog.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS users (
+    name TEXT PRIMARY KEY,
+    stamp TEXT
+);
+CREATE TABLE IF NOT EXISTS networks (
+    user TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    context TEXT,
+    notes TEXT,
+    version TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user, name)
+);
+CREATE INDEX IF NOT EXISTS networks_by_position ON networks (user, position);
+"""
+
+
+def get_catalog_file(vault_dir: str=None) -> str:
+    """Fetch catalog database for given vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing catalog database.
+    """
+
+    return os.path.join(
+        network_saver.utility.get_internal_dir(vault_dir), CATALOG_NAME
+    )
+
+
+def connect(vault_dir: str=None) -> sqlite3.Connection:
+    """Open catalog database of given vault, creating it if needed.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        sqlite3.Connection: Open connection to catalog database.
+    """
+
+    catalog_file: str = get_catalog_file(vault_dir)
+    os.makedirs(os.path.dirname(catalog_file), exist_ok=True)
+    conn: sqlite3.Connection = sqlite3.connect(catalog_file, timeout=10)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _get_root_stamp(vault_dir: str) -> str:
+    """Fetch change stamp of vault root, updated whenever a user is added.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Modification time of vault root.
+    """
+
+    return str(os.stat(vault_dir).st_mtime_ns)
+
+
+def _insert_network(
+        conn: sqlite3.Connection, user: str, name: str, data: dict
+    ) -> None:
+    """Insert or update a single network row, preserving its position.
+
+    Args:
+        conn sqlite3.Connection: Open catalog connection.
+        user string: User owning network.
+        name string: Name of network.
+        data dict: Map of relevant network data.
+    """
+
+    conn.execute(
+        "INSERT INTO networks "
+        "(user, name, position, context, notes, version, data) "
+        "VALUES (?, ?, "
+        "(SELECT COALESCE(MAX(position), -1) + 1 FROM networks WHERE user = ?), "
+        "?, ?, ?, ?) "
+        "ON CONFLICT (user, name) DO UPDATE SET "
+        "context = excluded.context, notes = excluded.notes, "
+        "version = excluded.version, data = excluded.data",
+        (
+            user, name, user, data.get('context'), data.get('notes'),
+            data.get('version'), json.dumps(data)
+        )
+    )
+
+
+def _sync_user(conn: sqlite3.Connection, user: str, vault_dir: str) -> None:
+    """Re-index given user from their vault json if it changed on disk.
+
+    Args:
+        conn sqlite3.Connection: Open catalog connection.
+        user string: User to re-index.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    vault_file: str = network_saver.utility.get_vault_file(
+        user=user, vault_dir=vault_dir
+    )
+    stamp: str = network_saver.utility.get_vault_stamp(vault_file)
+    row: tuple = conn.execute(
+        "SELECT stamp FROM users WHERE name = ?", (user,)
+    ).fetchone()
+    if row and row[0] is not None and row[0] == stamp:
+        return
+
+    conn.execute("DELETE FROM networks WHERE user = ?", (user,))
+    if stamp is None:
+        conn.execute("DELETE FROM users WHERE name = ?", (user,))
+        return
+    data: dict = network_saver.utility.read_network_vault(vault_file, 'r')
+    for name, meta in data.items():
+        _insert_network(conn, user, name, meta)
+    conn.execute(
+        "INSERT OR REPLACE INTO users (name, stamp) VALUES (?, ?)",
+        (user, stamp)
+    )
+
+
+def _sync_users(conn: sqlite3.Connection, vault_dir: str) -> None:
+    """Re-scan user directories if vault root changed on disk.
+
+    Users are indexed as they first save, so folders that only get their
+    vault json later on don't need the vault walked on every listing.
+
+    Args:
+        conn sqlite3.Connection: Open catalog connection.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    stamp: str = _get_root_stamp(vault_dir)
+    row: tuple = conn.execute(
+        "SELECT value FROM meta WHERE key = 'root_stamp'"
+    ).fetchone()
+    if row and row[0] == stamp:
+        return
+
+    users: list[str] = network_saver.utility.list_user_dirs(vault_dir)
+    known: set[str] = {
+        name for name, in conn.execute("SELECT name FROM users")
+    }
+    for user in known.difference(users):
+        conn.execute("DELETE FROM networks WHERE user = ?", (user,))
+        conn.execute("DELETE FROM users WHERE name = ?", (user,))
+    for user in users:
+        _sync_user(conn, user, vault_dir)
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('root_stamp', ?)",
+        (stamp,)
+    )
+
+
+def rebuild(vault_dir: str=None) -> None:
+    """Discard catalog of given vault and re-index every user's vault json.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    network_saver.utility.invalidate_vault_cache()
+    with closing(connect(vault_dir)) as conn, conn:
+        conn.execute("DELETE FROM networks")
+        conn.execute("DELETE FROM users")
+        conn.execute("DELETE FROM meta")
+        _sync_users(conn, vault_dir)
+
+
+def list_users(vault_dir: str=None) -> list[str]:
+    """List users with saved networks.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        list: Sorted names of users with saved networks.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    try:
+        with closing(connect(vault_dir)) as conn, conn:
+            _sync_users(conn, vault_dir)
+            return [
+                name for name, in conn.execute(
+                    "SELECT name FROM users ORDER BY name"
+                )
+            ]
+    except sqlite3.Error as err:
+        print('Warning: Could not query catalog of ', vault_dir)
+        print(err)
+        return network_saver.utility.list_user_dirs(vault_dir)
+
+
+def list_networks(user: str=None, vault_dir: str=None) -> dict:
+    """List networks saved by given user.
+
+    Args:
+        user string: User to list networks for.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        dict: Map of network names to their relevant data, in save order.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    try:
+        with closing(connect(vault_dir)) as conn, conn:
+            _sync_user(conn, user, vault_dir)
+            data: dict = {
+                name: json.loads(data) for name, data in conn.execute(
+                    "SELECT name, data FROM networks WHERE user = ? "
+                    "ORDER BY position",
+                    (user,)
+                )
+            }
+    except sqlite3.Error as err:
+        print('Warning: Could not query catalog of ', vault_dir)
+        print(err)
+        data: dict = network_saver.utility.read_user_data(
+            user=user, vault_dir=vault_dir
+        )
+    network_saver.search.sync_user(user, data, vault_dir)
+    return data
+
+
+def _update_stamp(
+        conn: sqlite3.Connection, user: str, vault_dir: str, stamp: str
+    ) -> None:
+    """Record that given user's index matches their vault json again.
+
+    Only done if the index matched the vault json as it was prior to the
+    write, otherwise it is flagged so the next query re-indexes the user.
+
+    Args:
+        conn sqlite3.Connection: Open catalog connection.
+        user string: User whose vault json was written.
+        vault_dir string: Path-like object representing vault location.
+        stamp string: Change stamp of vault json prior to the write.
+    """
+
+    vault_file: str = network_saver.utility.get_vault_file(
+        user=user, vault_dir=vault_dir
+    )
+    row: tuple = conn.execute(
+        "SELECT stamp FROM users WHERE name = ?", (user,)
+    ).fetchone()
+    if row and row[0] is not None and row[0] == stamp:
+        new_stamp: str = network_saver.utility.get_vault_stamp(vault_file)
+    else:
+        new_stamp: str = None
+    conn.execute(
+        "INSERT OR REPLACE INTO users (name, stamp) VALUES (?, ?)",
+        (user, new_stamp)
+    )
+
+
+def put_network(
+        network_name: str, network_data: dict, user: str=None,
+        vault_dir: str=None, stamp: str=None
+    ) -> None:
+    """Index given network after it was written to its user's vault json.
+
+    Args:
+        network_name str: Name of network saved.
+        network_data dict: Map of relevant network data.
+        user str: User whose vault the network was saved to.
+        vault_dir str: Path-like object representing vault location.
+        stamp str: Change stamp of vault json prior to the write.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    try:
+        with closing(connect(vault_dir)) as conn, conn:
+            _insert_network(conn, user, network_name, network_data)
+            _update_stamp(conn, user, vault_dir, stamp)
+    except sqlite3.Error as err:
+        print('Warning: Could not update catalog of ', vault_dir)
+        print(err)
+    network_saver.search.put_network(
+        network_name, network_data, user, vault_dir
+    )
+
+
+def delete_network(
+        network_name: str, user: str=None, vault_dir: str=None,
+        stamp: str=None
+    ) -> None:
+    """Drop given network from index.
+
+    Args:
+        network_name str: Name of network removed.
+        user str: User whose vault the network was removed from.
+        vault_dir str: Path-like object representing vault location.
+        stamp str: Change stamp of vault json prior to the write, if the
+                   vault json was written at all.
+    """
+
+    delete_networks([network_name], user=user, vault_dir=vault_dir, stamp=stamp)
+
+
+def delete_networks(
+        network_names: list[str], user: str=None, vault_dir: str=None,
+        stamp: str=None
+    ) -> None:
+    """Drop given networks from index in a single transaction.
+
+    Args:
+        network_names list: Names of networks removed.
+        user str: User whose vault the networks were removed from.
+        vault_dir str: Path-like object representing vault location.
+        stamp str: Change stamp of vault json prior to the write, if the
+                   vault json was written at all.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    try:
+        with closing(connect(vault_dir)) as conn, conn:
+            conn.executemany(
+                "DELETE FROM networks WHERE user = ? AND name = ?",
+                [(user, network_name) for network_name in network_names]
+            )
+            if stamp is not None:
+                _update_stamp(conn, user, vault_dir, stamp)
+    except sqlite3.Error as err:
+        print('Warning: Could not update catalog of ', vault_dir)
+        print(err)
+    for network_name in network_names:
+        network_saver.search.delete_network(network_name, user, vault_dir)
@@ -0,0 +1,798 @@
+"""Command line interface to the network vault, run as python -m network_saver.
+
+Every command works on the vault files directly and never imports hou, so
+they run in plain Python on machines without a Houdini session, such as
+render farm nodes. Bulk commands fan their file work out across a process
+pool, while vault json changes are made from the main process.
+
+Exports are plain folders holding a networks.json and a raw <network>.cpio
+per network, the layout of a user folder in the vault, so they can be
+imported into any other vault, whatever its storage settings.
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+from getpass import getuser
+import json
+import os
+import sys
+import tempfile
+import time
+
+import network_saver.catalog
+import network_saver.fsck
+import network_saver.journal
+import network_saver.locks
+import network_saver.objects
+import network_saver.revisions
+import network_saver.search
+import network_saver.storage
+import network_saver.thumbnails
+import network_saver.trace
+import network_saver.trash
+import network_saver.utility
+
+
+def _get_network_file(name: str, user: str, vault_dir: str) -> str:
+    """Fetch network file of given network.
+
+    Args:
+        name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing network file.
+    """
+
+    return os.path.join(
+        network_saver.utility.get_user_dir(user=user, vault_dir=vault_dir),
+        name + '.cpio'
+    )
+
+
+def _export_file(src: str, dst: str, vault_dir: str) -> None:
+    """Write raw CPIO contents of a network file. Runs in a worker process.
+
+    Args:
+        src string: Path-like object representing network file.
+        dst string: Path-like object representing raw CPIO file to write.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    network_saver.storage.extract_network_file(src, dst, vault_dir=vault_dir)
+
+
+def _store_file(
+        src: str, dst: str, compression: str, deduplicate: bool, vault_dir: str
+    ) -> None:
+    """Store raw CPIO file in vault. Runs in a worker process.
+
+    Args:
+        src string: Path-like object representing raw CPIO file.
+        dst string: Path-like object representing network file to write.
+        compression string: Compression to store file with.
+        deduplicate bool: Whether to store file in the object store.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    network_saver.storage.store_network_file(
+        src, dst, compression=compression, deduplicate=deduplicate,
+        vault_dir=vault_dir
+    )
+
+
+def _copy_file(
+        src: str, dst: str, compression: str, deduplicate: bool, vault_dir: str
+    ) -> None:
+    """Re-store network file under another name. Runs in a worker process.
+
+    Going through a raw copy also rewrites the file with the vault's current
+    storage settings, which is all a migration is.
+
+    Args:
+        src string: Path-like object representing network file.
+        dst string: Path-like object representing network file to write,
+                    which may be src itself.
+        compression string: Compression to store file with.
+        deduplicate bool: Whether to store file in the object store.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    fd, raw_file = tempfile.mkstemp(suffix='.cpio')
+    os.close(fd)
+    try:
+        network_saver.storage.extract_network_file(
+            src, raw_file, vault_dir=vault_dir
+        )
+        network_saver.storage.store_network_file(
+            raw_file, dst, compression=compression, deduplicate=deduplicate,
+            vault_dir=vault_dir
+        )
+    finally:
+        os.remove(raw_file)
+
+
+def _migrate_file(
+        network_file: str, user: str, compression: str, deduplicate: bool,
+        vault_dir: str
+    ) -> None:
+    """Re-store network file in place, holding its lock. Runs in a worker
+       process.
+
+    Args:
+        network_file string: Path-like object representing network file.
+        user string: User owning network.
+        compression string: Compression to store file with.
+        deduplicate bool: Whether to store file in the object store.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    name: str = os.path.splitext(os.path.basename(network_file))[0]
+    with network_saver.utility.lock_network(
+        name, user=user, vault_dir=vault_dir
+    ):
+        # removed by another session in the meantime
+        if not os.path.isfile(network_file):
+            return
+        _copy_file(
+            network_file, network_file, compression, deduplicate, vault_dir
+        )
+
+
+def run_jobs(func, jobs: list[tuple], workers: int=None) -> list[tuple]:
+    """Run given function over given argument tuples across a process pool.
+
+    Small batches, or a single worker, run in this process instead, as
+    spinning up a pool would cost more than it saves.
+
+    Args:
+        func callable: Top-level function to run.
+        jobs list: Argument tuples, one per call.
+        workers int: Number of worker processes, defaults to one per CPU.
+    Returns:
+        list: (arguments, error) tuples of failed calls.
+    """
+
+    failed: list[tuple] = list()
+    workers: int = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        for args in jobs:
+            try:
+                func(*args)
+            except Exception as err:
+                failed.append((args, err))
+        return failed
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(workers, len(jobs))
+    ) as executor:
+        futures: dict = {executor.submit(func, *args): args for args in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            err: BaseException = future.exception()
+            if err is not None:
+                failed.append((futures[future], err))
+    return failed
+
+
+def _report(failed: list[tuple]) -> int:
+    """Print failed jobs.
+
+    Args:
+        failed list: (arguments, error) tuples of failed calls.
+    Returns:
+        int: Exit code.
+    """
+
+    for args, err in failed:
+        print('Warning: Failed on ', args[0], file=sys.stderr)
+        print(err, file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _select(data: dict, names: list[str], select_all: bool) -> list[str]:
+    """Resolve networks a command applies to.
+
+    Args:
+        data dict: Map of available networks to their data.
+        names list: Names of networks given on the command line.
+        select_all bool: Whether every available network was asked for.
+    Returns:
+        list: Names of networks to work on.
+    """
+
+    if select_all:
+        return list(data)
+    missing: list[str] = [name for name in names if name not in data]
+    if missing:
+        raise SystemExit("No such network(s): {}".format(', '.join(missing)))
+    return list(names)
+
+
+def _print_networks(data: dict, as_json: bool) -> None:
+    """Print given networks one per line, or as json.
+
+    Args:
+        data dict: Map of network names to their data.
+        as_json bool: Whether to print json.
+    """
+
+    if as_json:
+        print(json.dumps(data, indent=4))
+        return
+    for name, network_data in data.items():
+        print('\t'.join((
+            name,
+            network_data.get('context', ''),
+            network_data.get('version', ''),
+            network_data.get('notes', '').replace('\n', ' ')
+        )))
+
+
+def _check_names(names: list[str]) -> None:
+    """Ensure given network names can't point outside a user folder.
+
+    Args:
+        names list: Names of networks given by an export.
+    """
+
+    invalid: list[str] = [
+        name for name in names
+        if not name or '..' in name
+        or any(sep in name for sep in ('/', '\\', os.sep, os.altsep) if sep)
+    ]
+    if invalid:
+        raise SystemExit(
+            "Invalid network name(s): {}".format(', '.join(invalid))
+        )
+
+
+def _lock_networks(
+        stack: contextlib.ExitStack, names: list[str], user: str,
+        vault_dir: str, force: bool
+    ) -> dict:
+    """Lock networks about to be written and resolve which to write.
+
+    Locks are taken in sorted order, so sessions locking several networks
+    never deadlock, and held until given stack is closed. Existing networks
+    are skipped unless forced, and archived as revisions otherwise.
+
+    Args:
+        stack ExitStack: Stack holding the locks.
+        names list: Names of networks about to be written.
+        user string: User owning networks.
+        vault_dir string: Path-like object representing vault location.
+        force bool: Whether to overwrite existing networks.
+    Returns:
+        dict: Map of networks to write to their current generation.
+    """
+
+    generations: dict = dict()
+    for name in sorted(names):
+        stack.enter_context(network_saver.utility.lock_network(
+            name, user=user, vault_dir=vault_dir
+        ))
+        current: dict = network_saver.utility.get_network_data(
+            name, user=user, vault_dir=vault_dir
+        )
+        if current is not None:
+            if not force:
+                print('Skipping existing network ', name, file=sys.stderr)
+                continue
+            network_saver.revisions.record_revision(
+                name, current, user=user, vault_dir=vault_dir
+            )
+        generations[name] = network_saver.locks.get_generation(current)
+    return generations
+
+
+def _write_networks(
+        func, sources: dict, data: dict, user: str, vault_dir: str,
+        force: bool, workers: int
+    ) -> tuple[list]:
+    """Write given networks into a user's vault.
+
+    Each network stays locked from before its file is written until its
+    record is, so saves made by other sessions in between are neither
+    clobbered nor left pointing at the wrong file.
+
+    Args:
+        func callable: _store_file or _copy_file, writing a network file.
+        sources dict: Map of networks to the files they are written from.
+        data dict: Map of networks to their data.
+        user string: User to write networks for.
+        vault_dir string: Path-like object representing vault location.
+        force bool: Whether to overwrite existing networks.
+        workers int: Number of worker processes.
+    Returns:
+        list: Names of networks written.
+        list: (arguments, error) tuples of failed writes.
+    """
+
+    compression: str = network_saver.storage.get_compression(vault_dir)
+    deduplicate: bool = network_saver.storage.is_deduplicated(vault_dir)
+    written: list[str] = list()
+    with contextlib.ExitStack() as stack:
+        generations: dict = _lock_networks(
+            stack, list(sources), user, vault_dir, force
+        )
+        names: list[str] = [name for name in sources if name in generations]
+        failed: list[tuple] = run_jobs(func, [
+            (
+                sources[name], _get_network_file(name, user, vault_dir),
+                compression, deduplicate, vault_dir
+            ) for name in names
+        ], workers)
+
+        failed_files: set[str] = {job[0] for job, _err in failed}
+        for name in names:
+            if sources[name] in failed_files:
+                continue
+            network_saver.utility.put_network_data(
+                name, data[name], user=user, vault_dir=vault_dir,
+                generation=generations[name]
+            )
+            written.append(name)
+    return written, failed
+
+
+def cmd_users(args: argparse.Namespace) -> int:
+    """List users of vault."""
+
+    for user in network_saver.catalog.list_users(args.vault):
+        print(user)
+    return 0
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    """List networks of a user."""
+
+    data: dict = network_saver.catalog.list_networks(
+        user=args.user, vault_dir=args.vault
+    )
+    _print_networks(data, args.json)
+    return 0
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    """Search networks of one or every user."""
+
+    if args.user:
+        network_saver.catalog.list_networks(user=args.user, vault_dir=args.vault)
+        index = network_saver.search.get_index(args.vault)
+    else:
+        index = network_saver.search.index_vault(args.vault)
+    matches: list[tuple] = sorted(index.search(args.query, user=args.user))
+    if args.json:
+        print(json.dumps([
+            {'user': user, 'name': name} for user, name in matches
+        ], indent=4))
+        return 0
+    for user, name in matches:
+        print('{}\t{}'.format(user, name))
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Export networks of a user to a folder of raw CPIO files."""
+
+    data: dict = network_saver.catalog.list_networks(
+        user=args.user, vault_dir=args.vault
+    )
+    names: list[str] = _select(data, args.names, args.all)
+    os.makedirs(args.dest, exist_ok=True)
+    failed: list[tuple] = run_jobs(_export_file, [
+        (
+            _get_network_file(name, args.user, args.vault),
+            os.path.join(args.dest, name + '.cpio'),
+            args.vault
+        ) for name in names
+    ], args.jobs)
+
+    failed_files: set[str] = {job[0] for job, _err in failed}
+    exported: dict = {
+        name: data[name] for name in names
+        if _get_network_file(name, args.user, args.vault) not in failed_files
+    }
+    network_saver.journal.write_snapshot(
+        os.path.join(args.dest, 'networks.json'), exported
+    )
+    print('Exported {} network(s) to {}'.format(len(exported), args.dest))
+    return _report(failed)
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    """Import networks exported to a folder into a user's vault."""
+
+    src_file: str = os.path.join(args.src, 'networks.json')
+    if not os.path.isfile(src_file):
+        raise SystemExit("No exported networks in {}".format(args.src))
+    data: dict = network_saver.utility.read_network_vault(src_file, 'r')
+    names: list[str] = _select(data, args.names, args.all)
+    _check_names(names)
+
+    imported, failed = _write_networks(
+        _store_file,
+        {name: os.path.join(args.src, name + '.cpio') for name in names},
+        data, args.user, args.vault, args.force, args.jobs
+    )
+    print('Imported {} network(s) for {}'.format(len(imported), args.user))
+    return _report(failed)
+
+
+def cmd_copy(args: argparse.Namespace) -> int:
+    """Copy networks from one user to another."""
+
+    data: dict = network_saver.catalog.list_networks(
+        user=args.user, vault_dir=args.vault
+    )
+    names: list[str] = _select(data, args.names, args.all)
+
+    copied, failed = _write_networks(
+        _copy_file,
+        {name: _get_network_file(name, args.user, args.vault) for name in names},
+        data, args.to_user, args.vault, args.force, args.jobs
+    )
+    print('Copied {} network(s) from {} to {}'.format(
+        len(copied), args.user, args.to_user
+    ))
+    return _report(failed)
+
+
+def cmd_delete(args: argparse.Namespace) -> int:
+    """Delete networks of a user."""
+
+    data: dict = network_saver.catalog.list_networks(
+        user=args.user, vault_dir=args.vault
+    )
+    names: list[str] = _select(data, args.names, args.all)
+    if not args.purge:
+        entries, skipped = network_saver.trash.trash_networks(
+            names, user=args.user, vault_dir=args.vault
+        )
+        print('Moved {} network(s) of {} to the trash'.format(
+            len(entries), args.user
+        ))
+        return 1 if skipped else 0
+
+    network_saver.utility.delete_networks_data(
+        names, user=args.user, vault_dir=args.vault
+    )
+    for name in names:
+        network_saver.utility.remove_cpio_file(
+            name, user=args.user, vault_dir=args.vault
+        )
+        network_saver.revisions.delete_history(
+            name, user=args.user, vault_dir=args.vault
+        )
+        network_saver.thumbnails.remove_thumbnail(
+            name, user=args.user, vault_dir=args.vault
+        )
+    print('Deleted {} network(s) of {}'.format(len(names), args.user))
+    return 0
+
+
+def cmd_trash(args: argparse.Namespace) -> int:
+    """List networks in the trash."""
+
+    entries: list[dict] = network_saver.trash.list_trash(
+        user=args.user, vault_dir=args.vault
+    )
+    if args.json:
+        print(json.dumps(entries, indent=4))
+        return 0
+    for entry in entries:
+        print('\t'.join((
+            entry['id'],
+            entry['user'],
+            time.strftime(
+                '%Y-%m-%d %H:%M', time.localtime(entry['trashed'])
+            ),
+            entry['data'].get('notes', '').replace('\n', ' ')
+        )))
+    return 0
+
+
+def cmd_untrash(args: argparse.Namespace) -> int:
+    """Move trashed networks back into the vault."""
+
+    if args.name and len(args.ids) != 1:
+        raise SystemExit('--as only applies to a single network')
+    failed: list[tuple] = list()
+    for entry_id in args.ids:
+        try:
+            name: str = network_saver.trash.restore_network(
+                entry_id, user=args.user, vault_dir=args.vault,
+                network_name=args.name
+            )
+        except (
+            network_saver.locks.ConflictError,
+            network_saver.locks.LockTimeout, ValueError
+        ) as err:
+            failed.append(((entry_id,), err))
+            continue
+        print('Restored {} as {}'.format(entry_id, name))
+    return _report(failed)
+
+
+def cmd_gc(args: argparse.Namespace) -> int:
+    """Purge expired networks from the trash."""
+
+    purged: int = network_saver.trash.collect(
+        args.vault,
+        max_age=0 if args.all else (
+            None if args.days is None else args.days * 86400
+        ),
+        batch_size=args.batch_size
+    )
+    print('Purged {} network(s) from the trash'.format(purged))
+    if network_saver.storage.is_deduplicated(args.vault):
+        chunks: int = network_saver.objects.collect_garbage(args.vault)
+        print('Removed {} unreferenced chunk(s)'.format(chunks))
+    return 0
+
+
+def cmd_history(args: argparse.Namespace) -> int:
+    """List past revisions of a network."""
+
+    revisions: list[dict] = network_saver.revisions.list_revisions(
+        args.name, user=args.user, vault_dir=args.vault
+    )
+    if args.json:
+        print(json.dumps(revisions, indent=4))
+        return 0
+    for revision in revisions:
+        print('{}\t{}\t{}\t{}'.format(
+            revision['revision'],
+            time.strftime(
+                '%Y-%m-%d %H:%M', time.localtime(revision['time'])
+            ),
+            revision['size'],
+            revision['data'].get('notes', '').replace('\n', ' ')
+        ))
+    return 0
+
+
+def cmd_restore(args: argparse.Namespace) -> int:
+    """Make a past revision of a network current again."""
+
+    network_saver.revisions.restore_revision(
+        args.name, args.revision, user=args.user, vault_dir=args.vault
+    )
+    print('Restored revision {} of {}'.format(args.revision, args.name))
+    return 0
+
+
+def cmd_migrate(args: argparse.Namespace) -> int:
+    """Re-store network files with the vault's current storage settings,
+       giving networks saved before per-network records their record."""
+
+    users: list[str] = [args.user] if args.user else \
+        network_saver.catalog.list_users(args.vault)
+    jobs: list[tuple] = list()
+    compression: str = network_saver.storage.get_compression(args.vault)
+    deduplicate: bool = network_saver.storage.is_deduplicated(args.vault)
+    records: int = 0
+    for user in users:
+        records += network_saver.utility.migrate_records(
+            user=user, vault_dir=args.vault
+        )
+        for name in network_saver.catalog.list_networks(
+            user=user, vault_dir=args.vault
+        ):
+            network_file: str = _get_network_file(name, user, args.vault)
+            if os.path.isfile(network_file):
+                jobs.append((
+                    network_file, user, compression, deduplicate, args.vault
+                ))
+    failed: list[tuple] = run_jobs(_migrate_file, jobs, args.jobs)
+    print('Migrated {} network(s) to {}{}'.format(
+        len(jobs) - len(failed), compression,
+        ', deduplicated' if deduplicate else ''
+    ))
+    if records:
+        print('Wrote records of {} network(s)'.format(records))
+    return _report(failed)
+
+
+def cmd_fsck(args: argparse.Namespace) -> int:
+    """Check vault for inconsistencies, optionally repairing them."""
+
+    users: list[str] = [args.user] if args.user else None
+    issues: list = network_saver.fsck.check(
+        args.vault, users=users, full=args.full, workers=args.jobs
+    )
+    if args.repair and issues:
+        fixed: int = network_saver.fsck.repair(issues, args.vault)
+        print('Repaired {} issue(s)'.format(fixed))
+        issues = network_saver.fsck.check(
+            args.vault, users=sorted({issue.user for issue in issues}),
+            workers=args.jobs
+        )
+    if args.json:
+        print(json.dumps([issue._asdict() for issue in issues], indent=4))
+    else:
+        for issue in issues:
+            print('\t'.join((
+                issue.user, issue.kind, issue.name or '', issue.detail or ''
+            )))
+    return 1 if issues else 0
+
+
+def cmd_trace(args: argparse.Namespace) -> int:
+    """Summarize spans of a trace log."""
+
+    log_file: str = args.log or network_saver.trace.get_log_file() or \
+        network_saver.trace.get_default_log_file()
+    rows: list[dict] = network_saver.trace.summarize(
+        network_saver.trace.read_log(log_file)
+    )
+    if args.json:
+        print(json.dumps(rows, indent=4))
+        return 0
+    print(network_saver.trace.format_summary(rows))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build command line parser.
+
+    Returns:
+        argparse.ArgumentParser: Parser of every command.
+    """
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog='python -m network_saver',
+        description='Manage the network vault without Houdini.'
+    )
+    parser.add_argument(
+        '--vault', help='Vault location, defaults to the configured vault.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(
+            name: str, func, summary: str, user: bool=True,
+            names: bool=False, jobs: bool=False
+        ) -> argparse.ArgumentParser:
+        command: argparse.ArgumentParser = subparsers.add_parser(
+            name, help=summary
+        )
+        command.set_defaults(func=func)
+        if user:
+            command.add_argument(
+                '--user', default=getuser(),
+                help='User whose networks to use, defaults to you.'
+            )
+        if names:
+            command.add_argument('names', nargs='*', help='Network names.')
+            command.add_argument(
+                '--all', action='store_true', help='Use every network.'
+            )
+        if jobs:
+            command.add_argument(
+                '--jobs', '-j', type=int,
+                help='Worker processes, defaults to one per CPU.'
+            )
+        return command
+
+    add_command('users', cmd_users, 'List users.', user=False)
+    command = add_command('list', cmd_list, 'List networks of a user.')
+    command.add_argument('--json', action='store_true', help='Print json.')
+    command = add_command('search', cmd_search, 'Search networks.', user=False)
+    command.add_argument('query', help='Free text query.')
+    command.add_argument('--user', help='Only search networks of this user.')
+    command.add_argument('--json', action='store_true', help='Print json.')
+    command = add_command(
+        'export', cmd_export, 'Export networks to a folder.',
+        names=True, jobs=True
+    )
+    command.add_argument('--dest', required=True, help='Folder to export to.')
+    command = add_command(
+        'import', cmd_import, 'Import networks from an exported folder.',
+        names=True, jobs=True
+    )
+    command.add_argument('--src', required=True, help='Folder to import.')
+    command.add_argument(
+        '--force', action='store_true', help='Overwrite existing networks.'
+    )
+    command = add_command(
+        'copy', cmd_copy, 'Copy networks to another user.',
+        names=True, jobs=True
+    )
+    command.add_argument('--to-user', required=True, help='User to copy to.')
+    command.add_argument(
+        '--force', action='store_true', help='Overwrite existing networks.'
+    )
+    command = add_command(
+        'delete', cmd_delete, 'Move networks to the trash.', names=True
+    )
+    command.add_argument(
+        '--purge', action='store_true',
+        help='Delete networks for good rather than trash them.'
+    )
+    command = add_command(
+        'trash', cmd_trash, 'List trashed networks.', user=False
+    )
+    command.add_argument(
+        '--user', help="Only list this user's trashed networks."
+    )
+    command.add_argument('--json', action='store_true', help='Print json.')
+    command = add_command(
+        'untrash', cmd_untrash, 'Move trashed networks back.'
+    )
+    command.add_argument('ids', nargs='+', help='Ids of trashed networks.')
+    command.add_argument(
+        '--as', dest='name', help='Name to restore a single network under.'
+    )
+    command = add_command(
+        'gc', cmd_gc, 'Purge expired networks from the trash.', user=False
+    )
+    command.add_argument(
+        '--days', type=float,
+        help="Keep networks trashed this recently, defaults to the vault's "
+             "retention."
+    )
+    command.add_argument(
+        '--all', action='store_true', help='Empty the trash entirely.'
+    )
+    command.add_argument(
+        '--batch-size', type=int, default=network_saver.trash.BATCH_SIZE,
+        help='Networks purged per batch.'
+    )
+    command = add_command('history', cmd_history, 'List past revisions.')
+    command.add_argument('name', help='Network name.')
+    command.add_argument('--json', action='store_true', help='Print json.')
+    command = add_command(
+        'restore', cmd_restore, 'Make a past revision current again.'
+    )
+    command.add_argument('name', help='Network name.')
+    command.add_argument(
+        '--revision', type=int, required=True, help='Revision to restore.'
+    )
+    command = add_command(
+        'migrate', cmd_migrate,
+        "Re-store network files with the vault's current storage settings.",
+        user=False, jobs=True
+    )
+    command.add_argument('--user', help='Only migrate networks of this user.')
+    command = add_command(
+        'fsck', cmd_fsck, 'Check the vault for inconsistencies.', user=False
+    )
+    command.add_argument('--user', help='Only check networks of this user.')
+    command.add_argument(
+        '--repair', action='store_true', help='Fix inconsistencies found.'
+    )
+    command.add_argument(
+        '--full', action='store_true',
+        help='Check every file, not only those changed since the last check.'
+    )
+    command.add_argument(
+        '--jobs', '-j', type=int, help='Users checked at once.'
+    )
+    command.add_argument('--json', action='store_true', help='Print json.')
+    command = add_command(
+        'trace', cmd_trace, 'Summarize a trace log.', user=False
+    )
+    command.add_argument(
+        '--log', help='Trace log, defaults to the one tracing writes to.'
+    )
+    command.add_argument('--json', action='store_true', help='Print json.')
+    return parser
+
+
+def main(argv: list[str]=None) -> int:
+    """Run command line interface.
+
+    Args:
+        argv list: Command line arguments, defaults to sys.argv.
+    Returns:
+        int: Exit code.
+    """
+
+    args: argparse.Namespace = build_parser().parse_args(argv)
+    args.vault = args.vault or network_saver.utility.get_vault_dir()
+    try:
+        return args.func(args)
+    except (OSError, RuntimeError, ValueError) as err:
+        print('Error: ', err, file=sys.stderr)
+        return 1
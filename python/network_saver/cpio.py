@@ -0,0 +1,382 @@
+"""Pure-Python reader for the HouNC record stream of saved network files.
+
+Saved networks are Houdini clipboard dumps: a flat stream of records, each
+made up of a magic, a fixed-size hex header, a NUL-terminated name and the
+record's data, running up to the next magic. Records named '<node>.<section>'
+(such as 'geo1.init' or 'geo1.parm') describe a single node, while a few
+others (such as 'node_type') describe the network as a whole.
+
+Files are memory-mapped and scanned lazily, so record and node listings of
+even very large setups are cheap, and record data is handed out as
+zero-copy memoryviews. Nothing here needs hou, so it can be used by batch
+tools outside of Houdini.
+"""
+
+import mmap
+import re
+import shutil
+import tempfile
+from typing import NamedTuple
+
+import network_saver.objects
+import network_saver.storage
+
+RECORD_MAGIC = b'HouNC\x1a'
+HEADER_SIZE = 28
+MAX_NAME_SIZE = 1024
+
+HEX_DIGITS = frozenset(b'0123456789abcdefABCDEF')
+
+TYPE_PATTERN = re.compile(rb'^type = (\S+)', re.MULTILINE)
+POSITION_PATTERN = re.compile(
+    rb'^position (-?[\d.e+-]+) (-?[\d.e+-]+)', re.MULTILINE
+)
+INPUTS_PATTERN = re.compile(rb'^inputs\r?\n\{(.*?)^\}', re.MULTILINE | re.DOTALL)
+INPUT_PATTERN = re.compile(rb'^\s*\d+\s+(\S+)', re.MULTILINE)
+DISPLAY_PATTERN = re.compile(rb'^flags = .* display on', re.MULTILINE)
+
+
+class CpioError(ValueError):
+    """Raised when a network file isn't a well-formed record stream."""
+
+
+class Record(NamedTuple):
+    """Single record of a network file."""
+    name: str
+    offset: int
+    size: int
+    data_offset: int
+    data_size: int
+
+
+class Node(NamedTuple):
+    """Single node of a network file, spanning one or more records."""
+    name: str
+    type: str
+    offset: int
+    size: int
+    records: tuple
+
+
+class NodeLayout(NamedTuple):
+    """Placement of a single node in the network it was copied from."""
+    name: str
+    type: str
+    position: tuple
+    inputs: tuple
+    display: bool
+
+
+def is_header(header: bytes) -> bool:
+    """Check whether given bytes look like a record header.
+
+    Args:
+        header bytes: Bytes following a record magic.
+    Returns:
+        bool: Whether given bytes are a well-formed header.
+    """
+
+    return len(header) == HEADER_SIZE and HEX_DIGITS.issuperset(header)
+
+
+def node_key(record_name: str) -> str:
+    """Fetch name of node given record belongs to.
+
+    Args:
+        record_name string: Name of record.
+    Returns:
+        str: Node name, or None for records describing the whole network.
+    """
+
+    if '.' not in record_name:
+        return None
+    return record_name.split('.', 1)[0]
+
+
+class CpioReader(object):
+    """Memory-mapped reader over the records of a network file.
+
+    Raw network files are mapped directly. Compressed files and manifests
+    are first expanded into an anonymous temporary file, which is mapped
+    instead.
+
+    Memoryviews handed out by data() must not outlive the reader.
+    """
+    def __init__(self, filepath: str, vault_dir: str=None) -> None:
+        """Initializes reader.
+
+        Args:
+            filepath string: Path-like object representing network file.
+            vault_dir string: Path-like object representing vault location
+                              the network file belongs to, needed for
+                              manifests.
+        """
+
+        self.filepath: str = filepath
+        self._file = None
+        self._map: mmap.mmap = None
+        self._view: memoryview = memoryview(b'')
+
+        with open(filepath, 'rb') as header_f:
+            header: bytes = header_f.read(
+                len(network_saver.objects.MANIFEST_MAGIC)
+            )
+        if network_saver.objects.is_manifest(header) or \
+                network_saver.storage.sniff_compression(header) != 'none':
+            self._file = tempfile.TemporaryFile()
+            with network_saver.storage.open_network_file(
+                filepath, vault_dir=vault_dir
+            ) as src_f:
+                shutil.copyfileobj(
+                    src_f, self._file, network_saver.storage.CHUNK_SIZE
+                )
+            self._file.flush()
+        else:
+            self._file = open(filepath, 'rb')
+
+        self._file.seek(0, 2)
+        if self._file.tell():
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+            self._view = memoryview(self._map)
+
+    def __enter__(self) -> 'CpioReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Size of raw CPIO contents in bytes."""
+
+        return len(self._view)
+
+    def close(self) -> None:
+        """Release mapping and underlying file."""
+
+        self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # a caller still holds a record's data, let gc unmap it
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _find(self, sub: bytes, start: int, end: int=None) -> int:
+        """Find given bytes in mapped contents."""
+
+        if self._map is None:
+            return -1
+        if end is None:
+            return self._map.find(sub, start)
+        return self._map.find(sub, start, end)
+
+    def iter_records(self):
+        """Lazily scan every record in the file.
+
+        Yields:
+            Record: Records in file order.
+        Raises:
+            CpioError: If the file isn't a well-formed record stream.
+        """
+
+        size: int = len(self._view)
+        start: int = self._find(RECORD_MAGIC, 0)
+        if start != 0:
+            raise CpioError(
+                "{} does not start with a record".format(self.filepath)
+            )
+        magic_size: int = len(RECORD_MAGIC)
+        while start != -1:
+            next_start: int = self._find(RECORD_MAGIC, start + magic_size)
+            end: int = next_start if next_start != -1 else size
+
+            name_start: int = start + magic_size + HEADER_SIZE
+            if not is_header(self._view[start + magic_size:name_start]):
+                raise CpioError("Malformed record header at {} in {}".format(
+                    start, self.filepath
+                ))
+            name_end: int = self._find(
+                b'\0', name_start, min(end, name_start + MAX_NAME_SIZE)
+            )
+            if name_end == -1:
+                raise CpioError("Malformed record name at {} in {}".format(
+                    start, self.filepath
+                ))
+
+            name: str = bytes(self._view[name_start:name_end]).decode(
+                'utf-8', 'replace'
+            )
+            yield Record(name, start, end - start, name_end + 1, end - name_end - 1)
+            start = next_start
+
+    def header(self, record: Record) -> memoryview:
+        """Fetch header of given record without copying it.
+
+        Args:
+            record Record: Record to fetch header of.
+        Returns:
+            memoryview: Raw record header.
+        """
+
+        start: int = record.offset + len(RECORD_MAGIC)
+        return self._view[start:start + HEADER_SIZE]
+
+    def body(self, record: Record) -> memoryview:
+        """Fetch everything past the header of given record without copying
+           it, i.e. its name and data.
+
+        Args:
+            record Record: Record to fetch body of.
+        Returns:
+            memoryview: Raw record body.
+        """
+
+        start: int = record.offset + len(RECORD_MAGIC) + HEADER_SIZE
+        return self._view[start:record.offset + record.size]
+
+    def contents(self) -> memoryview:
+        """Fetch raw CPIO contents without copying them.
+
+        Returns:
+            memoryview: Raw CPIO contents.
+        """
+
+        return self._view[:]
+
+    def data(self, record: Record) -> memoryview:
+        """Fetch data of given record without copying it.
+
+        Args:
+            record Record: Record to fetch data of.
+        Returns:
+            memoryview: Raw record data.
+        """
+
+        return self._view[record.data_offset:record.data_offset + record.data_size]
+
+    def category(self) -> str:
+        """Fetch category of network the file was copied from.
+
+        Returns:
+            str: Node type category name (e.g. 'Sop'), or None if the file
+                 doesn't say.
+        """
+
+        for record in self.iter_records():
+            if record.name == 'node_type':
+                return bytes(self.data(record)).strip().decode('utf-8', 'replace')
+        return None
+
+    def iter_nodes(self):
+        """Lazily group records into the nodes they describe.
+
+        Yields:
+            Node: Nodes in file order, named relative to the network they
+                  were copied from.
+        """
+
+        name: str = None
+        records: list[Record] = list()
+        for record in self.iter_records():
+            key: str = node_key(record.name)
+            if records and key != name:
+                yield self._make_node(name, records)
+                records = list()
+            name = key
+            if key is not None:
+                records.append(record)
+        if records:
+            yield self._make_node(name, records)
+
+    def _make_node(self, name: str, records: list[Record]) -> Node:
+        """Describe node spanning given records.
+
+        Args:
+            name string: Name of node.
+            records list: Records describing node.
+        Returns:
+            Node: Node description.
+        """
+
+        node_type: str = None
+        for record in records:
+            if record.name.endswith('.init'):
+                match = TYPE_PATTERN.search(self.data(record))
+                if match:
+                    node_type = match.group(1).decode('utf-8', 'replace')
+                break
+        offset: int = records[0].offset
+        size: int = records[-1].offset + records[-1].size - offset
+        return Node(name, node_type, offset, size, tuple(records))
+
+
+def read_summary(filepath: str, vault_dir: str=None) -> dict:
+    """Summarize the nodes saved in given network file.
+
+    Args:
+        filepath string: Path-like object representing network file.
+        vault_dir string: Path-like object representing vault location the
+                          network file belongs to.
+    Returns:
+        dict: Category, node count and count per node type of given file.
+    """
+
+    with CpioReader(filepath, vault_dir=vault_dir) as reader:
+        types: dict[str, int] = dict()
+        count: int = 0
+        for node in reader.iter_nodes():
+            count += 1
+            types[node.type] = types.get(node.type, 0) + 1
+        return {
+            'category': reader.category(),
+            'nodes': count,
+            'types': types,
+            'size': len(reader)
+        }
+
+
+def read_layout(filepath: str, vault_dir: str=None) -> list[NodeLayout]:
+    """Read where the top level nodes of given network file sit and how
+       they are wired.
+
+    Args:
+        filepath string: Path-like object representing network file.
+        vault_dir string: Path-like object representing vault location the
+                          network file belongs to.
+    Returns:
+        list: Layout of each node with a position, in file order. Inputs
+              name nodes of the same network, which may not all have been
+              saved.
+    """
+
+    layout: list[NodeLayout] = list()
+    with CpioReader(filepath, vault_dir=vault_dir) as reader:
+        for node in reader.iter_nodes():
+            if '/' in node.name:
+                # inside a saved subnetwork
+                continue
+            for record in node.records:
+                if not record.name.endswith('.def'):
+                    continue
+                data: memoryview = reader.data(record)
+                position = POSITION_PATTERN.search(data)
+                if not position:
+                    break
+                inputs = INPUTS_PATTERN.search(data)
+                layout.append(NodeLayout(
+                    node.name, node.type,
+                    (float(position.group(1)), float(position.group(2))),
+                    tuple(
+                        name.decode('utf-8', 'replace')
+                        for name in INPUT_PATTERN.findall(inputs.group(1))
+                    ) if inputs else tuple(),
+                    DISPLAY_PATTERN.search(data) is not None
+                ))
+                break
+    return layout
@@ -0,0 +1,131 @@
+"""Merged view over several vault roots.
+
+Roots are given highest priority first, as returned by
+utility.get_vault_dirs. They are scanned in parallel through their own
+catalogs and merged with these rules:
+
+    - users are the union of the users of every root
+    - a network shadows networks of the same user and name in every root
+      of lower priority, so a show can override a studio library network
+      by saving one under the same name
+    - listed networks carry the root they live in under 'vault_dir', which
+      is where they are loaded from and removed from
+
+Roots that don't exist, such as a scratch vault not set up on a machine,
+are skipped. A root that can't be read, such as a share that is offline,
+is skipped with a warning unless every root fails.
+"""
+
+import concurrent.futures
+import os
+
+import network_saver.catalog
+import network_saver.utility
+
+MAX_WORKERS = 8
+
+
+def _scan(func, vault_dirs: list[str]) -> list[tuple]:
+    """Run given function against every existing vault root in parallel.
+
+    Args:
+        func callable: Function taking a vault root.
+        vault_dirs list: Path-like objects representing vault roots.
+    Returns:
+        list: Vault roots paired with what given function returned for them,
+              in priority order.
+    """
+
+    vault_dirs = [
+        vault_dir for vault_dir in vault_dirs if os.path.isdir(vault_dir)
+    ]
+    if len(vault_dirs) < 2:
+        # nothing to overlap, and errors propagate as they did with one root
+        return [(vault_dir, func(vault_dir)) for vault_dir in vault_dirs]
+
+    results: list[tuple] = list()
+    errors: list[Exception] = list()
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(MAX_WORKERS, len(vault_dirs))
+    ) as executor:
+        futures: list = [
+            (vault_dir, executor.submit(func, vault_dir))
+            for vault_dir in vault_dirs
+        ]
+        for vault_dir, future in futures:
+            try:
+                results.append((vault_dir, future.result()))
+            except Exception as err:
+                print('Warning: Could not read vault at ', vault_dir)
+                print(err)
+                errors.append(err)
+    if errors and not results:
+        raise errors[0]
+    return results
+
+
+def list_users(vault_dirs: list[str]=None) -> list[str]:
+    """List users with saved networks in any vault root.
+
+    Args:
+        vault_dirs list: Path-like objects representing vault roots,
+                         highest priority first. Defaults to configured ones.
+    Returns:
+        list: Sorted names of users with saved networks.
+    """
+
+    vault_dirs: list[str] = vault_dirs or network_saver.utility.get_vault_dirs()
+    users: set[str] = set()
+    for _vault_dir, root_users in _scan(
+        network_saver.catalog.list_users, vault_dirs
+    ):
+        users.update(root_users)
+    return sorted(users)
+
+
+def list_networks(user: str=None, vault_dirs: list[str]=None) -> dict:
+    """List networks saved by given user across vault roots.
+
+    Args:
+        user string: User to list networks for.
+        vault_dirs list: Path-like objects representing vault roots,
+                         highest priority first. Defaults to configured ones.
+    Returns:
+        dict: Map of network names to their relevant data, along with the
+              root they live in under 'vault_dir'. Networks of the highest
+              priority root come first, each in save order.
+    """
+
+    vault_dirs: list[str] = vault_dirs or network_saver.utility.get_vault_dirs()
+    merged: dict[str, dict] = dict()
+    for vault_dir, data in _scan(
+        lambda vault_dir: network_saver.catalog.list_networks(
+            user=user, vault_dir=vault_dir
+        ),
+        vault_dirs
+    ):
+        for network_name, network_data in data.items():
+            if network_name not in merged:
+                merged[network_name] = dict(network_data, vault_dir=vault_dir)
+    return merged
+
+
+def locate_network(
+        network_name: str, user: str=None, vault_dirs: list[str]=None
+    ) -> str:
+    """Find vault root given network is served from.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dirs list: Path-like objects representing vault roots,
+                         highest priority first. Defaults to configured ones.
+    Returns:
+        str: Path-like object representing highest priority root holding
+             given network, or None if no root does.
+    """
+
+    network_data: dict = list_networks(user=user, vault_dirs=vault_dirs).get(
+        network_name
+    )
+    return network_data['vault_dir'] if network_data else None
@@ -0,0 +1,113 @@
+"""Atomic replacement of files shared through the vault.
+
+Files are written to a temporary file beside their destination and renamed
+over it, so readers only ever see the old or the new contents. Temporary
+files are created private to their owner, so they are given the permissions
+of a regularly created file before being renamed into place, leaving vault
+files readable by every user sharing the vault.
+"""
+
+import contextlib
+import os
+import stat
+import tempfile
+import typing
+
+
+def _get_umask() -> int:
+    """Read process umask without changing it.
+
+    Setting the umask to read it back would briefly apply to files created
+    by every other thread of the session, so it is read from /proc instead.
+
+    Returns:
+        int: Process umask, or None where the system doesn't expose it.
+    """
+
+    try:
+        with open('/proc/self/status', 'r') as status_f:
+            for line in status_f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+_UMASK: int = _get_umask()
+FILE_MODE: int = 0o644 if _UMASK is None else 0o666 & ~_UMASK
+
+
+def get_mode(filepath: str) -> int:
+    """Fetch permissions given file is written with.
+
+    Where the umask can't be read, files keep the mode they already have,
+    and new ones are given FILE_MODE.
+
+    Args:
+        filepath string: Path-like object representing file to write.
+    Returns:
+        int: Permission bits.
+    """
+
+    if _UMASK is not None:
+        return FILE_MODE
+    try:
+        return stat.S_IMODE(os.stat(filepath).st_mode)
+    except FileNotFoundError:
+        return FILE_MODE
+
+
+def replace(tmp_file: str, filepath: str) -> None:
+    """Rename given temporary file over given file with regular permissions.
+
+    Args:
+        tmp_file string: Path-like object representing written file.
+        filepath string: Path-like object representing replaced file.
+    """
+
+    os.chmod(tmp_file, get_mode(filepath))
+    os.replace(tmp_file, filepath)
+
+
+@contextlib.contextmanager
+def atomic_open(
+        filepath: str, mode: str='wb', suffix: str='.tmp'
+    ) -> typing.Iterator[typing.IO]:
+    """Open temporary file replacing given file once closed.
+
+    The temporary file is removed instead if the block raises.
+
+    Args:
+        filepath string: Path-like object representing replaced file.
+        mode string: Mode to open temporary file with, 'w' or 'wb'.
+        suffix string: Suffix of temporary file.
+    Returns:
+        IO: Open temporary file.
+    """
+
+    fd, tmp_file = tempfile.mkstemp(
+        dir=os.path.dirname(filepath), suffix=suffix
+    )
+    try:
+        with os.fdopen(fd, mode) as tmp_f:
+            yield tmp_f
+        replace(tmp_file, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_file(filepath: str, data: bytes) -> None:
+    """Atomically replace given file with given data.
+
+    Args:
+        filepath string: Path-like object representing replaced file.
+        data bytes: New contents of file.
+    """
+
+    with atomic_open(filepath) as tmp_f:
+        tmp_f.write(data)
@@ -0,0 +1,577 @@
+"""Integrity checker and repair tool for vaults.
+
+check walks every user folder of a vault, users in parallel on a thread
+pool, and reports:
+
+    corrupt summary        networks.json is missing or isn't a map of networks
+    corrupt journal        networks.journal holds lines that don't parse
+    missing network file   a listed network has no .cpio
+    orphan network file    a .cpio isn't listed
+    orphan record          a .meta.json isn't listed
+    corrupt network file   a .cpio isn't a well-formed record stream
+    corrupt record         a .meta.json doesn't parse
+
+Network files are validated by streaming their records, as the loader
+would, without loading them into Houdini. Results are kept in
+.netvault/fsck.json keyed by each file's modification time and size, so
+files unchanged since the last check aren't parsed again and checking a
+large vault a second time costs little more than listing its folders.
+
+repair fixes what check found. Nothing is deleted outright: unlisted
+network files are listed again, with their record's data where they have
+one, and damaged ones are moved to the trash, from where they can still be
+restored. Each repair re-checks its network under the network's lock, so
+it never undoes a save made since the check.
+"""
+
+import concurrent.futures
+import contextlib
+import json
+import os
+from typing import NamedTuple
+
+import network_saver.cpio
+import network_saver.files
+import network_saver.journal
+import network_saver.records
+import network_saver.trace
+import network_saver.trash
+import network_saver.utility
+
+MAX_WORKERS = 8
+STATE_NAME = 'fsck.json'
+STATE_VERSION = 1
+
+CORRUPT_SUMMARY = 'corrupt summary'
+CORRUPT_JOURNAL = 'corrupt journal'
+MISSING_NETWORK = 'missing network file'
+ORPHAN_NETWORK = 'orphan network file'
+ORPHAN_RECORD = 'orphan record'
+CORRUPT_NETWORK = 'corrupt network file'
+CORRUPT_RECORD = 'corrupt record'
+
+RECOVERED_NOTES = 'Recovered by fsck'
+
+
+class Issue(NamedTuple):
+    """Single inconsistency found in a user folder."""
+    user: str
+    kind: str
+    name: str
+    path: str
+    detail: str
+
+
+def get_state_file(vault_dir: str=None) -> str:
+    """Fetch file holding results of the last check of given vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing scan state.
+    """
+
+    return os.path.join(
+        network_saver.utility.get_internal_dir(vault_dir), STATE_NAME
+    )
+
+
+def _read_state(vault_dir: str) -> dict:
+    """Read results of the last check of given vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        dict: Map of files, relative to the vault, to the stamp they were
+              checked at and the error found, empty if never checked.
+    """
+
+    try:
+        with open(get_state_file(vault_dir), 'r') as state_f:
+            state: dict = json.load(state_f)
+    except FileNotFoundError:
+        return dict()
+    except ValueError:
+        # checked again from scratch
+        return dict()
+    if state.get('version') != STATE_VERSION:
+        return dict()
+    return state.get('files', dict())
+
+
+def _write_state(vault_dir: str, files: dict) -> None:
+    """Replace results of the last check of given vault.
+
+    A vault the state can't be written to is simply checked in full the
+    next time.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+        files dict: Map of files, relative to the vault, to the stamp they
+                    were checked at and the error found.
+    """
+
+    state_file: str = get_state_file(vault_dir)
+    try:
+        os.makedirs(os.path.dirname(state_file), exist_ok=True)
+        with network_saver.files.atomic_open(state_file, 'w') as tmp_f:
+            json.dump({'version': STATE_VERSION, 'files': files}, tmp_f)
+    except OSError as err:
+        print('Warning: Could not store check results of ', vault_dir)
+        print(err)
+
+
+def list_users(vault_dir: str=None) -> list[str]:
+    """List every user folder of given vault, including those whose
+       networks.json went missing.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        list: Sorted names of user folders.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    return sorted(
+        entry.name for entry in os.scandir(vault_dir)
+        if entry.is_dir() and not entry.name.startswith('.')
+    )
+
+
+def check_network_file(filepath: str, vault_dir: str=None) -> str:
+    """Validate given network file by streaming its records.
+
+    Args:
+        filepath string: Path-like object representing network file.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: What is wrong with the file, or None if it is well-formed.
+    """
+
+    category: str = None
+    nodes: int = 0
+    try:
+        with network_saver.cpio.CpioReader(
+            filepath, vault_dir=vault_dir
+        ) as reader:
+            for record in reader.iter_records():
+                if record.name == 'node_type':
+                    category = bytes(reader.data(record)).strip().decode(
+                        'utf-8', 'replace'
+                    )
+                elif network_saver.cpio.node_key(record.name) is not None:
+                    nodes += 1
+    except (OSError, ValueError) as err:
+        return str(err) or type(err).__name__
+    if not category:
+        return 'Has no node_type record'
+    if not nodes:
+        return 'Holds no nodes'
+    return None
+
+
+def check_record(filepath: str) -> str:
+    """Validate given network record.
+
+    Args:
+        filepath string: Path-like object representing record file.
+    Returns:
+        str: What is wrong with the record, or None if it is well-formed.
+    """
+
+    try:
+        with open(filepath, 'r') as record_f:
+            network_data: dict = json.load(record_f)
+    except (OSError, ValueError) as err:
+        return str(err)
+    if not isinstance(network_data, dict):
+        return 'Not a map of network data'
+    return None
+
+
+def _read_summary(vault_file: str) -> tuple:
+    """Parse given networks.json, without rebuilding it the way the loader
+       would.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    Returns:
+        dict: Map of networks to their data, or None if it can't be read.
+        str: What is wrong with it, or None if it is well-formed.
+    """
+
+    try:
+        with open(vault_file, 'r') as vault_f:
+            data: dict = json.load(vault_f)
+    except FileNotFoundError:
+        return None, 'Missing'
+    except (OSError, ValueError) as err:
+        return None, str(err)
+    if not isinstance(data, dict) or not all(
+        isinstance(network_data, dict) for network_data in data.values()
+    ):
+        return None, 'Not a map of networks'
+    return data, None
+
+
+def _count_bad_lines(vault_file: str) -> int:
+    """Count complete journal lines of given vault json that don't parse.
+
+    A trailing partial line may be an append still in flight, and isn't
+    counted.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    Returns:
+        int: Number of corrupt journal lines.
+    """
+
+    try:
+        with open(
+            network_saver.journal.get_journal_file(vault_file), 'rb'
+        ) as journal_f:
+            journal: bytes = journal_f.read()
+    except FileNotFoundError:
+        return 0
+    bad: int = 0
+    for line in journal[:journal.rfind(b'\n') + 1].splitlines():
+        if not line.strip():
+            continue
+        try:
+            record: dict = json.loads(line)
+        except ValueError:
+            bad += 1
+            continue
+        if not isinstance(record, dict) or 'op' not in record:
+            bad += 1
+    return bad
+
+
+def _check_user(
+        user: str, vault_dir: str, state: dict, full: bool
+    ) -> tuple:
+    """Check single user folder. Runs on a worker thread.
+
+    Args:
+        user string: User to check.
+        vault_dir string: Path-like object representing vault location.
+        state dict: Results of the last check, by file.
+        full bool: Whether to parse every file, even unchanged ones.
+    Returns:
+        list: Issues found.
+        dict: Results of this check for the files of given user.
+    """
+
+    user_dir: str = network_saver.utility.get_user_dir(user, vault_dir)
+    vault_file: str = network_saver.utility.get_vault_file(user, vault_dir)
+    issues: list[Issue] = list()
+    results: dict = dict()
+
+    with network_saver.trace.span('fsck.check_user', path=user_dir) as span:
+        data, error = _read_summary(vault_file)
+        filenames: list[str] = os.listdir(user_dir)
+        network_names: set[str] = {
+            filename[:-len('.cpio')] for filename in filenames
+            if filename.endswith('.cpio')
+        }
+        record_names: set[str] = {
+            filename[:-len(network_saver.records.RECORD_SUFFIX)]
+            for filename in filenames
+            if filename.endswith(network_saver.records.RECORD_SUFFIX)
+        }
+        if error is not None and not (
+            data is None and not network_names and not record_names
+        ):
+            issues.append(Issue(user, CORRUPT_SUMMARY, None, vault_file, error))
+        if data is None:
+            # what the loader would rebuild it from
+            data = network_saver.records.read_records(user_dir)
+        else:
+            bad: int = _count_bad_lines(vault_file)
+            if bad:
+                issues.append(Issue(
+                    user, CORRUPT_JOURNAL, None,
+                    network_saver.journal.get_journal_file(vault_file),
+                    '{} corrupt line(s)'.format(bad)
+                ))
+            network_saver.journal.fold(vault_file, data)
+
+        for name in sorted(set(data) - network_names):
+            issues.append(Issue(
+                user, MISSING_NETWORK, name,
+                os.path.join(user_dir, name + '.cpio'), None
+            ))
+        for name in sorted(network_names - set(data)):
+            issues.append(Issue(
+                user, ORPHAN_NETWORK, name,
+                os.path.join(user_dir, name + '.cpio'), None
+            ))
+        for name in sorted(record_names - set(data)):
+            issues.append(Issue(
+                user, ORPHAN_RECORD, name,
+                network_saver.records.get_record_file(user_dir, name), None
+            ))
+
+        parsed: int = 0
+        checks: list[tuple] = [
+            (
+                name + '.cpio', CORRUPT_NETWORK, name,
+                lambda path: check_network_file(path, vault_dir)
+            ) for name in sorted(network_names)
+        ] + [
+            (
+                name + network_saver.records.RECORD_SUFFIX, CORRUPT_RECORD,
+                name, check_record
+            ) for name in sorted(record_names)
+        ]
+        for filename, kind, name, func in checks:
+            path: str = os.path.join(user_dir, filename)
+            key: str = '{}/{}'.format(user, filename)
+            stamp: str = network_saver.utility.get_file_stamp(path)
+            if stamp is None:
+                # removed while checking
+                continue
+            cached: dict = state.get(key)
+            if not full and cached and cached.get('stamp') == stamp:
+                error = cached.get('error')
+            else:
+                error = func(path)
+                parsed += 1
+            results[key] = {'stamp': stamp, 'error': error}
+            if error is not None:
+                issues.append(Issue(user, kind, name, path, error))
+        if span:
+            span.add(files=len(checks), parsed=parsed, issues=len(issues))
+    return issues, results
+
+
+def check(
+        vault_dir: str=None, users: list[str]=None, full: bool=False,
+        workers: int=None
+    ) -> list[Issue]:
+    """Check given users of given vault for inconsistencies.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+        users list: Users to check, every user folder if not given.
+        full bool: Whether to parse every file, rather than only those
+                   changed since the last check.
+        workers int: Users checked at once, defaults to MAX_WORKERS.
+    Returns:
+        list: Issues found, by user.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    state: dict = _read_state(vault_dir)
+    files: dict = dict()
+    if users:
+        # results of users not checked this time are kept
+        files = {
+            key: result for key, result in state.items()
+            if key.split('/', 1)[0] not in users
+        }
+    else:
+        users = list_users(vault_dir)
+
+    issues: list[Issue] = list()
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=workers or MAX_WORKERS
+    ) as executor:
+        futures: list = [
+            executor.submit(_check_user, user, vault_dir, state, full)
+            for user in users
+        ]
+        for user, future in zip(users, futures):
+            try:
+                user_issues, results = future.result()
+            except OSError as err:
+                print('Warning: Could not check user folder of ', user)
+                print(err)
+                continue
+            issues.extend(user_issues)
+            files.update(results)
+    _write_state(vault_dir, files)
+    return issues
+
+
+def _is_listed(network_name: str, user: str, vault_dir: str) -> bool:
+    """Check whether given network is in its user's networks.json."""
+
+    return network_name in network_saver.utility.read_user_data(
+        user=user, vault_dir=vault_dir
+    )
+
+
+def _recover_data(network_name: str, user: str, vault_dir: str) -> dict:
+    """Fetch data to list an unlisted network file with.
+
+    Args:
+        network_name string: Name of unlisted network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        dict: Data of its record if it has a readable one, otherwise what
+              can be told from the network file itself.
+    """
+
+    user_dir: str = network_saver.utility.get_user_dir(user, vault_dir)
+    try:
+        network_data: dict = network_saver.records.read_record(
+            user_dir, network_name
+        )
+    except ValueError:
+        network_data = None
+    if isinstance(network_data, dict):
+        return network_data
+
+    context: str = ''
+    try:
+        category: str = network_saver.cpio.read_summary(
+            os.path.join(user_dir, network_name + '.cpio'), vault_dir
+        )['category']
+        context = network_saver.utility.CATEGORY_MAP.get(category, '')
+    except (OSError, ValueError):
+        pass
+    return {'context': context, 'notes': RECOVERED_NOTES, 'version': ''}
+
+
+def _adopt(network_name: str, user: str, vault_dir: str) -> bool:
+    """List unlisted network file again.
+
+    Args:
+        network_name string: Name of unlisted network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        bool: Whether it was listed.
+    """
+
+    user_dir: str = network_saver.utility.get_user_dir(user, vault_dir)
+    if _is_listed(network_name, user, vault_dir) or not os.path.isfile(
+        os.path.join(user_dir, network_name + '.cpio')
+    ):
+        return False
+    network_data: dict = _recover_data(network_name, user, vault_dir)
+    # a corrupt record would fail the write
+    network_saver.records.remove_record(user_dir, network_name)
+    network_saver.utility.put_network_data(
+        network_name, network_data, user=user, vault_dir=vault_dir
+    )
+    return True
+
+
+def _repair_user(user: str, issues: list[Issue], vault_dir: str) -> int:
+    """Fix given issues of a single user.
+
+    Args:
+        user string: User whose issues to fix.
+        issues list: Issues found in user's folder.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        int: Number of issues fixed.
+    """
+
+    user_dir: str = network_saver.utility.get_user_dir(user, vault_dir)
+    vault_file: str = network_saver.utility.get_vault_file(user, vault_dir)
+    kinds: dict[str, list[Issue]] = dict()
+    for issue in issues:
+        kinds.setdefault(issue.kind, list()).append(issue)
+    fixed: int = 0
+
+    # the summary first, everything else is judged against it
+    if CORRUPT_SUMMARY in kinds:
+        network_saver.utility.rebuild_user_data(user, vault_dir)
+        fixed += 1
+    if CORRUPT_JOURNAL in kinds:
+        # folding skips corrupt lines, dropping them for good
+        network_saver.journal.compact(vault_file)
+        network_saver.utility.invalidate_vault_cache(vault_file)
+        fixed += 1
+
+    for issue in kinds.get(CORRUPT_RECORD, list()):
+        with network_saver.utility.lock_network(
+            issue.name, user=user, vault_dir=vault_dir
+        ):
+            if check_record(issue.path) is None:
+                continue
+            data: dict = network_saver.utility.read_user_data(
+                user=user, vault_dir=vault_dir
+            )
+            if issue.name in data:
+                network_saver.records.write_record(
+                    user_dir, issue.name, data[issue.name]
+                )
+            else:
+                network_saver.records.remove_record(user_dir, issue.name)
+            fixed += 1
+
+    # unlisted network files are listed again, with their record's data
+    for issue in kinds.get(ORPHAN_NETWORK, list()) + \
+            kinds.get(ORPHAN_RECORD, list()):
+        with network_saver.utility.lock_network(
+            issue.name, user=user, vault_dir=vault_dir
+        ):
+            if _adopt(issue.name, user, vault_dir):
+                fixed += 1
+            elif issue.kind == ORPHAN_RECORD and os.path.isfile(
+                issue.path
+            ) and not _is_listed(issue.name, user, vault_dir):
+                # nothing left to list, the network was removed
+                network_saver.records.remove_record(user_dir, issue.name)
+                fixed += 1
+
+    missing: list[str] = list()
+    with contextlib.ExitStack() as locks:
+        for issue in sorted(
+            kinds.get(MISSING_NETWORK, list()), key=lambda issue: issue.name
+        ):
+            locks.enter_context(network_saver.utility.lock_network(
+                issue.name, user=user, vault_dir=vault_dir
+            ))
+            if not os.path.isfile(issue.path):
+                missing.append(issue.name)
+        # no file to load, nothing to keep
+        network_saver.utility.delete_networks_data(
+            missing, user=user, vault_dir=vault_dir
+        )
+        fixed += len(missing)
+
+    damaged: list[str] = list()
+    for issue in kinds.get(CORRUPT_NETWORK, list()):
+        with network_saver.utility.lock_network(
+            issue.name, user=user, vault_dir=vault_dir
+        ):
+            if check_network_file(issue.path, vault_dir) is None:
+                continue
+            _adopt(issue.name, user, vault_dir)
+            damaged.append(issue.name)
+    if damaged:
+        entries, _skipped = network_saver.trash.trash_networks(
+            damaged, user=user, vault_dir=vault_dir
+        )
+        fixed += len(entries)
+    return fixed
+
+
+def repair(issues: list[Issue], vault_dir: str=None) -> int:
+    """Fix given issues, as found by check.
+
+    Args:
+        issues list: Issues to fix.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        int: Number of issues fixed.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    by_user: dict[str, list[Issue]] = dict()
+    for issue in issues:
+        by_user.setdefault(issue.user, list()).append(issue)
+
+    fixed: int = 0
+    for user, user_issues in by_user.items():
+        with network_saver.trace.span(
+            'fsck.repair_user', path=user, issues=len(user_issues)
+        ):
+            fixed += _repair_user(user, user_issues, vault_dir)
+    return fixed
@@ -0,0 +1,324 @@
+"""Append-only journal of changes made to a user's vault json.
+
+Rather than rewriting networks.json for every save or removal, each change
+is appended as a single json line to networks.journal beside it. Reading a
+vault folds the journal over the networks.json snapshot, and once the
+journal grows past COMPACT_SIZE it is folded back into the snapshot in the
+background.
+
+Records are plain puts and deletes, or batches of them applied as one
+change, so replaying them over a snapshot that already reflects them is
+harmless. This is what lets existing networks.json
+files (and anything else that rewrites them wholesale) keep working as-is.
+
+Appends, compactions and snapshot rewrites all hold the vault json's lock,
+so no record is lost to a journal being replaced while it is appended to.
+"""
+
+import json
+import os
+import threading
+
+import network_saver.files
+import network_saver.locks
+
+COMPACT_SIZE = 64 * 1024
+
+_compacting: set = set()
+_compacting_lock: threading.Lock = threading.Lock()
+
+
+def get_journal_file(vault_file: str) -> str:
+    """Fetch journal belonging to given vault json.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    Returns:
+        str: Path-like object representing journal file.
+    """
+
+    return os.path.splitext(vault_file)[0] + '.journal'
+
+
+def lock(
+        vault_file: str, timeout: float=network_saver.locks.LOCK_TIMEOUT
+    ) -> network_saver.locks.FileLock:
+    """Fetch lock guarding given vault json and its journal.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+        timeout float: Seconds to wait for the lock, 0 to try once.
+    Returns:
+        FileLock: Lock, acquired by using it as a context manager.
+    """
+
+    return network_saver.locks.FileLock(vault_file, timeout=timeout)
+
+
+def put_record(network_name: str, network_data: dict) -> dict:
+    """Create journal record saving given network.
+
+    Args:
+        network_name string: Name of network saved.
+        network_data dict: Map of relevant network data.
+    Returns:
+        dict: Journal record.
+    """
+
+    return {'op': 'put', 'name': network_name, 'data': network_data}
+
+
+def delete_record(network_name: str) -> dict:
+    """Create journal record removing given network.
+
+    Args:
+        network_name string: Name of network removed.
+    Returns:
+        dict: Journal record.
+    """
+
+    return {'op': 'delete', 'name': network_name}
+
+
+def batch_record(records: list[dict]) -> dict:
+    """Create journal record making given changes at once.
+
+    A batch is appended as a single line, so a session dying mid-append
+    leaves either all of its changes or none of them.
+
+    Args:
+        records list: Journal records to batch.
+    Returns:
+        dict: Journal record.
+    """
+
+    return {'op': 'batch', 'records': records}
+
+
+def apply(data: dict, record: dict) -> dict:
+    """Apply single journal record to given vault data in place.
+
+    Args:
+        data dict: Map of saved networks to their relevant data.
+        record dict: Journal record to apply.
+    Returns:
+        dict: Given vault data.
+    """
+
+    if record.get('op') == 'put':
+        data[record['name']] = record['data']
+    elif record.get('op') == 'delete':
+        data.pop(record['name'], None)
+    elif record.get('op') == 'batch':
+        for batched in record['records']:
+            apply(data, batched)
+    return data
+
+
+def _parse(journal: bytes, journal_file: str) -> list[dict]:
+    """Parse raw journal contents into records.
+
+    A trailing partial line, as left by a session dying mid-append, is
+    skipped.
+
+    Args:
+        journal bytes: Raw journal contents.
+        journal_file string: Path-like object representing journal, for
+                             warnings.
+    Returns:
+        list: Journal records in order.
+    """
+
+    records: list[dict] = list()
+    for line in journal.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            print('Warning: Skipping corrupt record in ', journal_file)
+    return records
+
+
+def read_records(vault_file: str) -> list[dict]:
+    """Read every record in journal of given vault json.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    Returns:
+        list: Journal records in order.
+    """
+
+    journal_file: str = get_journal_file(vault_file)
+    try:
+        with open(journal_file, 'rb') as journal_f:
+            journal: bytes = journal_f.read()
+    except FileNotFoundError:
+        return list()
+    return _parse(journal, journal_file)
+
+
+def fold(vault_file: str, data: dict) -> dict:
+    """Fold journal of given vault json over given snapshot data.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+        data dict: Parsed snapshot of vault json.
+    Returns:
+        dict: Given data, updated in place with every journal record.
+    """
+
+    for record in read_records(vault_file):
+        apply(data, record)
+    return data
+
+
+def append(vault_file: str, record: dict) -> tuple[int]:
+    """Append single record to journal of given vault json.
+
+    The record is written holding the vault json's lock, so appends never
+    interleave with each other or land in a journal that is being
+    compacted or reset, without relying on O_APPEND writes being atomic,
+    which they aren't on network shares. Schedules a background compaction
+    once the journal grows past COMPACT_SIZE.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+        record dict: Journal record to append.
+    Returns:
+        int: Size of journal the record was appended at, or None if
+             another session appended to it at the same time.
+        int: Size of journal after the record was appended.
+    """
+
+    line: bytes = (json.dumps(record) + '\n').encode('utf-8')
+    with lock(vault_file):
+        fd: int = os.open(
+            get_journal_file(vault_file),
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+            0o644
+        )
+        try:
+            offset: int = os.fstat(fd).st_size
+            os.write(fd, line)
+            size: int = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+    if size > COMPACT_SIZE:
+        compact_async(vault_file)
+    if size - offset != len(line):
+        return None, size
+    return offset, size
+
+
+def write_snapshot(vault_file: str, data: dict) -> None:
+    """Atomically replace vault json with given data.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+        data dict: Map of saved networks to their relevant data.
+    """
+
+    with network_saver.files.atomic_open(vault_file, 'w') as tmp_f:
+        json.dump(data, tmp_f)
+
+
+def reset(vault_file: str) -> None:
+    """Discard journal of given vault json.
+
+    Only safe once the snapshot reflects every record in it, so hold the
+    vault json's lock across writing the snapshot and resetting.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    """
+
+    try:
+        os.remove(get_journal_file(vault_file))
+    except FileNotFoundError:
+        pass
+
+
+def compact(vault_file: str) -> None:
+    """Fold journal of given vault json into its snapshot and truncate it.
+
+    Holds the vault json's lock, so other sessions wait to append until it
+    is done. A trailing partial record is carried over into the truncated
+    journal. Does nothing if the lock is already held.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    """
+
+    vault_lock: network_saver.locks.FileLock = lock(vault_file, timeout=0)
+    try:
+        vault_lock.acquire()
+    except network_saver.locks.LockTimeout:
+        return
+    try:
+        _compact(vault_file)
+    finally:
+        vault_lock.release()
+
+
+def _compact(vault_file: str) -> None:
+    """Compact given vault json, holding its lock.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    """
+
+    journal_file: str = get_journal_file(vault_file)
+    try:
+        with open(journal_file, 'rb') as journal_f:
+            journal: bytes = journal_f.read()
+    except FileNotFoundError:
+        return
+    # only fold complete lines, a partial one may still be being written
+    journal: bytes = journal[:journal.rfind(b'\n') + 1]
+    if not journal:
+        return
+
+    with open(vault_file, 'r') as vault_f:
+        data: dict = json.load(vault_f)
+    for record in _parse(journal, journal_file):
+        apply(data, record)
+    write_snapshot(vault_file, data)
+
+    with network_saver.files.atomic_open(journal_file) as tmp_f, \
+            open(journal_file, 'rb') as journal_f:
+        journal_f.seek(len(journal))
+        tmp_f.write(journal_f.read())
+
+
+def _compact_worker(vault_file: str) -> None:
+    """Compact given vault json, reporting rather than raising failures."""
+
+    try:
+        compact(vault_file)
+    except Exception as err:
+        print('Warning: Could not compact journal of ', vault_file)
+        print(err)
+    finally:
+        with _compacting_lock:
+            _compacting.discard(vault_file)
+
+
+def compact_async(vault_file: str) -> None:
+    """Compact given vault json on a background thread.
+
+    Does nothing if this session is already compacting the same file.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    """
+
+    with _compacting_lock:
+        if vault_file in _compacting:
+            return
+        _compacting.add(vault_file)
+    thread: threading.Thread = threading.Thread(
+        target=_compact_worker, args=(vault_file,), daemon=True
+    )
+    thread.start()
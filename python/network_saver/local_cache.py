@@ -0,0 +1,335 @@
+"""Local read-through disk cache of network files living on a remote vault.
+
+Loading a network copies its CPIO off the vault share, which is slow over a
+WAN mount when the same setups get loaded again and again. Raw CPIO
+contents are kept in a cache folder on the local disk instead, keyed by the
+network file's path along with its modification time and size, so a
+network saved over is fetched afresh while unchanged ones are served
+locally.
+
+The cache is bounded in size, evicting the least recently used entries
+first. Its location and size cap in megabytes can be set through the
+NETWORK_VAULT_CACHE_DIR and NETWORK_VAULT_CACHE_SIZE environment variables,
+a size of 0 disabling it.
+"""
+
+import contextlib
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import typing
+
+import network_saver.storage
+
+MAX_SIZE = 1024 * 1024 * 1024
+
+ENTRY_SUFFIX = '.cpio'
+
+
+def get_cache_dir() -> str:
+    """Fetch folder the local cache lives in.
+
+    Returns:
+        str: Path-like object representing local cache folder.
+    """
+
+    cache_dir: str = os.getenv('NETWORK_VAULT_CACHE_DIR')
+    if cache_dir:
+        return cache_dir
+    base_dir: str = os.getenv('LOCALAPPDATA') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    return os.path.join(base_dir, 'network_vault')
+
+
+def get_max_size() -> int:
+    """Fetch size cap of the local cache.
+
+    Returns:
+        int: Size cap in bytes, 0 if caching is disabled.
+    """
+
+    max_size: str = os.getenv('NETWORK_VAULT_CACHE_SIZE')
+    if not max_size:
+        return MAX_SIZE
+    try:
+        return max(0, int(float(max_size) * 1024 * 1024))
+    except ValueError:
+        print('Warning: Invalid NETWORK_VAULT_CACHE_SIZE ', max_size)
+        return MAX_SIZE
+
+
+class LocalCache(object):
+    """Size-bounded LRU cache of raw CPIO contents on the local disk.
+
+    Entries are written next to their final name and moved into place once
+    complete, so sessions sharing a cache folder never read a partial entry.
+    Recency is tracked through entries' modification times, which are
+    bumped on every hit.
+    """
+    def __init__(self, cache_dir: str=None, max_size: int=None) -> None:
+        """Initializes cache.
+
+        Args:
+            cache_dir string: Path-like object representing cache folder.
+            max_size int: Size cap in bytes, 0 disabling the cache.
+        """
+
+        self.cache_dir: str = cache_dir or get_cache_dir()
+        self.max_size: int = get_max_size() if max_size is None else max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.bytes_saved: int = 0
+        self.evictions: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether network files are cached at all."""
+
+        return self.max_size > 0
+
+    def stats(self) -> dict:
+        """Fetch cache statistics of this session.
+
+        Returns:
+            dict: Hits, misses, bytes not read from the vault thanks to hits,
+                  evictions, and current number and size of entries.
+        """
+
+        entries: list[tuple] = self._list_entries()
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes_saved': self.bytes_saved,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'size': sum(size for _mtime, size, _path in entries)
+            }
+
+    def get_entry_file(self, filepath: str) -> str:
+        """Fetch cache entry of given network file in its current state.
+
+        Args:
+            filepath string: Path-like object representing network file.
+        Returns:
+            str: Path-like object representing cache entry, or None if the
+                 network file does not exist.
+        """
+
+        try:
+            stat: os.stat_result = os.stat(filepath)
+        except OSError:
+            return None
+        key: str = '{}|{}|{}'.format(
+            os.path.normcase(os.path.abspath(filepath)),
+            stat.st_mtime_ns, stat.st_size
+        )
+        digest: str = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + ENTRY_SUFFIX)
+
+    def fetch(self, filepath: str, vault_dir: str=None) -> str:
+        """Fetch local copy of raw CPIO contents of given network file,
+           reading it from the vault only on a miss.
+
+        Args:
+            filepath string: Path-like object representing network file.
+            vault_dir string: Path-like object representing vault location
+                              the network file belongs to.
+        Returns:
+            str: Path-like object representing cache entry.
+        """
+
+        entry_file: str = self.get_entry_file(filepath)
+        if entry_file is None:
+            raise FileNotFoundError(filepath)
+        try:
+            os.utime(entry_file)
+        except OSError:
+            pass
+        else:
+            with self._lock:
+                self.hits += 1
+                self.bytes_saved += os.path.getsize(filepath)
+            return entry_file
+
+        with self._lock:
+            self.misses += 1
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with network_saver.storage.open_network_file(
+                filepath, vault_dir=vault_dir
+            ) as src_f, os.fdopen(fd, 'wb') as tmp_f:
+                shutil.copyfileobj(src_f, tmp_f, network_saver.storage.CHUNK_SIZE)
+            os.replace(tmp_file, entry_file)
+        except BaseException:
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+            raise
+        self.trim(keep=entry_file)
+        return entry_file
+
+    @contextlib.contextmanager
+    def open_entry(self, entry_file: str) -> typing.Iterator[typing.IO]:
+        """Open temporary file becoming given cache entry once closed, for
+           raw CPIO contents read elsewhere to be streamed into.
+
+        The temporary file is removed instead if the block raises.
+
+        Args:
+            entry_file string: Path-like object representing cache entry, as
+                               fetched before the contents were read.
+        Returns:
+            IO: Open temporary file.
+        """
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_f:
+                yield tmp_f
+            os.replace(tmp_file, entry_file)
+        except BaseException:
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+            raise
+        self.trim(keep=entry_file)
+
+    def store(self, entry_file: str, data: bytes) -> None:
+        """Store raw CPIO contents read elsewhere as given cache entry.
+
+        Args:
+            entry_file string: Path-like object representing cache entry, as
+                               fetched before the contents were read.
+            data bytes: Raw CPIO contents.
+        """
+
+        with self.open_entry(entry_file) as entry_f:
+            entry_f.write(data)
+
+    def extract(self, src: str, dst: str, vault_dir: str=None) -> None:
+        """Write raw CPIO contents of given network file to given location,
+           going through the cache.
+
+        Args:
+            src string: Path-like object representing network file.
+            dst string: Path-like object representing raw CPIO file to write.
+            vault_dir string: Path-like object representing vault location
+                              the network file belongs to.
+        """
+
+        if not self.enabled:
+            network_saver.storage.extract_network_file(
+                src, dst, vault_dir=vault_dir
+            )
+            return
+        try:
+            entry_file: str = self.fetch(src, vault_dir=vault_dir)
+            shutil.copyfile(entry_file, dst)
+        except OSError as err:
+            if not os.path.isfile(src):
+                raise
+            # a broken cache must never stand in the way of a load
+            print('Warning: Could not use local cache for ', src)
+            print(err)
+            network_saver.storage.extract_network_file(
+                src, dst, vault_dir=vault_dir
+            )
+
+    def _list_entries(self) -> list[tuple]:
+        """List cache entries from least to most recently used.
+
+        Returns:
+            list: Entries as (mtime, size, path) tuples.
+        """
+
+        entries: list[tuple] = list()
+        try:
+            names: list[str] = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            entry_file: str = os.path.join(self.cache_dir, name)
+            try:
+                stat: os.stat_result = os.stat(entry_file)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry_file))
+        entries.sort()
+        return entries
+
+    def trim(self, keep: str=None) -> int:
+        """Evict least recently used entries until under the size cap.
+
+        Args:
+            keep string: Path-like object representing entry never to evict,
+                         such as the one just fetched.
+        Returns:
+            int: Number of entries evicted.
+        """
+
+        entries: list[tuple] = self._list_entries()
+        size: int = sum(entry_size for _mtime, entry_size, _path in entries)
+        evicted: int = 0
+        for _mtime, entry_size, entry_file in entries:
+            if size <= self.max_size:
+                break
+            if entry_file == keep:
+                continue
+            try:
+                os.remove(entry_file)
+            except OSError:
+                # in use or already evicted by another session
+                continue
+            size -= entry_size
+            evicted += 1
+        with self._lock:
+            self.evictions += evicted
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+
+        for _mtime, _size, entry_file in self._list_entries():
+            try:
+                os.remove(entry_file)
+            except OSError:
+                pass
+
+
+_cache: LocalCache = None
+_cache_lock: threading.Lock = threading.Lock()
+
+
+def get_cache() -> LocalCache:
+    """Fetch session-wide local cache.
+
+    Returns:
+        LocalCache: Cache configured through the environment.
+    """
+
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LocalCache()
+        return _cache
+
+
+def extract_network_file(src: str, dst: str, vault_dir: str=None) -> None:
+    """Write raw CPIO contents of given network file to given location,
+       serving repeat loads from the session-wide local cache.
+
+    Args:
+        src string: Path-like object representing network file.
+        dst string: Path-like object representing raw CPIO file to write.
+        vault_dir string: Path-like object representing vault location the
+                          network file belongs to.
+    """
+
+    get_cache().extract(src, dst, vault_dir=vault_dir)
@@ -0,0 +1,360 @@
+"""Advisory file locks and generation checks guarding vault writes.
+
+Writes lock only what they touch: one network, one revision history or
+one user's journal, so artists saving different networks never wait on
+each other. A lock is a <file>.lock created exclusively beside the file it
+guards, which works the same on local disks and network shares, holding
+the host, pid and time of its owner.
+
+Held locks are touched every quarter of STALE_AGE by a background thread.
+Locks left behind by a crashed session stop being touched and are broken
+once they are older than STALE_AGE, or straight away when their owner is
+known to be gone. Locks are re-entrant within a thread, so a locked
+operation can call others that lock the same file.
+
+Saved networks carry a generation, bumped on every save. Callers that read
+a network, wait on an artist and then write it pass the generation they
+read, and get a ConflictError if another session changed the network in
+the meantime rather than silently clobbering its save.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+
+LOCK_TIMEOUT = 30.0
+STALE_AGE = 120.0
+POLL_INTERVAL = 0.05
+RETRIES = 3
+
+_held = threading.local()
+
+# lock files held by this process, mapped to their heartbeat interval and
+# when they are next due
+_beats: dict = dict()
+_beating: threading.Condition = threading.Condition()
+_heart: threading.Thread = None
+
+
+class LockTimeout(RuntimeError):
+    """Raised when a lock can't be acquired in time."""
+
+
+class ConflictError(RuntimeError):
+    """Raised when a network changed since the generation it was read at."""
+
+
+def get_lock_file(filepath: str) -> str:
+    """Fetch lock guarding given file.
+
+    Args:
+        filepath string: Path-like object representing file to guard.
+    Returns:
+        str: Path-like object representing lock file.
+    """
+
+    return filepath + '.lock'
+
+
+def _is_alive(pid: int) -> bool:
+    """Check whether given process of this host is still running.
+
+    Args:
+        pid int: Process id.
+    Returns:
+        bool: Whether it runs, assumed so where it can't be checked.
+    """
+
+    if os.name != 'posix':
+        # signal 0 isn't a harmless probe on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _heartbeat() -> None:
+    """Touch lock files held by this process until none are left."""
+
+    global _heart
+    with _beating:
+        while _beats:
+            now: float = time.monotonic()
+            for lock_file, beat in _beats.items():
+                if beat[1] > now:
+                    continue
+                try:
+                    os.utime(lock_file)
+                except FileNotFoundError:
+                    # briefly moved aside by a session checking it
+                    pass
+                except OSError as err:
+                    print('Warning: Could not refresh lock ', lock_file)
+                    print(err)
+                beat[1] = now + beat[0]
+            _beating.wait(min(beat[1] for beat in _beats.values()) - now)
+        _heart = None
+
+
+def _reset_after_fork() -> None:
+    """Forget locks of the parent process in a forked child, which inherits
+       neither them nor the heartbeat thread."""
+
+    global _beating, _heart
+    _beats.clear()
+    _beating = threading.Condition()
+    _heart = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _start_beating(lock_file: str, interval: float) -> None:
+    """Keep touching given lock file until _stop_beating is called.
+
+    Args:
+        lock_file string: Path-like object representing held lock file.
+        interval float: Seconds between touches.
+    """
+
+    global _heart
+    with _beating:
+        _beats[lock_file] = [interval, time.monotonic() + interval]
+        _beating.notify()
+        if _heart is None:
+            _heart = threading.Thread(target=_heartbeat, daemon=True)
+            _heart.start()
+
+
+def _stop_beating(lock_file: str) -> None:
+    """Stop touching given lock file.
+
+    Args:
+        lock_file string: Path-like object representing held lock file.
+    """
+
+    with _beating:
+        _beats.pop(lock_file, None)
+        _beating.notify()
+
+
+class FileLock(object):
+    """Exclusive lock on a file, shared across processes and hosts."""
+    def __init__(
+            self, filepath: str, timeout: float=LOCK_TIMEOUT,
+            stale_age: float=STALE_AGE
+        ) -> None:
+        """Initializes lock.
+
+        Args:
+            filepath string: Path-like object representing file to guard.
+            timeout float: Seconds to wait for the lock, 0 to try once.
+            stale_age float: Seconds after which a lock is considered left
+                             behind by a crashed session.
+        """
+
+        self.lock_file: str = get_lock_file(filepath)
+        self.timeout: float = timeout
+        self.stale_age: float = stale_age
+        self._stale: tuple = None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> bool:
+        self.release()
+        return False
+
+    def _counts(self) -> dict:
+        """Fetch how often this thread holds each lock file."""
+
+        if not hasattr(_held, 'counts'):
+            _held.counts = dict()
+        return _held.counts
+
+    def _try_create(self) -> bool:
+        """Create lock file if nobody holds it.
+
+        Returns:
+            bool: Whether the lock file was created.
+        """
+
+        try:
+            fd: int = os.open(
+                self.lock_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644
+            )
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as lock_f:
+            json.dump({
+                'host': socket.gethostname(), 'pid': os.getpid(),
+                'time': time.time()
+            }, lock_f)
+        return True
+
+    def _check(self, lock_file: str) -> tuple:
+        """Check whether given lock file was left behind.
+
+        Args:
+            lock_file string: Path-like object representing lock file.
+        Returns:
+            bool: Whether the lock can be broken.
+            tuple: Inode and modification time of the lock file checked,
+                   None if it is missing.
+        """
+
+        try:
+            stat: os.stat_result = os.stat(lock_file)
+            identity: tuple = (stat.st_ino, stat.st_mtime_ns)
+            age: float = time.time() - stat.st_mtime
+            with open(lock_file, 'r') as lock_f:
+                owner: dict = json.load(lock_f)
+        except FileNotFoundError:
+            return False, None
+        except ValueError:
+            # owner may still be writing it
+            return age > self.stale_age, identity
+        if age > self.stale_age:
+            return True, identity
+        return (
+            owner.get('host') == socket.gethostname()
+            and owner.get('pid') != os.getpid()
+            and not _is_alive(owner.get('pid'))
+        ), identity
+
+    def is_stale(self) -> bool:
+        """Check whether the current lock file was left behind.
+
+        Returns:
+            bool: Whether the lock can be broken.
+        """
+
+        stale, self._stale = self._check(self.lock_file)
+        return stale
+
+    def _break(self) -> None:
+        """Remove lock file last found stale by is_stale.
+
+        It is renamed away first, so of several sessions breaking the same
+        lock only one removes it. If the renamed file turns out not to be
+        the one found stale, as its owner let go of it and another session
+        took the lock in the meantime, it is put back instead.
+        """
+
+        stale_file: str = '{}.{}.stale'.format(self.lock_file, uuid.uuid4().hex)
+        try:
+            os.replace(self.lock_file, stale_file)
+        except FileNotFoundError:
+            return
+        stale, identity = self._check(stale_file)
+        if stale and identity == self._stale:
+            print('Warning: Broke stale lock ', self.lock_file)
+        else:
+            try:
+                # fails rather than replaces a lock taken since
+                os.link(stale_file, self.lock_file)
+            except OSError as err:
+                print('Warning: Could not restore lock ', self.lock_file)
+                print(err)
+        os.remove(stale_file)
+
+    def acquire(self) -> None:
+        """Wait until lock is held by this thread.
+
+        Raises LockTimeout if it can't be acquired within the timeout.
+        """
+
+        counts: dict = self._counts()
+        if counts.get(self.lock_file):
+            counts[self.lock_file] += 1
+            return
+
+        deadline: float = time.monotonic() + self.timeout
+        while not self._try_create():
+            if self.is_stale():
+                self._break()
+                continue
+            if time.monotonic() >= deadline:
+                raise LockTimeout(
+                    'Timed out waiting for lock {}'.format(self.lock_file)
+                )
+            time.sleep(POLL_INTERVAL)
+        counts[self.lock_file] = 1
+        _start_beating(self.lock_file, self.stale_age / 4)
+
+    def release(self) -> None:
+        """Release lock once this thread let go of it as often as it held
+           it."""
+
+        counts: dict = self._counts()
+        counts[self.lock_file] -= 1
+        if counts[self.lock_file]:
+            return
+        del counts[self.lock_file]
+        _stop_beating(self.lock_file)
+        try:
+            os.remove(self.lock_file)
+        except FileNotFoundError:
+            print('Warning: Lock was broken while held ', self.lock_file)
+
+
+def get_generation(network_data: dict) -> int:
+    """Fetch generation of given network.
+
+    Args:
+        network_data dict: Map of relevant network data, None if the network
+                           isn't saved.
+    Returns:
+        int: Generation, 0 for a network that isn't saved and 1 for one saved
+             before generations were recorded.
+    """
+
+    if network_data is None:
+        return 0
+    return network_data.get('generation', 1)
+
+
+def check_generation(network_data: dict, generation: int) -> None:
+    """Ensure given network is still at given generation.
+
+    Args:
+        network_data dict: Map of relevant network data as currently saved,
+                           None if the network isn't saved.
+        generation int: Generation the caller's changes are based on.
+    """
+
+    if get_generation(network_data) != generation:
+        raise ConflictError(
+            'Network was changed by another session '
+            '(generation {}, expected {})'.format(
+                get_generation(network_data), generation
+            )
+        )
+
+
+def retry(func, attempts: int=RETRIES):
+    """Call given function until it stops raising ConflictError.
+
+    Args:
+        func callable: Function re-reading what it writes on every call.
+        attempts int: Calls to make before giving up.
+    Returns:
+        object: What given function returned.
+    """
+
+    for attempt in range(attempts):
+        try:
+            return func()
+        except ConflictError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(POLL_INTERVAL * (attempt + 1))
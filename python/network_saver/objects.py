@@ -0,0 +1,305 @@
+"""Content-addressed object store deduplicating network files across a vault.
+
+Vaults with 'deduplicate' enabled in their settings store each network file
+as a small manifest rather than a full CPIO copy. The CPIO is split at its
+HouNC record boundaries, consecutive records belonging to the same node are
+grouped into a chunk, and each unique chunk is stored once under
+.netvault/objects, named after the sha256 of its contents.
+
+Record headers embed the time the network was copied, so they are kept in
+the manifest rather than the chunk. That way an unchanged node hashes to
+the same chunk no matter how many forks of a setup it was saved in.
+"""
+
+import hashlib
+import io
+import os
+import time
+
+import network_saver.cpio
+import network_saver.files
+import network_saver.storage
+import network_saver.utility
+
+MANIFEST_MAGIC = b'NVOBJECTS'
+MANIFEST_VERSION = 1
+
+GRACE_PERIOD = 60 * 60
+
+
+def get_objects_dir(vault_dir: str=None) -> str:
+    """Fetch object store directory of given vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing object store.
+    """
+
+    return os.path.join(
+        network_saver.utility.get_internal_dir(vault_dir), 'objects'
+    )
+
+
+def get_object_file(digest: str, vault_dir: str=None) -> str:
+    """Fetch file storing chunk with given digest.
+
+    Args:
+        digest string: Hex sha256 of chunk contents.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing object file.
+    """
+
+    return os.path.join(get_objects_dir(vault_dir), digest[:2], digest[2:])
+
+
+def is_manifest(header: bytes) -> bool:
+    """Check whether a network file is a manifest from its first bytes.
+
+    Args:
+        header bytes: First bytes of network file.
+    Returns:
+        bool: Whether the file is a manifest.
+    """
+
+    return header.startswith(MANIFEST_MAGIC)
+
+
+def _split_chunks(reader: 'network_saver.cpio.CpioReader'):
+    """Split raw CPIO contents into per-node chunks.
+
+    Anything that isn't a well-formed record stream is stored verbatim as a
+    single chunk.
+
+    Args:
+        reader CpioReader: Reader over raw CPIO contents.
+    Yields:
+        tuple: Chunk as (parts, body) tuple, where parts is a list of
+               (header, size) tuples describing each record in the body.
+               Header is None for data stored verbatim.
+    """
+
+    try:
+        records: list = list(reader.iter_records())
+    except network_saver.cpio.CpioError:
+        records: list = None
+    if not records:
+        yield [(None, len(reader))], bytes(reader.contents())
+        return
+
+    key: str = None
+    parts: list[tuple] = list()
+    bodies: list[bytes] = list()
+    for record in records:
+        record_key: str = network_saver.cpio.node_key(record.name) or record.name
+        if parts and record_key != key:
+            yield parts, b''.join(bodies)
+            parts, bodies = list(), list()
+        header: bytes = bytes(reader.header(record))
+        body: bytes = bytes(reader.body(record))
+        parts.append((header, len(body)))
+        bodies.append(body)
+        key = record_key
+    yield parts, b''.join(bodies)
+
+
+def _write_object(body: bytes, vault_dir: str, compression: str) -> str:
+    """Store chunk in object store unless an identical one already exists.
+
+    Args:
+        body bytes: Chunk contents.
+        vault_dir string: Path-like object representing vault location.
+        compression string: Compression the object is stored with.
+    Returns:
+        str: Hex sha256 of chunk contents.
+    """
+
+    digest: str = hashlib.sha256(body).hexdigest()
+    object_file: str = get_object_file(digest, vault_dir)
+    try:
+        # restart its grace period, so garbage collection doesn't remove it
+        # before the manifest referencing it again is written
+        os.utime(object_file)
+        return digest
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(object_file), exist_ok=True)
+    # identical contents, so losing a race to another session is fine
+    with network_saver.files.atomic_open(object_file) as tmp_f:
+        if compression == 'none':
+            tmp_f.write(body)
+        else:
+            with network_saver.storage._compressor(compression, tmp_f) as dst_f:
+                dst_f.write(body)
+    return digest
+
+
+def store_manifest(
+        src: str, dst: str, vault_dir: str, compression: str='none'
+    ) -> None:
+    """Store raw CPIO file as manifest of deduplicated chunks.
+
+    Chunks are written before the manifest, so a manifest never points at
+    a missing chunk.
+
+    Args:
+        src string: Path-like object representing raw CPIO file.
+        dst string: Path-like object representing manifest to write.
+        vault_dir string: Path-like object representing vault location.
+        compression string: Compression new chunks are stored with.
+    """
+
+    lines: list[bytes] = [
+        MANIFEST_MAGIC + ' {}\n'.format(MANIFEST_VERSION).encode()
+    ]
+    with network_saver.cpio.CpioReader(src) as reader:
+        for parts, body in _split_chunks(reader):
+            digest: str = _write_object(body, vault_dir, compression)
+            tokens: list[bytes] = [digest.encode()]
+            for header, size in parts:
+                tokens.append((header or b'-') + b':' + str(size).encode())
+            lines.append(b' '.join(tokens) + b'\n')
+
+    network_saver.files.write_file(dst, b''.join(lines))
+
+
+def read_manifest(filepath: str) -> list[tuple]:
+    """Read chunks listed in given manifest.
+
+    Args:
+        filepath string: Path-like object representing manifest.
+    Returns:
+        list: Chunks as (digest, parts) tuples, where parts is a list of
+              (header, size) tuples.
+    """
+
+    with open(filepath, 'rb') as manifest_f:
+        magic: bytes = manifest_f.readline()
+        if not is_manifest(magic):
+            raise ValueError("{} is not a manifest".format(filepath))
+        chunks: list[tuple] = list()
+        for line in manifest_f:
+            tokens: list[bytes] = line.split()
+            if not tokens:
+                continue
+            parts: list[tuple] = list()
+            for token in tokens[1:]:
+                header, size = token.rsplit(b':', 1)
+                parts.append((None if header == b'-' else header, int(size)))
+            chunks.append((tokens[0].decode(), parts))
+    return chunks
+
+
+def _iter_manifest(filepath: str, vault_dir: str):
+    """Reassemble raw CPIO contents of given manifest piece by piece.
+
+    Args:
+        filepath string: Path-like object representing manifest.
+        vault_dir string: Path-like object representing vault location.
+    Yields:
+        bytes: Consecutive pieces of raw CPIO contents.
+    """
+
+    for digest, parts in read_manifest(filepath):
+        with network_saver.storage.open_network_file(
+            get_object_file(digest, vault_dir), vault_dir=vault_dir
+        ) as object_f:
+            body: bytes = object_f.read()
+        offset: int = 0
+        for header, size in parts:
+            if header is not None:
+                yield network_saver.cpio.RECORD_MAGIC + header
+            yield body[offset:offset + size]
+            offset += size
+
+
+class _ManifestReader(io.RawIOBase):
+    """Readable binary stream over the reassembled contents of a manifest."""
+    def __init__(self, filepath: str, vault_dir: str) -> None:
+        self._pieces = _iter_manifest(filepath, vault_dir)
+        self._buffer: bytes = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._pieces)
+            except StopIteration:
+                return 0
+        size: int = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def open_manifest(filepath: str, vault_dir: str) -> io.BufferedReader:
+    """Open manifest for reading its reassembled raw CPIO contents.
+
+    Args:
+        filepath string: Path-like object representing manifest.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        io.BufferedReader: Readable binary file object.
+    """
+
+    return io.BufferedReader(
+        _ManifestReader(filepath, vault_dir),
+        network_saver.storage.CHUNK_SIZE
+    )
+
+
+def collect_garbage(vault_dir: str=None, grace_period: int=GRACE_PERIOD) -> int:
+    """Remove chunks no longer referenced by any manifest in given vault.
+
+    Chunks younger than the grace period are kept, as a save in progress
+    writes its chunks before its manifest.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+        grace_period int: Age in seconds below which chunks are kept.
+    Returns:
+        int: Number of chunks removed.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    objects_dir: str = get_objects_dir(vault_dir)
+
+    referenced: set[str] = set()
+    for root, dirs, files in os.walk(vault_dir):
+        if os.path.abspath(root) == os.path.abspath(objects_dir):
+            dirs[:] = list()
+            continue
+        for name in files:
+            filepath: str = os.path.join(root, name)
+            try:
+                with open(filepath, 'rb') as header_f:
+                    if not is_manifest(header_f.read(len(MANIFEST_MAGIC))):
+                        continue
+                referenced.update(
+                    digest for digest, _parts in read_manifest(filepath)
+                )
+            except (OSError, ValueError) as err:
+                print('Warning: Could not read manifest ', filepath)
+                print(err)
+                # be conservative, an unreadable manifest may still be live
+                return 0
+
+    removed: int = 0
+    cutoff: float = time.time() - grace_period
+    if not os.path.isdir(objects_dir):
+        return removed
+    for prefix in os.listdir(objects_dir):
+        prefix_dir: str = os.path.join(objects_dir, prefix)
+        for name in os.listdir(prefix_dir):
+            object_file: str = os.path.join(prefix_dir, name)
+            if prefix + name in referenced:
+                continue
+            if os.path.getmtime(object_file) > cutoff:
+                continue
+            os.remove(object_file)
+            removed += 1
+    return removed
@@ -0,0 +1,309 @@
+"""Speculative prefetch of network files ahead of them being loaded.
+
+Selecting a network in the loader starts reading its raw CPIO contents off
+the vault on a worker thread, so by the time the artist clicks load the
+transfer is done or well under way. Prefetched contents are held in memory
+within a budget, and handed over to the local cache as well so the network
+is served locally the next time around too.
+"""
+
+from collections import OrderedDict
+import concurrent.futures
+import contextlib
+import os
+import threading
+import typing
+
+import network_saver.local_cache
+import network_saver.storage
+
+MEMORY_BUDGET = 64 * 1024 * 1024
+
+MAX_WORKERS = 2
+
+
+class _Cancelled(Exception):
+    """Raised to abandon a prefetch cancelled midway through its read."""
+
+
+class _Job(object):
+    """Single prefetch in flight."""
+    def __init__(self, filepath: str, stamp: tuple) -> None:
+        self.filepath: str = filepath
+        self.stamp: tuple = stamp
+        self.cancelled: threading.Event = threading.Event()
+        self.future: concurrent.futures.Future = None
+
+
+def _get_stamp(filepath: str) -> tuple:
+    """Fetch modification time and size of given file.
+
+    Args:
+        filepath string: Path-like object representing file.
+    Returns:
+        tuple: Modification time and size, or None if there is no file.
+    """
+
+    try:
+        stat: os.stat_result = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Prefetcher(object):
+    """Reads network files in the background, buffering them for a load."""
+    def __init__(
+            self, vault_dir: str=None, budget: int=MEMORY_BUDGET,
+            cache: network_saver.local_cache.LocalCache=None
+        ) -> None:
+        """Initializes prefetcher.
+
+        Args:
+            vault_dir string: Path-like object representing vault location
+                              network files belong to.
+            budget int: Bytes of prefetched contents held in memory at most.
+                        Larger networks are not prefetched.
+            cache LocalCache: Local cache to check before, and fill after,
+                              reading a network file. Defaults to the
+                              session-wide one.
+        """
+
+        self.vault_dir: str = vault_dir
+        self.budget: int = budget
+        self.cache: network_saver.local_cache.LocalCache = \
+            cache or network_saver.local_cache.get_cache()
+        self._executor: concurrent.futures.ThreadPoolExecutor = \
+            concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        self._jobs: dict[str, _Job] = dict()
+        self._buffers: OrderedDict = OrderedDict()
+        self._buffered: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def prefetch(self, filepaths: list[str]) -> None:
+        """Start reading given network files, cancelling any other prefetch
+           still in flight.
+
+        Args:
+            filepaths list: Path-like objects representing network files.
+        """
+
+        with self._lock:
+            for filepath in list(self._jobs):
+                if filepath not in filepaths:
+                    self._cancel(filepath)
+            for filepath in filepaths:
+                stamp: tuple = _get_stamp(filepath)
+                if stamp is None or filepath in self._jobs:
+                    continue
+                buffer: tuple = self._buffers.get(filepath)
+                if buffer is not None and buffer[0] == stamp:
+                    self._buffers.move_to_end(filepath)
+                    continue
+                job: _Job = _Job(filepath, stamp)
+                job.future = self._executor.submit(self._run, job)
+                self._jobs[filepath] = job
+
+    def _cancel(self, filepath: str) -> None:
+        """Cancel prefetch of given network file. Expects lock to be held.
+
+        Args:
+            filepath string: Path-like object representing network file.
+        """
+
+        job: _Job = self._jobs.pop(filepath)
+        job.cancelled.set()
+        job.future.cancel()
+
+    def cancel(self) -> None:
+        """Cancel every prefetch in flight."""
+
+        with self._lock:
+            for filepath in list(self._jobs):
+                self._cancel(filepath)
+
+    def _run(self, job: _Job) -> bytes:
+        """Run given job, buffering what it read.
+
+        Args:
+            job _Job: Prefetch to run.
+        Returns:
+            bytes: Raw CPIO contents, or None if nothing was read.
+        """
+
+        data: bytes = None
+        try:
+            data = self._read(job)
+        finally:
+            with self._lock:
+                if self._jobs.get(job.filepath) is job:
+                    del self._jobs[job.filepath]
+                    if data is not None:
+                        self._buffer(job.filepath, job.stamp, data)
+        return data
+
+    def _read(self, job: _Job) -> bytes:
+        """Read raw CPIO contents of network file of given job.
+
+        With the local cache enabled, contents are streamed into a cache
+        entry as they are read, so networks over the memory budget are
+        still transferred only once, and loaded from the cache.
+
+        Args:
+            job _Job: Prefetch to run.
+        Returns:
+            bytes: Raw CPIO contents, or None if the prefetch was cancelled,
+                   exceeded the memory budget or the network file is already
+                   cached locally.
+        """
+
+        entry_file: str = None
+        if self.cache.enabled:
+            entry_file = self.cache.get_entry_file(job.filepath)
+            if entry_file is None or os.path.isfile(entry_file):
+                # loads are served locally already
+                return None
+        elif job.stamp[1] > self.budget:
+            # stored contents are no larger than the raw ones, so these
+            # would be over budget too, and the load reads them anyway
+            return None
+
+        try:
+            return self._transfer(job, entry_file)
+        except _Cancelled:
+            return None
+
+    def _transfer(self, job: _Job, entry_file: str) -> bytes:
+        """Read network file of given job, streaming it into given cache
+           entry as well.
+
+        Args:
+            job _Job: Prefetch to run.
+            entry_file string: Path-like object representing cache entry to
+                               write, None to read into memory only.
+        Returns:
+            bytes: Raw CPIO contents, or None if they exceeded the memory
+                   budget.
+        """
+
+        chunks: list[bytes] = list()
+        size: int = 0
+        with contextlib.ExitStack() as stack:
+            src_f: typing.IO = stack.enter_context(
+                network_saver.storage.open_network_file(
+                    job.filepath, vault_dir=self.vault_dir
+                )
+            )
+            entry_f: typing.IO = None
+            if entry_file is not None:
+                try:
+                    entry_f = stack.enter_context(
+                        self.cache.open_entry(entry_file)
+                    )
+                except OSError as err:
+                    print('Warning: Could not cache prefetched ', job.filepath)
+                    print(err)
+            while True:
+                if job.cancelled.is_set():
+                    # the partly written cache entry is removed as well
+                    raise _Cancelled()
+                chunk: bytes = src_f.read(network_saver.storage.CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if entry_f is not None:
+                    entry_f.write(chunk)
+                if chunks is None:
+                    continue
+                if size > self.budget:
+                    if entry_f is None:
+                        return None
+                    # keep filling the cache entry only
+                    chunks = None
+                else:
+                    chunks.append(chunk)
+
+        if chunks is None:
+            return None
+        return b''.join(chunks)
+
+    def _buffer(self, filepath: str, stamp: tuple, data: bytes) -> None:
+        """Hold on to prefetched contents, evicting the least recently
+           prefetched ones past the budget. Expects lock to be held.
+
+        Args:
+            filepath string: Path-like object representing network file.
+            stamp tuple: Modification time and size of network file when it
+                         was read.
+            data bytes: Raw CPIO contents of network file.
+        """
+
+        old: tuple = self._buffers.pop(filepath, None)
+        if old is not None:
+            self._buffered -= len(old[1])
+        self._buffers[filepath] = (stamp, data)
+        self._buffered += len(data)
+        while self._buffered > self.budget:
+            _filepath, (_stamp, evicted) = self._buffers.popitem(last=False)
+            self._buffered -= len(evicted)
+
+    def take(self, filepath: str, timeout: float=None) -> bytes:
+        """Fetch prefetched contents of given network file, waiting on a
+           prefetch still in flight.
+
+        Args:
+            filepath string: Path-like object representing network file.
+            timeout float: Seconds to wait for a prefetch in flight at most,
+                           waiting for as long as it takes if not given.
+        Returns:
+            bytes: Raw CPIO contents, or None if they weren't prefetched or
+                   the network file changed since.
+        """
+
+        with self._lock:
+            job: _Job = self._jobs.get(filepath)
+            buffer: tuple = self._buffers.get(filepath)
+        if job is not None:
+            try:
+                buffer = (job.stamp, job.future.result(timeout))
+            except (
+                    concurrent.futures.CancelledError,
+                    concurrent.futures.TimeoutError
+                ):
+                return None
+            except Exception as err:
+                print('Warning: Could not prefetch ', filepath)
+                print(err)
+                return None
+
+        if buffer is None or buffer[1] is None:
+            return None
+        if buffer[0] != _get_stamp(filepath):
+            # saved over since, the prefetched contents are stale
+            return None
+        return buffer[1]
+
+    def extract(self, src: str, dst: str) -> None:
+        """Write raw CPIO contents of given network file to given location,
+           using prefetched contents if there are any.
+
+        Args:
+            src string: Path-like object representing network file.
+            dst string: Path-like object representing raw CPIO file to write.
+        """
+
+        data: bytes = self.take(src)
+        if data is None:
+            self.cache.extract(src, dst, vault_dir=self.vault_dir)
+            return
+        with open(dst, 'wb') as dst_f:
+            dst_f.write(data)
+
+    def shutdown(self) -> None:
+        """Cancel prefetches in flight and drop buffered contents."""
+
+        self.cancel()
+        with self._lock:
+            self._buffers.clear()
+            self._buffered = 0
+        self._executor.shutdown(wait=False)
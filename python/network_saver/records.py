@@ -0,0 +1,140 @@
+"""Per-network metadata records kept beside each network's CPIO file.
+
+Each network's data lives in its own small <name>.meta.json in the user's
+folder, so saving, removing or looking up one network only ever touches
+that network's record. The user's networks.json, with its journal, is kept
+on as a summary of every record for fast listing, and is rebuilt from the
+records whenever it goes missing or can't be read.
+
+Users saved before records existed only have networks.json. Records are
+written for all of their networks the first time they are written to.
+"""
+
+import json
+import os
+
+import network_saver.files
+
+RECORD_SUFFIX = '.meta.json'
+
+
+def get_record_file(user_dir: str, network_name: str) -> str:
+    """Fetch record holding given network's data.
+
+    Args:
+        user_dir string: Path-like object representing user folder.
+        network_name string: Name of network.
+    Returns:
+        str: Path-like object representing record file.
+    """
+
+    return os.path.join(user_dir, network_name + RECORD_SUFFIX)
+
+
+def read_record(user_dir: str, network_name: str) -> dict:
+    """Read data of given network from its record.
+
+    Args:
+        user_dir string: Path-like object representing user folder.
+        network_name string: Name of network.
+    Returns:
+        dict: Map of relevant network data, or None if it has no record.
+    """
+
+    try:
+        with open(get_record_file(user_dir, network_name), 'r') as record_f:
+            return json.load(record_f)
+    except FileNotFoundError:
+        return None
+
+
+def write_record(user_dir: str, network_name: str, network_data: dict) -> None:
+    """Atomically replace record of given network.
+
+    Args:
+        user_dir string: Path-like object representing user folder.
+        network_name string: Name of network.
+        network_data dict: Map of relevant network data.
+    """
+
+    with network_saver.files.atomic_open(
+        get_record_file(user_dir, network_name), 'w'
+    ) as tmp_f:
+        json.dump(network_data, tmp_f)
+
+
+def remove_record(user_dir: str, network_name: str) -> None:
+    """Remove record of given network, if it has one.
+
+    Args:
+        user_dir string: Path-like object representing user folder.
+        network_name string: Name of network.
+    """
+
+    try:
+        os.remove(get_record_file(user_dir, network_name))
+    except FileNotFoundError:
+        pass
+
+
+def list_records(user_dir: str) -> list[str]:
+    """List networks with a record in given user folder.
+
+    Args:
+        user_dir string: Path-like object representing user folder.
+    Returns:
+        list: Names of networks, least recently saved first.
+    """
+
+    try:
+        entries: list[os.DirEntry] = [
+            entry for entry in os.scandir(user_dir)
+            if entry.name.endswith(RECORD_SUFFIX)
+        ]
+    except FileNotFoundError:
+        return list()
+    entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+    return [entry.name[:-len(RECORD_SUFFIX)] for entry in entries]
+
+
+def read_records(user_dir: str) -> dict:
+    """Read every record in given user folder.
+
+    Records that can't be parsed are skipped with a warning.
+
+    Args:
+        user_dir string: Path-like object representing user folder.
+    Returns:
+        dict: Map of network names to their relevant data, least recently
+              saved first.
+    """
+
+    data: dict = dict()
+    for network_name in list_records(user_dir):
+        try:
+            network_data: dict = read_record(user_dir, network_name)
+        except (OSError, ValueError) as err:
+            print('Warning: Could not read record of ', network_name)
+            print(err)
+            continue
+        if network_data is not None:
+            data[network_name] = network_data
+    return data
+
+
+def migrate(user_dir: str, data: dict) -> int:
+    """Write records for networks of given summary that have none yet.
+
+    Args:
+        user_dir string: Path-like object representing user folder.
+        data dict: Map of network names to their relevant data, as read from
+                   the user's networks.json.
+    Returns:
+        int: Number of records written.
+    """
+
+    existing: set[str] = set(list_records(user_dir))
+    missing: list[str] = [name for name in data if name not in existing]
+    for network_name in missing:
+        write_record(user_dir, network_name, data[network_name])
+    return len(missing)
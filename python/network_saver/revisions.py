@@ -0,0 +1,596 @@
+"""Revision history of networks saved over under the same name.
+
+Before a network is overwritten its current contents are archived as a
+revision under .netvault/revisions/<user>/<network>. Revisions are stored
+as line deltas against the revision before them, since a CPIO saved again
+usually differs in a handful of parameter lines only. Every
+SNAPSHOT_INTERVAL revisions, or whenever a delta wouldn't be any smaller,
+a full copy is stored instead, which caps how many deltas have to be
+applied to rebuild any one revision. Revisions larger than MAX_DELTA_SIZE
+are always stored in full, as diffing them would take far longer than the
+space saved is worth. Everything is zlib compressed.
+
+Saves only read the contents being overwritten while holding the network's
+lock. Deltas are computed and written by a background worker, one revision
+at a time in the order they were read, under a lock of the network's
+revision history instead.
+
+Only the 'revisions' most recent revisions are kept, set in the vault's
+settings and defaulting to MAX_REVISIONS. When the oldest revision is
+dropped, the one after it is rebuilt and stored in full if it was a delta.
+
+A delta is a sequence of operations, each a header line followed, for
+inserts, by the inserted bytes:
+
+    c <first> <last>    copy lines first up to last of the base revision
+    i <size>            insert the next size bytes
+"""
+
+import concurrent.futures
+import difflib
+from getpass import getuser
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+
+import network_saver.files
+import network_saver.locks
+import network_saver.storage
+import network_saver.trace
+import network_saver.utility
+
+MAX_REVISIONS = 10
+SNAPSHOT_INTERVAL = 5
+MAX_DELTA_SIZE = 2 * 1024 * 1024
+
+INDEX_NAME = 'revisions.json'
+COMPRESS_LEVEL = 6
+
+_executor: concurrent.futures.ThreadPoolExecutor = None
+_executor_lock: threading.Lock = threading.Lock()
+
+
+def get_history_dir(
+        network_name: str, user: str=None, vault_dir: str=None
+    ) -> str:
+    """Fetch folder holding revisions of given network.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing revisions folder.
+    """
+
+    return os.path.join(
+        network_saver.utility.get_internal_dir(vault_dir), 'revisions',
+        user or getuser(), network_name
+    )
+
+
+def lock_history(
+        network_name: str, user: str=None, vault_dir: str=None
+    ) -> network_saver.locks.FileLock:
+    """Fetch lock guarding revision history of given network.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        FileLock: Lock, acquired by using it as a context manager.
+    """
+
+    history_dir: str = get_history_dir(network_name, user, vault_dir)
+    os.makedirs(os.path.dirname(history_dir), exist_ok=True)
+    return network_saver.locks.FileLock(history_dir)
+
+
+def get_retention(vault_dir: str=None) -> int:
+    """Fetch number of revisions kept per network in given vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        int: Revisions kept, 0 if revision history is turned off.
+    """
+
+    settings: dict = network_saver.utility.get_vault_settings(vault_dir)
+    return max(0, int(settings.get('revisions', MAX_REVISIONS)))
+
+
+def make_delta(base: bytes, target: bytes) -> bytes:
+    """Build line delta turning given base into given target.
+
+    Args:
+        base bytes: Contents of previous revision.
+        target bytes: Contents of revision to encode.
+    Returns:
+        bytes: Uncompressed delta.
+    """
+
+    base_lines: list[bytes] = base.splitlines(keepends=True)
+    target_lines: list[bytes] = target.splitlines(keepends=True)
+    matcher: difflib.SequenceMatcher = difflib.SequenceMatcher(
+        None, base_lines, target_lines
+    )
+    ops: list[bytes] = list()
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append(b'c %d %d\n' % (i1, i2))
+        elif j2 > j1:
+            inserted: bytes = b''.join(target_lines[j1:j2])
+            ops.append(b'i %d\n' % len(inserted))
+            ops.append(inserted)
+    return b''.join(ops)
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild revision from given base and delta.
+
+    Args:
+        base bytes: Contents of previous revision.
+        delta bytes: Uncompressed delta, as built by make_delta.
+    Returns:
+        bytes: Contents of revision.
+    """
+
+    base_lines: list[bytes] = base.splitlines(keepends=True)
+    parts: list[bytes] = list()
+    offset: int = 0
+    while offset < len(delta):
+        end: int = delta.index(b'\n', offset)
+        op: list[bytes] = delta[offset:end].split()
+        offset = end + 1
+        if op[0] == b'c':
+            parts.extend(base_lines[int(op[1]):int(op[2])])
+        elif op[0] == b'i':
+            size: int = int(op[1])
+            parts.append(delta[offset:offset + size])
+            offset += size
+        else:
+            raise RuntimeError('Corrupt revision delta')
+    return b''.join(parts)
+
+
+def _read_index(history_dir: str) -> list[dict]:
+    """Read revisions of a network, oldest first.
+
+    Args:
+        history_dir string: Path-like object representing revisions folder.
+    Returns:
+        list: Map of revision number, kind, file, checksum, save time and
+              network data of each revision.
+    """
+
+    try:
+        with open(os.path.join(history_dir, INDEX_NAME), 'r') as index_f:
+            return json.load(index_f)
+    except FileNotFoundError:
+        return list()
+
+
+def _write_index(history_dir: str, revisions: list[dict]) -> None:
+    """Replace revisions index of a network.
+
+    Args:
+        history_dir string: Path-like object representing revisions folder.
+        revisions list: Revisions, oldest first.
+    """
+
+    network_saver.files.write_file(
+        os.path.join(history_dir, INDEX_NAME),
+        json.dumps(revisions, indent=4).encode('utf-8')
+    )
+
+
+def _read_revision(history_dir: str, revisions: list[dict], position: int) -> bytes:
+    """Rebuild contents of revision at given position of index.
+
+    Args:
+        history_dir string: Path-like object representing revisions folder.
+        revisions list: Revisions, oldest first.
+        position int: Position of revision to rebuild.
+    Returns:
+        bytes: Raw CPIO contents of revision.
+    """
+
+    start: int = position
+    while revisions[start]['kind'] != 'full':
+        start -= 1
+        if start < 0:
+            raise RuntimeError('Revision chain has no snapshot')
+
+    data: bytes = None
+    for revision in revisions[start:position + 1]:
+        with open(os.path.join(history_dir, revision['file']), 'rb') as rev_f:
+            contents: bytes = zlib.decompress(rev_f.read())
+        data = contents if revision['kind'] == 'full' else apply_delta(
+            data, contents
+        )
+    if hashlib.sha256(data).hexdigest() != revisions[position]['sha256']:
+        raise RuntimeError(
+            'Revision {} failed its checksum'.format(
+                revisions[position]['revision']
+            )
+        )
+    return data
+
+
+def _store(
+        history_dir: str, revisions: list[dict], revision: dict, data: bytes,
+        base: bytes=None
+    ) -> None:
+    """Write revision contents, as a delta against given base if it pays
+       off, filling in the kind and file of given revision.
+
+    Args:
+        history_dir string: Path-like object representing revisions folder.
+        revisions list: Revisions before this one, oldest first.
+        revision dict: Revision to store.
+        data bytes: Raw CPIO contents of revision.
+        base bytes: Contents of revision before this one, if any.
+    """
+
+    full: bytes = zlib.compress(data, COMPRESS_LEVEL)
+    contents: bytes = full
+    revision['kind'] = 'full'
+    chain: int = 0
+    for previous in reversed(revisions):
+        if previous['kind'] == 'full':
+            break
+        chain += 1
+    if base is not None and chain + 1 < SNAPSHOT_INTERVAL and \
+            max(len(base), len(data)) <= MAX_DELTA_SIZE:
+        delta: bytes = zlib.compress(make_delta(base, data), COMPRESS_LEVEL)
+        if len(delta) < len(full):
+            contents = delta
+            revision['kind'] = 'delta'
+    revision['file'] = '{}.{}'.format(revision['revision'], revision['kind'])
+    network_saver.files.write_file(
+        os.path.join(history_dir, revision['file']), contents
+    )
+
+
+def _prune(history_dir: str, revisions: list[dict], keep: int) -> list[dict]:
+    """Drop oldest revisions past given count, storing the new oldest one
+       in full.
+
+    Args:
+        history_dir string: Path-like object representing revisions folder.
+        revisions list: Revisions, oldest first.
+        keep int: Revisions to keep.
+    Returns:
+        list: Revisions kept, oldest first.
+    """
+
+    excess: int = len(revisions) - keep
+    if excess <= 0:
+        return revisions
+    kept: list[dict] = revisions[excess:]
+    if kept and kept[0]['kind'] == 'delta':
+        data: bytes = _read_revision(history_dir, revisions, excess)
+        old_file: str = kept[0]['file']
+        kept[0] = dict(kept[0])
+        _store(history_dir, list(), kept[0], data)
+        os.remove(os.path.join(history_dir, old_file))
+    for revision in revisions[:excess]:
+        try:
+            os.remove(os.path.join(history_dir, revision['file']))
+        except FileNotFoundError:
+            pass
+    return kept
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Fetch worker archiving revisions, started on first use.
+
+    Returns:
+        ThreadPoolExecutor: Single worker, so revisions are archived in the
+                            order they were read.
+    """
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        return _executor
+
+
+def _read_current(
+        network_name: str, user: str, vault_dir: str
+    ) -> tuple[bytes, float]:
+    """Read current contents of given network. Expects its lock to be held.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        tuple: Raw CPIO contents and modification time of network file, or
+               None if history is turned off or there is no network file.
+    """
+
+    network_file: str = os.path.join(vault_dir, user, network_name + '.cpio')
+    if not get_retention(vault_dir) or not os.path.isfile(network_file):
+        return None
+    with network_saver.storage.open_network_file(
+        network_file, vault_dir=vault_dir
+    ) as network_f:
+        data: bytes = network_f.read()
+    return data, os.path.getmtime(network_file)
+
+
+def _archive(
+        network_name: str, network_data: dict, data: bytes, mtime: float,
+        user: str, vault_dir: str
+    ) -> dict:
+    """Store given contents as the newest revision of given network.
+
+    Args:
+        network_name string: Name of network.
+        network_data dict: Map of relevant network data the contents were
+                           saved with.
+        data bytes: Raw CPIO contents to archive.
+        mtime float: Modification time of network file they were read from.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        dict: Revision recorded.
+    """
+
+    history_dir: str = get_history_dir(network_name, user, vault_dir)
+    with lock_history(
+        network_name, user=user, vault_dir=vault_dir
+    ), network_saver.trace.span(
+        'revisions.record_revision', path=history_dir
+    ) as span:
+        os.makedirs(history_dir, exist_ok=True)
+        revisions: list[dict] = _read_index(history_dir)
+        base: bytes = None
+        if revisions:
+            base = _read_revision(history_dir, revisions, len(revisions) - 1)
+        revision: dict = {
+            'revision': revisions[-1]['revision'] + 1 if revisions else 1,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'size': len(data),
+            'time': mtime,
+            'archived': time.time(),
+            'data': network_data
+        }
+        _store(history_dir, revisions, revision, data, base=base)
+        revisions.append(revision)
+        _write_index(
+            history_dir, _prune(history_dir, revisions, get_retention(vault_dir))
+        )
+        if span:
+            span.add(bytes=len(data), kind=revision['kind'])
+    return revision
+
+
+def _archive_quietly(network_name: str, *args) -> dict:
+    """Store given contents as the newest revision of given network,
+       warning instead of raising if that fails.
+
+    Args:
+        network_name string: Name of network.
+        args tuple: Remaining arguments of _archive.
+    Returns:
+        dict: Revision recorded, or None if it couldn't be.
+    """
+
+    try:
+        return _archive(network_name, *args)
+    except (OSError, ValueError, RuntimeError) as err:
+        print('Warning: Could not archive revision of ', network_name)
+        print(err)
+        return None
+
+
+def queue_revision(
+        network_name: str, network_data: dict, user: str=None,
+        vault_dir: str=None
+    ) -> concurrent.futures.Future:
+    """Archive current contents of given network before it is overwritten,
+       storing the revision in the background.
+
+    Only reading the contents happens right away, so the network can be
+    saved over as soon as this returns. Failures to store the revision are
+    printed rather than raised.
+
+    Args:
+        network_name string: Name of network about to be overwritten.
+        network_data dict: Map of relevant network data as currently saved.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        Future: Resolving to the revision recorded, or None if history is
+                turned off or there is no network file to archive.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    with network_saver.utility.lock_network(
+        network_name, user=user, vault_dir=vault_dir
+    ):
+        current: tuple = _read_current(network_name, user, vault_dir)
+    if current is None:
+        return None
+    return _get_executor().submit(
+        _archive_quietly, network_name, network_data, *current, user,
+        vault_dir
+    )
+
+
+def record_revision(
+        network_name: str, network_data: dict, user: str=None,
+        vault_dir: str=None
+    ) -> dict:
+    """Archive current contents of given network before it is overwritten.
+
+    Args:
+        network_name string: Name of network about to be overwritten.
+        network_data dict: Map of relevant network data as currently saved.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        dict: Revision recorded, or None if history is turned off or there
+              is no network file to archive.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    with network_saver.utility.lock_network(
+        network_name, user=user, vault_dir=vault_dir
+    ):
+        current: tuple = _read_current(network_name, user, vault_dir)
+    if current is None:
+        return None
+    # behind any revision still queued, so they are stored in order
+    return _get_executor().submit(
+        _archive, network_name, network_data, *current, user, vault_dir
+    ).result()
+
+
+def list_revisions(
+        network_name: str, user: str=None, vault_dir: str=None
+    ) -> list[dict]:
+    """List archived revisions of given network.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        list: Map of revision number, save time, size and network data of
+              each revision, oldest first.
+    """
+
+    return _read_index(get_history_dir(network_name, user, vault_dir))
+
+
+def read_revision(
+        network_name: str, revision: int, user: str=None, vault_dir: str=None
+    ) -> bytes:
+    """Rebuild contents of given revision of given network.
+
+    Args:
+        network_name string: Name of network.
+        revision int: Revision number.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        bytes: Raw CPIO contents of revision.
+    """
+
+    history_dir: str = get_history_dir(network_name, user, vault_dir)
+    revisions: list[dict] = _read_index(history_dir)
+    for position, entry in enumerate(revisions):
+        if entry['revision'] == revision:
+            with network_saver.trace.span(
+                'revisions.read_revision', revision=revision
+            ):
+                return _read_revision(history_dir, revisions, position)
+    raise ValueError(
+        'No revision {} of network {}'.format(revision, network_name)
+    )
+
+
+def extract_revision(
+        network_name: str, revision: int, dst: str, user: str=None,
+        vault_dir: str=None
+    ) -> None:
+    """Write raw CPIO contents of given revision to given location.
+
+    Args:
+        network_name string: Name of network.
+        revision int: Revision number.
+        dst string: Path-like object representing raw CPIO file to write.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    data: bytes = read_revision(
+        network_name, revision, user=user, vault_dir=vault_dir
+    )
+    with open(dst, 'wb') as dst_f:
+        dst_f.write(data)
+
+
+def delete_history(
+        network_name: str, user: str=None, vault_dir: str=None
+    ) -> None:
+    """Remove every revision of given network.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    history_dir: str = get_history_dir(network_name, user, vault_dir)
+    if not os.path.isdir(history_dir):
+        return
+    with network_saver.utility.lock_network(
+        network_name, user=user, vault_dir=vault_dir
+    ), lock_history(network_name, user=user, vault_dir=vault_dir):
+        for filename in os.listdir(history_dir):
+            os.remove(os.path.join(history_dir, filename))
+        os.rmdir(history_dir)
+
+
+def restore_revision(
+        network_name: str, revision: int, user: str=None, vault_dir: str=None
+    ) -> None:
+    """Make given revision of given network current again, archiving the
+       current contents as a revision first.
+
+    Args:
+        network_name string: Name of network.
+        revision int: Revision number to restore.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    entry: dict = None
+    for candidate in list_revisions(network_name, user, vault_dir):
+        if candidate['revision'] == revision:
+            entry = candidate
+    if entry is None:
+        raise ValueError(
+            'No revision {} of network {}'.format(revision, network_name)
+        )
+    data: bytes = read_revision(network_name, revision, user, vault_dir)
+
+    with network_saver.utility.lock_network(
+        network_name, user=user, vault_dir=vault_dir
+    ):
+        current: dict = network_saver.utility.get_network_data(
+            network_name, user=user, vault_dir=vault_dir
+        )
+        if current is not None:
+            record_revision(network_name, current, user, vault_dir)
+
+        fd, tmp_file = tempfile.mkstemp(suffix='.cpio')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_f:
+                tmp_f.write(data)
+            network_saver.storage.store_network_file(
+                tmp_file,
+                os.path.join(vault_dir, user, network_name + '.cpio'),
+                compression=network_saver.storage.get_compression(vault_dir),
+                deduplicate=network_saver.storage.is_deduplicated(vault_dir),
+                vault_dir=vault_dir
+            )
+        finally:
+            os.remove(tmp_file)
+        network_saver.utility.put_network_data(
+            network_name, entry['data'], user=user, vault_dir=vault_dir
+        )
@@ -0,0 +1,342 @@
+"""Incremental inverted index for type-ahead search over saved networks.
+
+Network names, notes, contexts and versions are split into lowercase
+alphanumeric tokens, each mapped to the networks containing it. Every term
+of a query has to prefix-match a token of a network for it to be found, so
+'rig v2' finds 'my_rig_v2' while it is still being typed. Prefixes are
+resolved against a sorted vocabulary of distinct tokens rather than being
+indexed themselves, which keeps memory proportional to the vault.
+
+One index is kept per vault for the rest of the session. It is filled in
+user by user as the catalog lists them, and kept current as networks are
+saved and removed.
+"""
+
+import bisect
+import re
+import threading
+
+import network_saver.catalog
+
+FIELDS = ('name', 'notes', 'context', 'version')
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> list[str]:
+    """Split given text into search tokens.
+
+    Args:
+        text string: Text to split.
+    Returns:
+        list: Lowercase alphanumeric tokens in given text.
+    """
+
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _tokenize_network(network_name: str, network_data: dict) -> frozenset:
+    """Collect search tokens of every searchable field of a network.
+
+    Args:
+        network_name string: Name of network.
+        network_data dict: Map of relevant network data.
+    Returns:
+        frozenset: Distinct tokens of network.
+    """
+
+    tokens: set[str] = set(tokenize(network_name))
+    for field in FIELDS[1:]:
+        tokens.update(tokenize(str(network_data.get(field) or '')))
+    return frozenset(tokens)
+
+
+class SearchIndex(object):
+    """Inverted index over networks, keyed by (user, network name)."""
+    def __init__(self) -> None:
+        """Initializes empty index."""
+
+        self._postings: dict[str, set] = dict()
+        self._vocabulary: list[str] = list()
+        self._unsorted: bool = False
+        self._entries: dict[tuple, tuple] = dict()
+        self._users: dict[str, set] = dict()
+        self._lock: threading.RLock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    @property
+    def users(self) -> list[str]:
+        """Users whose networks have been indexed."""
+
+        return list(self._users)
+
+    def add(self, user: str, network_name: str, network_data: dict) -> None:
+        """Index given network, replacing any previous entry for it.
+
+        Args:
+            user string: User owning network.
+            network_name string: Name of network.
+            network_data dict: Map of relevant network data.
+        """
+
+        key: tuple = (user, network_name)
+        tokens: frozenset = _tokenize_network(network_name, network_data)
+        with self._lock:
+            entry: tuple = self._entries.get(key)
+            old_tokens: frozenset = entry[1] if entry else frozenset()
+            for token in old_tokens - tokens:
+                self._discard_posting(token, key)
+            for token in tokens - old_tokens:
+                postings: set = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    self._vocabulary.append(token)
+                    self._unsorted = True
+                postings.add(key)
+            self._entries[key] = (dict(network_data), tokens)
+            self._users.setdefault(user, set()).add(key)
+
+    def remove(self, user: str, network_name: str) -> None:
+        """Drop given network from index.
+
+        Args:
+            user string: User owning network.
+            network_name string: Name of network.
+        """
+
+        key: tuple = (user, network_name)
+        with self._lock:
+            entry: tuple = self._entries.pop(key, None)
+            if entry is None:
+                return
+            for token in entry[1]:
+                self._discard_posting(token, key)
+            self._users[user].discard(key)
+
+    def _discard_posting(self, token: str, key: tuple) -> None:
+        """Drop given network from postings of given token.
+
+        Args:
+            token string: Token network no longer contains.
+            key tuple: (user, network name) of network.
+        """
+
+        postings: set = self._postings[token]
+        postings.discard(key)
+        if not postings:
+            del self._postings[token]
+            self._sort_vocabulary()
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def sync_user(self, user: str, data: dict) -> None:
+        """Bring indexed networks of given user in line with given data.
+
+        Only networks that were added, changed or removed are re-indexed.
+
+        Args:
+            user string: User whose networks are given.
+            data dict: Map of every network of given user to its data.
+        """
+
+        with self._lock:
+            indexed: set[tuple] = self._users.setdefault(user, set())
+            for key in list(indexed):
+                if key[1] not in data:
+                    self.remove(*key)
+            for network_name, network_data in data.items():
+                entry: tuple = self._entries.get((user, network_name))
+                if entry is None or entry[0] != network_data:
+                    self.add(user, network_name, network_data)
+
+    def _sort_vocabulary(self) -> None:
+        """Re-sort vocabulary after tokens were added to it."""
+
+        if self._unsorted:
+            self._vocabulary.sort()
+            self._unsorted = False
+
+    def _token_range(self, term: str) -> tuple[int]:
+        """Find range of vocabulary tokens starting with given term.
+
+        Args:
+            term string: Single query token.
+        Returns:
+            int: Index of first matching token.
+            int: Index past last matching token.
+        """
+
+        start: int = bisect.bisect_left(self._vocabulary, term)
+        # tokens are alphanumeric, so anything starting with the term sorts
+        # before the term followed by a character past 'z'
+        end: int = bisect.bisect_left(self._vocabulary, term + '\x7f', start)
+        return start, end
+
+    def _match(self, term: str, candidates: set[tuple]=None) -> set[tuple]:
+        """Fetch networks containing a token starting with given term.
+
+        Args:
+            term string: Single query token.
+            candidates set: Networks to restrict matches to, if any.
+        Returns:
+            set: Keys of matching networks.
+        """
+
+        start, end = self._token_range(term)
+        if candidates is not None:
+            # checking a handful of candidates beats merging the postings
+            # of a short, common prefix
+            budget: int = len(candidates) * 16
+            cost: int = 0
+            for index in range(start, end):
+                cost += len(self._postings[self._vocabulary[index]])
+                if cost > budget:
+                    return {
+                        key for key in candidates if any(
+                            token.startswith(term)
+                            for token in self._entries[key][1]
+                        )
+                    }
+        if end - start == 1:
+            postings: set = self._postings[self._vocabulary[start]]
+            return postings & candidates if candidates is not None else set(postings)
+        matches: set[tuple] = set().union(
+            *(self._postings[token] for token in self._vocabulary[start:end])
+        )
+        return matches & candidates if candidates is not None else matches
+
+    def _estimate(self, term: str) -> int:
+        """Estimate how many networks given term matches.
+
+        Args:
+            term string: Single query token.
+        Returns:
+            int: Number of vocabulary tokens starting with given term,
+                 weighted by the postings of the first of them.
+        """
+
+        start, end = self._token_range(term)
+        if start == end:
+            return 0
+        return (end - start) * len(self._postings[self._vocabulary[start]])
+
+    def search(self, query: str, user: str=None) -> set[tuple]:
+        """Find networks matching every term of given query.
+
+        Args:
+            query string: Free text query.
+            user string: User to restrict results to, searching the whole
+                         index if not given.
+        Returns:
+            set: (user, network name) keys of matching networks.
+        """
+
+        with self._lock:
+            self._sort_vocabulary()
+            if user is None:
+                result: set[tuple] = None
+            else:
+                result: set[tuple] = self._users.get(user, set())
+            # narrow down with the most selective terms first
+            for term in sorted(set(tokenize(query)), key=self._estimate):
+                result = self._match(term, result)
+                if not result:
+                    return set()
+            if result is None:
+                return set(self._entries)
+            return set(result)
+
+
+_indexes: dict[str, SearchIndex] = dict()
+_indexes_lock: threading.Lock = threading.Lock()
+
+
+def get_index(vault_dir: str, create: bool=True) -> SearchIndex:
+    """Fetch session-wide search index of given vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+        create bool: Whether to create the index if there isn't one yet.
+    Returns:
+        SearchIndex: Index of given vault, or None if there is none and
+                     create is False.
+    """
+
+    with _indexes_lock:
+        index: SearchIndex = _indexes.get(vault_dir)
+        if index is None and create:
+            index = _indexes[vault_dir] = SearchIndex()
+        return index
+
+
+def drop_index(vault_dir: str) -> None:
+    """Forget search index of given vault, to be rebuilt from scratch.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    with _indexes_lock:
+        _indexes.pop(vault_dir, None)
+
+
+def index_vault(vault_dir: str) -> SearchIndex:
+    """Index every user of given vault, for searches across the whole vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        SearchIndex: Index of given vault.
+    """
+
+    for user in network_saver.catalog.list_users(vault_dir):
+        # listing a user's networks brings them up to date in the index
+        network_saver.catalog.list_networks(user=user, vault_dir=vault_dir)
+    return get_index(vault_dir)
+
+
+def sync_user(user: str, data: dict, vault_dir: str) -> None:
+    """Bring indexed networks of given user in line with given data.
+
+    Args:
+        user string: User whose networks are given.
+        data dict: Map of every network of given user to its data.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    get_index(vault_dir).sync_user(user, data)
+
+
+def put_network(
+        network_name: str, network_data: dict, user: str, vault_dir: str
+    ) -> None:
+    """Index given network if its vault is being searched this session.
+
+    Args:
+        network_name string: Name of network saved.
+        network_data dict: Map of relevant network data.
+        user string: User whose vault the network was saved to.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    index: SearchIndex = get_index(vault_dir, create=False)
+    if index is not None:
+        index.add(user, network_name, network_data)
+
+
+def delete_network(network_name: str, user: str, vault_dir: str) -> None:
+    """Drop given network if its vault is being searched this session.
+
+    Args:
+        network_name string: Name of network removed.
+        user string: User whose vault the network was removed from.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    index: SearchIndex = get_index(vault_dir, create=False)
+    if index is not None:
+        index.remove(user, network_name)
@@ -0,0 +1,204 @@
+"""Reading and writing of network files stored in the vault.
+
+CPIO files are plain-text clipboard dumps and compress very well, so each
+vault can opt into storing them gzip or zstd compressed through the
+'compression' key of its settings, and into deduplicating them through the
+object store with its 'deduplicate' key. Files are always named
+<network>.cpio, their format is sniffed from their first few bytes when
+read back, so vaults holding a mix of formats keep loading.
+"""
+
+import gzip
+import os
+import shutil
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+import network_saver.files
+import network_saver.objects
+import network_saver.utility
+
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def get_compression(vault_dir: str=None) -> str:
+    """Fetch compression new network files are stored with in given vault.
+
+    Falls back to gzip if the vault asks for zstd but the zstandard module
+    isn't available in this session.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: One of COMPRESSIONS.
+    """
+
+    settings: dict = network_saver.utility.get_vault_settings(vault_dir)
+    compression: str = settings.get('compression', 'none')
+    if compression not in COMPRESSIONS:
+        raise ValueError("Unsupported compression {}".format(compression))
+    if compression == 'zstd' and zstandard is None:
+        print('Warning: zstandard is not installed, storing with gzip instead')
+        return 'gzip'
+    return compression
+
+
+def is_deduplicated(vault_dir: str=None) -> bool:
+    """Check whether new network files are stored in given vault's object
+       store.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        bool: Whether network files are deduplicated.
+    """
+
+    settings: dict = network_saver.utility.get_vault_settings(vault_dir)
+    return bool(settings.get('deduplicate', False))
+
+
+def _get_vault_dir(filepath: str) -> str:
+    """Fetch vault a network file at <vault>/<user>/<network>.cpio lives in.
+
+    Args:
+        filepath string: Path-like object representing network file.
+    Returns:
+        str: Path-like object representing vault location.
+    """
+
+    return os.path.dirname(os.path.dirname(os.path.abspath(filepath)))
+
+
+def sniff_compression(header: bytes) -> str:
+    """Identify compression of a network file from its first bytes.
+
+    Args:
+        header bytes: At least the first four bytes of the file.
+    Returns:
+        str: One of COMPRESSIONS.
+    """
+
+    if header.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if header.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return 'none'
+
+
+def _compressor(compression: str, dst_f) -> object:
+    """Wrap given binary file object in a compressing writer.
+
+    Args:
+        compression string: One of COMPRESSIONS.
+        dst_f file: Binary file object to write compressed data to.
+    Returns:
+        file: Writable file object, closing it does not close dst_f.
+    """
+
+    if compression == 'gzip':
+        # fixed mtime so identical networks compress to identical files
+        return gzip.GzipFile(
+            fileobj=dst_f, mode='wb', compresslevel=GZIP_LEVEL, mtime=0
+        )
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(
+            dst_f, closefd=False
+        )
+    raise ValueError("Unsupported compression {}".format(compression))
+
+
+def open_network_file(filepath: str, vault_dir: str=None) -> object:
+    """Open network file for reading its raw CPIO contents.
+
+    Compressed files are decompressed, and manifests reassembled, on the
+    fly as they are read.
+
+    Args:
+        filepath string: Path-like object representing network file.
+        vault_dir string: Path-like object representing vault location the
+                          network file belongs to, needed for manifests.
+                          Defaults to two levels above the network file.
+    Returns:
+        file: Readable binary file object.
+    """
+
+    with open(filepath, 'rb') as header_f:
+        header: bytes = header_f.read(len(network_saver.objects.MANIFEST_MAGIC))
+    if network_saver.objects.is_manifest(header):
+        return network_saver.objects.open_manifest(
+            filepath, vault_dir or _get_vault_dir(filepath)
+        )
+    compression: str = sniff_compression(header)
+    if compression == 'gzip':
+        return gzip.open(filepath, 'rb')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError(
+                "Network file {} is zstd compressed but zstandard is "
+                "not installed".format(filepath)
+            )
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(filepath, 'rb'), closefd=True
+        )
+    return open(filepath, 'rb')
+
+
+def store_network_file(
+        src: str, dst: str, compression: str='none',
+        deduplicate: bool=False, vault_dir: str=None
+    ) -> None:
+    """Store raw CPIO file in vault, compressing it on the way.
+
+    The file is written next to its destination first and moved into place
+    once complete, so readers never see a partial network file.
+
+    Args:
+        src string: Path-like object representing raw CPIO file.
+        dst string: Path-like object representing network file to write.
+        compression string: One of COMPRESSIONS.
+        deduplicate bool: Whether to store the file as a manifest of chunks
+                          in the vault's object store.
+        vault_dir string: Path-like object representing vault location the
+                          network file belongs to. Defaults to two levels
+                          above the network file.
+    """
+
+    if deduplicate:
+        network_saver.objects.store_manifest(
+            src, dst, vault_dir or _get_vault_dir(dst), compression
+        )
+        return
+
+    with open(src, 'rb') as src_f, \
+            network_saver.files.atomic_open(dst) as tmp_f:
+        if compression == 'none':
+            shutil.copyfileobj(src_f, tmp_f, CHUNK_SIZE)
+        else:
+            with _compressor(compression, tmp_f) as dst_f:
+                shutil.copyfileobj(src_f, dst_f, CHUNK_SIZE)
+
+
+def extract_network_file(src: str, dst: str, vault_dir: str=None) -> None:
+    """Write raw CPIO contents of given network file to given location.
+
+    Args:
+        src string: Path-like object representing network file.
+        dst string: Path-like object representing raw CPIO file to write.
+        vault_dir string: Path-like object representing vault location the
+                          network file belongs to.
+    """
+
+    with open_network_file(src, vault_dir=vault_dir) as src_f, \
+            open(dst, 'wb') as dst_f:
+        shutil.copyfileobj(src_f, dst_f, CHUNK_SIZE)
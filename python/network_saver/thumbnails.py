@@ -0,0 +1,297 @@
+"""Preview images of the node graph of saved networks.
+
+Thumbnails are drawn from the node positions and wiring recorded in a
+network file, without Houdini or any imaging library, and written as small
+PNGs to .netvault/thumbnails/<user>/<network>.png. They are made when a
+network is saved, and otherwise on first request, which is how networks
+saved before thumbnails existed get theirs. A thumbnail older than its
+network file is drawn again.
+"""
+
+from getpass import getuser
+import os
+import struct
+import zlib
+
+import network_saver.cpio
+import network_saver.files
+import network_saver.trace
+import network_saver.utility
+
+WIDTH = 72
+HEIGHT = 48
+MARGIN = 4
+NODE_WIDTH = 9
+NODE_HEIGHT = 4
+
+BACKGROUND = (43, 43, 43)
+WIRE = (130, 130, 130)
+NODE = (185, 185, 185)
+DISPLAY_NODE = (80, 150, 230)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def get_thumbnail_file(
+        network_name: str, user: str=None, vault_dir: str=None
+    ) -> str:
+    """Fetch thumbnail of given network.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing thumbnail PNG.
+    """
+
+    return os.path.join(
+        network_saver.utility.get_internal_dir(vault_dir), 'thumbnails',
+        user or getuser(), network_name + '.png'
+    )
+
+
+def encode_png(width: int, height: int, pixels: bytearray) -> bytes:
+    """Encode RGB pixels as a PNG.
+
+    Args:
+        width int: Image width.
+        height int: Image height.
+        pixels bytearray: Rows of RGB triplets, top to bottom.
+    Returns:
+        bytes: PNG file contents.
+    """
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack(
+            '>I', zlib.crc32(tag + data) & 0xffffffff
+        )
+
+    stride: int = width * 3
+    # every row is prefixed with filter type 0
+    raw: bytes = b''.join(
+        b'\0' + bytes(pixels[row * stride:(row + 1) * stride])
+        for row in range(height)
+    )
+    return b''.join((
+        PNG_SIGNATURE,
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)),
+        chunk(b'IDAT', zlib.compress(raw, 9)),
+        chunk(b'IEND', b'')
+    ))
+
+
+class _Canvas(object):
+    """RGB pixel buffer with the few drawing operations thumbnails need."""
+    def __init__(self, width: int, height: int, color: tuple) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.pixels: bytearray = bytearray(bytes(color) * (width * height))
+
+    def point(self, x: int, y: int, color: tuple) -> None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            offset: int = (y * self.width + x) * 3
+            self.pixels[offset:offset + 3] = bytes(color)
+
+    def rect(self, x: int, y: int, width: int, height: int, color: tuple) -> None:
+        for row in range(max(0, y), min(self.height, y + height)):
+            left: int = max(0, x)
+            right: int = min(self.width, x + width)
+            if right > left:
+                offset: int = (row * self.width + left) * 3
+                self.pixels[offset:offset + (right - left) * 3] = \
+                    bytes(color) * (right - left)
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, color: tuple) -> None:
+        dx: int = abs(x1 - x0)
+        dy: int = -abs(y1 - y0)
+        step_x: int = 1 if x0 < x1 else -1
+        step_y: int = 1 if y0 < y1 else -1
+        error: int = dx + dy
+        while True:
+            self.point(x0, y0, color)
+            if x0 == x1 and y0 == y1:
+                return
+            double: int = 2 * error
+            if double >= dy:
+                error += dy
+                x0 += step_x
+            if double <= dx:
+                error += dx
+                y0 += step_y
+
+
+def render(
+        layout: list['network_saver.cpio.NodeLayout'], width: int=WIDTH,
+        height: int=HEIGHT
+    ) -> bytes:
+    """Draw given node layout as a PNG, fitted to given size.
+
+    Args:
+        layout list: Node layouts, as read by cpio.read_layout.
+        width int: Image width.
+        height int: Image height.
+    Returns:
+        bytes: PNG file contents.
+    """
+
+    canvas: _Canvas = _Canvas(width, height, BACKGROUND)
+    if layout:
+        xs: list[float] = [node.position[0] for node in layout]
+        ys: list[float] = [node.position[1] for node in layout]
+        span_x: float = max(xs) - min(xs)
+        span_y: float = max(ys) - min(ys)
+        inner_width: int = width - 2 * MARGIN - NODE_WIDTH
+        inner_height: int = height - 2 * MARGIN - NODE_HEIGHT
+        # keep the network's proportions, centered
+        scale: float = min(
+            inner_width / span_x if span_x else float('inf'),
+            inner_height / span_y if span_y else float('inf')
+        )
+        if scale == float('inf'):
+            scale = 0.0
+        offset_x: float = MARGIN + (inner_width - span_x * scale) / 2
+        offset_y: float = MARGIN + (inner_height - span_y * scale) / 2
+
+        # network y points up, image y down
+        corners: dict[str, tuple] = {
+            node.name: (
+                int(offset_x + (node.position[0] - min(xs)) * scale),
+                int(offset_y + (max(ys) - node.position[1]) * scale)
+            ) for node in layout
+        }
+        for node in layout:
+            x, y = corners[node.name]
+            for source in node.inputs:
+                if source in corners:
+                    source_x, source_y = corners[source]
+                    canvas.line(
+                        source_x + NODE_WIDTH // 2, source_y + NODE_HEIGHT,
+                        x + NODE_WIDTH // 2, y - 1, WIRE
+                    )
+        for node in layout:
+            x, y = corners[node.name]
+            canvas.rect(
+                x, y, NODE_WIDTH, NODE_HEIGHT,
+                DISPLAY_NODE if node.display else NODE
+            )
+    return encode_png(width, height, canvas.pixels)
+
+
+def _write_file(filepath: str, data: bytes) -> None:
+    """Write file next to its destination and move it into place.
+
+    Args:
+        filepath string: Path-like object representing file to write.
+        data bytes: Contents of file.
+    """
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    network_saver.files.write_file(filepath, data)
+
+
+def _draw(network_file: str, vault_dir: str) -> bytes:
+    """Draw thumbnail of given network file.
+
+    Args:
+        network_file string: Path-like object representing network file.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        bytes: PNG file contents.
+    """
+
+    with network_saver.trace.span(
+        'thumbnails.draw', path=network_file
+    ) as span:
+        layout: list = network_saver.cpio.read_layout(
+            network_file, vault_dir=vault_dir
+        )
+        if span:
+            span.add(nodes=len(layout))
+        return render(layout)
+
+
+def update_thumbnail(
+        network_name: str, user: str=None, vault_dir: str=None
+    ) -> bytes:
+    """Draw thumbnail of given network afresh and store it.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        bytes: PNG file contents.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    data: bytes = _draw(
+        os.path.join(vault_dir, user, network_name + '.cpio'), vault_dir
+    )
+    _write_file(get_thumbnail_file(network_name, user, vault_dir), data)
+    return data
+
+
+def read_thumbnail(
+        network_name: str, user: str=None, vault_dir: str=None
+    ) -> bytes:
+    """Fetch thumbnail of given network, drawing it if it is missing or
+       older than the network file.
+
+    A thumbnail that can't be stored, such as in a read-only vault, is still
+    drawn and handed back.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        bytes: PNG file contents, or None if the network file is missing or
+               can't be read.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    network_file: str = os.path.join(vault_dir, user, network_name + '.cpio')
+    thumbnail_file: str = get_thumbnail_file(network_name, user, vault_dir)
+    try:
+        network_time: int = os.stat(network_file).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    try:
+        if os.stat(thumbnail_file).st_mtime_ns >= network_time:
+            with open(thumbnail_file, 'rb') as thumbnail_f:
+                return thumbnail_f.read()
+    except FileNotFoundError:
+        pass
+
+    try:
+        data: bytes = _draw(network_file, vault_dir)
+    except (OSError, network_saver.cpio.CpioError) as err:
+        print('Warning: Could not draw thumbnail of ', network_file)
+        print(err)
+        return None
+    try:
+        _write_file(thumbnail_file, data)
+    except OSError as err:
+        print('Warning: Could not store thumbnail of ', network_file)
+        print(err)
+    return data
+
+
+def remove_thumbnail(
+        network_name: str, user: str=None, vault_dir: str=None
+    ) -> None:
+    """Remove thumbnail of given network, if it has one.
+
+    Args:
+        network_name string: Name of network.
+        user string: User owning network.
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    try:
+        os.remove(get_thumbnail_file(network_name, user, vault_dir))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,318 @@
+"""Lightweight tracing of vault I/O and hou calls.
+
+Set NETWORK_VAULT_TRACE to trace a session: 1 logs to
+network_vault_trace.jsonl in the temp directory, anything else is taken as
+the log file to write. Every span is appended to the log as one json line
+with its name, duration and any fields it was given, such as byte counts,
+and tallied for summary().
+
+When tracing is off span() hands back a shared no-op span, so instrumented
+code costs a function call and nothing more. Spans are falsy when off, which
+lets callers skip work only needed for tracing:
+
+    with network_saver.trace.span('storage.copy', path=src) as span:
+        shutil.copy(src, dst)
+        if span:
+            span.add(bytes=os.path.getsize(dst))
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+ENV_VAR = 'NETWORK_VAULT_TRACE'
+DEFAULT_LOG_NAME = 'network_vault_trace.jsonl'
+
+
+class _NullSpan(object):
+    """Span handed out while tracing is off, doing nothing."""
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *args) -> bool:
+        return False
+
+    def __bool__(self) -> bool:
+        return False
+
+    def add(self, **fields) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span(object):
+    """Single timed operation."""
+    def __init__(self, name: str, fields: dict) -> None:
+        self.name: str = name
+        self.fields: dict = fields
+        self.timestamp: float = None
+        self._start: float = None
+
+    def __enter__(self) -> 'Span':
+        self.timestamp = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration: float = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.fields['error'] = exc_type.__name__
+        _record(self, duration)
+        return False
+
+    def add(self, **fields) -> None:
+        """Attach given fields to span, such as a byte count.
+
+        Args:
+            fields dict: Json serializable values to log with span.
+        """
+
+        self.fields.update(fields)
+
+
+_lock: threading.Lock = threading.Lock()
+_log_file: str = None
+_log_f = None
+_stats: dict[str, list] = dict()
+
+
+def get_default_log_file() -> str:
+    """Fetch log file traced to when no other is given.
+
+    Returns:
+        str: Path-like object representing log file in the temp directory.
+    """
+
+    return os.path.join(tempfile.gettempdir(), DEFAULT_LOG_NAME)
+
+
+def get_log_file() -> str:
+    """Fetch log file set by NETWORK_VAULT_TRACE.
+
+    Returns:
+        str: Path-like object representing log file, or None if tracing is
+             turned off.
+    """
+
+    value: str = os.getenv(ENV_VAR, '').strip()
+    if value in ('', '0'):
+        return None
+    if value == '1':
+        return get_default_log_file()
+    return value
+
+
+def get_active_log_file() -> str:
+    """Fetch log file spans are currently traced to.
+
+    Returns:
+        str: Path-like object representing log file, or None if tracing is
+             turned off.
+    """
+
+    return _log_file
+
+
+def is_enabled() -> bool:
+    """Check whether spans are being traced.
+
+    Returns:
+        bool: Whether tracing is on.
+    """
+
+    return _log_file is not None
+
+
+def enable(log_file: str=None) -> None:
+    """Start tracing spans to given log file.
+
+    Args:
+        log_file string: Path-like object representing json lines log to
+                         append to. Defaults to the one set by
+                         NETWORK_VAULT_TRACE, or the default log.
+    """
+
+    global _log_file
+
+    disable()
+    with _lock:
+        _log_file = log_file or get_log_file() or get_default_log_file()
+
+
+def disable() -> None:
+    """Stop tracing spans, closing the log."""
+
+    global _log_file, _log_f
+
+    with _lock:
+        _log_file = None
+        if _log_f is not None:
+            _log_f.close()
+            _log_f = None
+
+
+def span(name: str, **fields) -> Span:
+    """Time block of code under given name.
+
+    Args:
+        name string: Name of operation, e.g. 'utility.read_network_vault'.
+        fields dict: Json serializable values to log with span.
+    Returns:
+        Span: Context manager timing the block, a falsy no-op if tracing is
+              turned off.
+    """
+
+    if _log_file is None:
+        return _NULL_SPAN
+    return Span(name, fields)
+
+
+def _tally(stats: dict, record: dict) -> None:
+    """Add given span record to given summary stats.
+
+    Args:
+        stats dict: Map of span names to their count, total and max
+                    duration, bytes and errors.
+        record dict: Logged span.
+    """
+
+    entry: list = stats.setdefault(record['name'], [0, 0.0, 0.0, 0, 0])
+    entry[0] += 1
+    entry[1] += record['ms']
+    entry[2] = max(entry[2], record['ms'])
+    entry[3] += record.get('bytes', 0)
+    entry[4] += 'error' in record
+
+
+def _record(span: Span, duration: float) -> None:
+    """Log and tally finished span.
+
+    Args:
+        span Span: Finished span.
+        duration float: Seconds span took.
+    """
+
+    global _log_f
+
+    record: dict = {
+        'name': span.name,
+        'time': span.timestamp,
+        'ms': duration * 1000,
+        'pid': os.getpid(),
+        'thread': threading.current_thread().name
+    }
+    record.update(span.fields)
+    line: str = json.dumps(record, default=str) + '\n'
+    with _lock:
+        _tally(_stats, record)
+        if _log_file is None:
+            return
+        try:
+            if _log_f is None:
+                _log_f = open(_log_file, 'a')
+            _log_f.write(line)
+            _log_f.flush()
+        except OSError as err:
+            print('Warning: Could not write trace log at ', _log_file)
+            print(err)
+
+
+def _rows(stats: dict) -> list[dict]:
+    """Turn summary stats into rows, slowest in total first.
+
+    Args:
+        stats dict: Map of span names to their tallies.
+    Returns:
+        list: Summary of each span name.
+    """
+
+    rows: list[dict] = [
+        {
+            'name': name, 'count': count, 'total_ms': total,
+            'mean_ms': total / count, 'max_ms': longest, 'bytes': size,
+            'errors': errors
+        } for name, (count, total, longest, size, errors) in stats.items()
+    ]
+    rows.sort(key=lambda row: row['total_ms'], reverse=True)
+    return rows
+
+
+def summary() -> list[dict]:
+    """Summarize spans traced this session.
+
+    Returns:
+        list: Count, total, mean and max duration in ms, bytes and errors of
+              each span name, slowest in total first.
+    """
+
+    with _lock:
+        return _rows(_stats)
+
+
+def reset() -> None:
+    """Forget spans traced this session."""
+
+    with _lock:
+        _stats.clear()
+
+
+def read_log(log_file: str) -> list[dict]:
+    """Read spans from given log.
+
+    Args:
+        log_file string: Path-like object representing json lines log.
+    Returns:
+        list: Logged spans, skipping any line that can't be parsed.
+    """
+
+    records: list[dict] = list()
+    with open(log_file, 'r') as log_f:
+        for line in log_f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # likely a line cut short by a crash
+                continue
+    return records
+
+
+def summarize(records: list[dict]) -> list[dict]:
+    """Summarize given spans, such as ones read from a log.
+
+    Args:
+        records list: Logged spans.
+    Returns:
+        list: Same as summary().
+    """
+
+    stats: dict = dict()
+    for record in records:
+        _tally(stats, record)
+    return _rows(stats)
+
+
+def format_summary(rows: list[dict]) -> str:
+    """Lay out given summary as a plain text table.
+
+    Args:
+        rows list: Summary as given by summary() or summarize().
+    Returns:
+        str: Table with one line per span name.
+    """
+
+    lines: list[str] = ['{:<40} {:>7} {:>11} {:>9} {:>9} {:>12} {:>6}'.format(
+        'span', 'count', 'total ms', 'mean ms', 'max ms', 'bytes', 'errors'
+    )]
+    for row in rows:
+        lines.append(
+            '{name:<40} {count:>7} {total_ms:>11.2f} {mean_ms:>9.2f} '
+            '{max_ms:>9.2f} {bytes:>12} {errors:>6}'.format(**row)
+        )
+    return '\n'.join(lines)
+
+
+_log_file = get_log_file()
@@ -0,0 +1,447 @@
+"""Trash holding removed networks until they expire.
+
+Removing networks moves them to .netvault/trash/<user>/<entry>, one entry
+per network holding its network file, revision history, thumbnail and an
+entry.json with its data and when it was trashed. Every file is moved
+rather than copied, and all networks removed together leave the vault json
+in a single journal record, so trashing hundreds of networks is about as
+quick as trashing one, and restoring one is a handful of renames.
+
+Entries older than the vault's 'trash_days' setting, TRASH_DAYS by default,
+are purged by collect, run from the command line or on a background thread
+after networks are trashed. It works through expired entries in batches of
+BATCH_SIZE, skipping any that are being restored.
+"""
+
+import contextlib
+from getpass import getuser
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import network_saver.files
+import network_saver.locks
+import network_saver.revisions
+import network_saver.thumbnails
+import network_saver.trace
+import network_saver.utility
+
+TRASH_DAYS = 30
+BATCH_SIZE = 100
+BATCH_PAUSE = 0.1
+
+ENTRY_NAME = 'entry.json'
+NETWORK_NAME = 'network.cpio'
+THUMBNAIL_NAME = 'thumbnail.png'
+HISTORY_NAME = 'revisions'
+
+_collecting: set = set()
+_collecting_lock: threading.Lock = threading.Lock()
+
+
+def _get_trash_root(vault_dir: str=None) -> str:
+    """Fetch folder holding every user's trashed networks.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing trash folder of vault.
+    """
+
+    return os.path.join(
+        network_saver.utility.get_internal_dir(vault_dir), 'trash'
+    )
+
+
+def get_trash_dir(user: str=None, vault_dir: str=None) -> str:
+    """Fetch folder holding trashed networks of given user.
+
+    Args:
+        user string: User owning trashed networks.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing trash folder.
+    """
+
+    return os.path.join(_get_trash_root(vault_dir), user or getuser())
+
+
+def get_retention(vault_dir: str=None) -> float:
+    """Fetch how long trashed networks are kept in given vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        float: Seconds networks are kept in the trash.
+    """
+
+    settings: dict = network_saver.utility.get_vault_settings(vault_dir)
+    return max(0.0, float(settings.get('trash_days', TRASH_DAYS))) * 86400
+
+
+def _move(src: str, dst: str) -> None:
+    """Move file or folder, if it exists.
+
+    Args:
+        src string: Path-like object representing file or folder to move.
+        dst string: Path-like object representing where to move it.
+    """
+
+    if os.path.lexists(src):
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        # a rename, unless the vault spans several drives
+        shutil.move(src, dst)
+
+
+def _write_entry(entry_dir: str, entry: dict) -> None:
+    """Write entry.json of a trashed network next to its destination and
+       move it into place.
+
+    Args:
+        entry_dir string: Path-like object representing trash entry.
+        entry dict: Name, user, data and trash time of network.
+    """
+
+    os.makedirs(entry_dir, exist_ok=True)
+    with network_saver.files.atomic_open(
+        os.path.join(entry_dir, ENTRY_NAME), 'w'
+    ) as tmp_f:
+        json.dump(entry, tmp_f, indent=4)
+
+
+def _read_entry(entry_dir: str) -> dict:
+    """Read entry.json of a trashed network.
+
+    Args:
+        entry_dir string: Path-like object representing trash entry.
+    Returns:
+        dict: Name, user, data and trash time of network, or None if there
+              is no such entry.
+    """
+
+    try:
+        with open(os.path.join(entry_dir, ENTRY_NAME), 'r') as entry_f:
+            entry: dict = json.load(entry_f)
+    except FileNotFoundError:
+        return None
+    entry['id'] = os.path.basename(entry_dir)
+    return entry
+
+
+def trash_networks(
+        network_names: list[str], user: str=None, vault_dir: str=None,
+        generations: dict=None
+    ) -> tuple[list]:
+    """Move given networks to the trash, removing them from the vault json
+       as a single change.
+
+    Networks that were saved over since the caller listed them, or that
+    another session holds locked, are kept and reported back rather than
+    failing the rest.
+
+    Args:
+        network_names list: Networks to remove.
+        user string: User owning networks.
+        vault_dir string: Path-like object representing vault location.
+        generations dict: Map of networks to the generation the caller read
+                          before deciding to remove them. Networks not in
+                          it aren't checked.
+    Returns:
+        list: Trash entries of networks removed.
+        list: Names of networks kept.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    generations: dict = generations or dict()
+    user_dir: str = network_saver.utility.get_user_dir(user, vault_dir)
+    trash_dir: str = get_trash_dir(user, vault_dir)
+
+    entries: list[dict] = list()
+    skipped: list[str] = list()
+    with contextlib.ExitStack() as locks, network_saver.trace.span(
+        'trash.trash_networks', networks=len(network_names)
+    ):
+        # locked in the same order as delete_networks_data
+        for network_name in sorted(set(network_names)):
+            try:
+                locks.enter_context(network_saver.utility.lock_network(
+                    network_name, user=user, vault_dir=vault_dir
+                ))
+                current: dict = network_saver.utility.get_network_data(
+                    network_name, user=user, vault_dir=vault_dir
+                )
+                if current is None:
+                    # already gone
+                    continue
+                if generations.get(network_name) is not None:
+                    network_saver.locks.check_generation(
+                        current, generations[network_name]
+                    )
+            except (
+                network_saver.locks.ConflictError,
+                network_saver.locks.LockTimeout
+            ) as err:
+                print('Warning: Not removing network ', network_name)
+                print(err)
+                skipped.append(network_name)
+                continue
+            entries.append({
+                'id': '{}.{}'.format(network_name, uuid.uuid4().hex[:8]),
+                'name': network_name,
+                'user': user,
+                'trashed': time.time(),
+                'data': current
+            })
+
+        # entries first, so networks leaving the vault json are never lost
+        for entry in entries:
+            _write_entry(os.path.join(trash_dir, entry['id']), entry)
+        network_saver.utility.delete_networks_data(
+            [entry['name'] for entry in entries], user=user,
+            vault_dir=vault_dir
+        )
+        for entry in entries:
+            entry_dir: str = os.path.join(trash_dir, entry['id'])
+            _move(
+                os.path.join(user_dir, entry['name'] + '.cpio'),
+                os.path.join(entry_dir, NETWORK_NAME)
+            )
+            with network_saver.revisions.lock_history(
+                entry['name'], user=user, vault_dir=vault_dir
+            ):
+                _move(
+                    network_saver.revisions.get_history_dir(
+                        entry['name'], user, vault_dir
+                    ),
+                    os.path.join(entry_dir, HISTORY_NAME)
+                )
+            _move(
+                network_saver.thumbnails.get_thumbnail_file(
+                    entry['name'], user, vault_dir
+                ),
+                os.path.join(entry_dir, THUMBNAIL_NAME)
+            )
+    return entries, skipped
+
+
+def list_trash(user: str=None, vault_dir: str=None) -> list[dict]:
+    """List networks in the trash.
+
+    Args:
+        user string: User whose trashed networks to list, every user's if
+                     not given.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        list: Id, name, user, data and trash time of each trashed network,
+              oldest first.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    if user:
+        users: list[str] = [user]
+    else:
+        trash_root: str = _get_trash_root(vault_dir)
+        users: list[str] = sorted(os.listdir(trash_root)) \
+            if os.path.isdir(trash_root) else list()
+
+    entries: list[dict] = list()
+    for trash_user in users:
+        trash_dir: str = get_trash_dir(trash_user, vault_dir)
+        if not os.path.isdir(trash_dir):
+            continue
+        for entry_id in os.listdir(trash_dir):
+            entry_dir: str = os.path.join(trash_dir, entry_id)
+            if not os.path.isdir(entry_dir):
+                continue
+            try:
+                entry: dict = _read_entry(entry_dir)
+            except ValueError as err:
+                print('Warning: Could not read trash entry ', entry_dir)
+                print(err)
+                continue
+            if entry is not None:
+                entries.append(entry)
+    return sorted(entries, key=lambda entry: entry['trashed'])
+
+
+def _lock_entry(entry_dir: str, timeout: float) -> network_saver.locks.FileLock:
+    """Fetch lock guarding given trash entry against being restored and
+       purged at once.
+
+    Args:
+        entry_dir string: Path-like object representing trash entry.
+        timeout float: Seconds to wait for the lock.
+    Returns:
+        FileLock: Lock, acquired by using it as a context manager.
+    """
+
+    return network_saver.locks.FileLock(entry_dir, timeout=timeout)
+
+
+def restore_network(
+        entry_id: str, user: str=None, vault_dir: str=None,
+        network_name: str=None
+    ) -> str:
+    """Move given trashed network back into the vault.
+
+    Args:
+        entry_id string: Id of trash entry.
+        user string: User owning trashed network.
+        vault_dir string: Path-like object representing vault location.
+        network_name string: Name to restore network under, defaults to the
+                             one it was trashed with. Raises ConflictError if
+                             a network of that name was saved since.
+    Returns:
+        str: Name network was restored under.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    entry_dir: str = os.path.join(get_trash_dir(user, vault_dir), entry_id)
+
+    with _lock_entry(entry_dir, network_saver.locks.LOCK_TIMEOUT):
+        entry: dict = _read_entry(entry_dir)
+        if entry is None:
+            raise ValueError('No trashed network {}'.format(entry_id))
+        network_name: str = network_name or entry['name']
+
+        with network_saver.utility.lock_network(
+            network_name, user=user, vault_dir=vault_dir
+        ), network_saver.trace.span(
+            'trash.restore_network', path=entry_dir
+        ):
+            network_saver.locks.check_generation(
+                network_saver.utility.get_network_data(
+                    network_name, user=user, vault_dir=vault_dir
+                ), 0
+            )
+            _move(
+                os.path.join(entry_dir, NETWORK_NAME),
+                os.path.join(
+                    network_saver.utility.get_user_dir(user, vault_dir),
+                    network_name + '.cpio'
+                )
+            )
+            history_dir: str = network_saver.revisions.get_history_dir(
+                network_name, user, vault_dir
+            )
+            with network_saver.revisions.lock_history(
+                network_name, user=user, vault_dir=vault_dir
+            ):
+                if not os.path.isdir(history_dir):
+                    _move(os.path.join(entry_dir, HISTORY_NAME), history_dir)
+            _move(
+                os.path.join(entry_dir, THUMBNAIL_NAME),
+                network_saver.thumbnails.get_thumbnail_file(
+                    network_name, user, vault_dir
+                )
+            )
+            network_saver.utility.put_network_data(
+                network_name, entry['data'], user=user, vault_dir=vault_dir,
+                generation=0
+            )
+            shutil.rmtree(entry_dir)
+    return network_name
+
+
+def _purge(entry_dir: str) -> bool:
+    """Remove given trash entry, unless it is being restored.
+
+    Args:
+        entry_dir string: Path-like object representing trash entry.
+    Returns:
+        bool: Whether the entry was removed.
+    """
+
+    try:
+        with _lock_entry(entry_dir, 0):
+            if not os.path.isdir(entry_dir):
+                return False
+            shutil.rmtree(entry_dir)
+    except network_saver.locks.LockTimeout:
+        return False
+    return True
+
+
+def collect(
+        vault_dir: str=None, max_age: float=None, batch_size: int=BATCH_SIZE,
+        pause: float=0.0
+    ) -> int:
+    """Purge trashed networks older than given age, every user's.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+        max_age float: Seconds trashed networks are kept, defaults to the
+                       vault's retention. 0 empties the trash.
+        batch_size int: Entries purged before pausing.
+        pause float: Seconds to pause between batches, sparing the share
+                     when run in the background.
+    Returns:
+        int: Number of trashed networks purged.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    if max_age is None:
+        max_age = get_retention(vault_dir)
+    cutoff: float = time.time() - max_age
+    expired: list[dict] = [
+        entry for entry in list_trash(vault_dir=vault_dir)
+        if entry['trashed'] <= cutoff
+    ]
+
+    purged: int = 0
+    for start in range(0, len(expired), batch_size):
+        if start and pause:
+            time.sleep(pause)
+        with network_saver.trace.span(
+            'trash.collect', path=vault_dir
+        ) as span:
+            batch: list[dict] = expired[start:start + batch_size]
+            count: int = sum(
+                _purge(os.path.join(
+                    get_trash_dir(entry['user'], vault_dir), entry['id']
+                ))
+                for entry in batch
+            )
+            if span:
+                span.add(networks=count)
+        purged += count
+    return purged
+
+
+def _collect_worker(vault_dir: str) -> None:
+    """Purge expired trash of given vault, reporting rather than raising
+       failures."""
+
+    try:
+        collect(vault_dir, pause=BATCH_PAUSE)
+    except Exception as err:
+        print('Warning: Could not empty trash of ', vault_dir)
+        print(err)
+    finally:
+        with _collecting_lock:
+            _collecting.discard(vault_dir)
+
+
+def collect_async(vault_dir: str=None) -> None:
+    """Purge expired trash of given vault on a background thread.
+
+    Does nothing if this session is already purging the same vault.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    """
+
+    vault_dir: str = vault_dir or network_saver.utility.get_vault_dir()
+    with _collecting_lock:
+        if vault_dir in _collecting:
+            return
+        _collecting.add(vault_dir)
+    thread: threading.Thread = threading.Thread(
+        target=_collect_worker, args=(vault_dir,), daemon=True
+    )
+    thread.start()
@@ -0,0 +1,146 @@
+"""Item delegates drawing more than text into the GUIs' tables."""
+
+import collections
+
+from PySide2 import QtCore, QtGui, QtWidgets
+
+import network_saver.thumbnails
+import network_saver.ui.workers
+
+PADDING = 2
+MAX_THUMBNAILS = 512
+THUMBNAIL_THREADS = 2
+
+
+class ThumbnailDelegate(QtWidgets.QStyledItemDelegate):
+    """Draws the node graph thumbnail of each network left of its name.
+
+    Thumbnails are loaded on worker threads the first time their row is
+    painted, and the most recently loaded MAX_THUMBNAILS are kept. They
+    are keyed by the generation their network was listed at, so a network
+    saved over shows its new thumbnail once listed again.
+    """
+    def __init__(self, locate, parent: QtCore.QObject=None) -> None:
+        """Initializes delegate.
+
+        Args:
+            locate callable: Takes the name of a listed network and returns
+                             the user, vault root and generation it was
+                             listed with.
+        """
+
+        super(ThumbnailDelegate, self).__init__(parent)
+
+        self.locate = locate
+        self._pixmaps: collections.OrderedDict = collections.OrderedDict()
+        self._pending: set[tuple] = set()
+        self._signals: network_saver.ui.workers.ThumbnailSignals = \
+            network_saver.ui.workers.ThumbnailSignals(self)
+        self._signals.loaded.connect(self._handle_loaded)
+        self._pool: QtCore.QThreadPool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(THUMBNAIL_THREADS)
+
+    def cancel(self) -> None:
+        """Drop thumbnails queued for loading."""
+
+        self._pool.clear()
+        self._pending.clear()
+
+    def _request(self, key: tuple) -> None:
+        """Queue thumbnail of given key for loading.
+
+        Args:
+            key tuple: Name, user, vault root and generation of network.
+        """
+
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        network_name, user, vault_dir, _generation = key
+        self._pool.start(network_saver.ui.workers.ThumbnailLoader(
+            self._signals, key, network_name, user, vault_dir
+        ))
+
+    def _handle_loaded(self, key: tuple, image: QtGui.QImage) -> None:
+        """Keep loaded thumbnail and repaint the rows showing it.
+
+        Args:
+            key tuple: Name, user, vault root and generation of network.
+            image QtGui.QImage: Thumbnail, null if there is none.
+        """
+
+        if key not in self._pending:
+            # cancelled
+            return
+        self._pending.discard(key)
+        self._pixmaps[key] = None if image.isNull() else \
+            QtGui.QPixmap.fromImage(image)
+        while len(self._pixmaps) > MAX_THUMBNAILS:
+            self._pixmaps.popitem(last=False)
+        view: QtWidgets.QAbstractItemView = self.parent()
+        if isinstance(view, QtWidgets.QAbstractItemView):
+            view.viewport().update()
+
+    def thumbnail(self, network_name: str) -> QtGui.QPixmap:
+        """Fetch thumbnail of given network, queueing it for loading if it
+           isn't loaded yet.
+
+        Args:
+            network_name string: Name of listed network.
+        Returns:
+            QtGui.QPixmap: Thumbnail, or None if it isn't loaded or there
+                           is none.
+        """
+
+        key: tuple = (network_name,) + tuple(self.locate(network_name))
+        if key in self._pixmaps:
+            self._pixmaps.move_to_end(key)
+            return self._pixmaps[key]
+        self._request(key)
+        return None
+
+    def sizeHint(
+            self, option: QtWidgets.QStyleOptionViewItem,
+            index: QtCore.QModelIndex
+        ) -> QtCore.QSize:
+        size: QtCore.QSize = super(ThumbnailDelegate, self).sizeHint(
+            option, index
+        )
+        return QtCore.QSize(
+            size.width() + network_saver.thumbnails.WIDTH + 2 * PADDING,
+            max(size.height(), network_saver.thumbnails.HEIGHT + 2 * PADDING)
+        )
+
+    def paint(
+            self, painter: QtGui.QPainter,
+            option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex
+        ) -> None:
+        # background and selection span the whole cell
+        background: QtWidgets.QStyleOptionViewItem = \
+            QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(background, index)
+        background.text = ''
+        style: QtWidgets.QStyle = option.widget.style() if option.widget \
+            else QtWidgets.QApplication.style()
+        style.drawControl(
+            QtWidgets.QStyle.CE_ItemViewItem, background, painter,
+            option.widget
+        )
+
+        pixmap: QtGui.QPixmap = self.thumbnail(index.data(QtCore.Qt.UserRole))
+        if pixmap is not None:
+            painter.drawPixmap(
+                option.rect.left() + PADDING,
+                option.rect.top() + max(
+                    PADDING,
+                    (option.rect.height() - network_saver.thumbnails.HEIGHT) // 2
+                ),
+                pixmap
+            )
+
+        text: QtWidgets.QStyleOptionViewItem = \
+            QtWidgets.QStyleOptionViewItem(option)
+        text.rect = option.rect.adjusted(
+            network_saver.thumbnails.WIDTH + 2 * PADDING, 0, 0, 0
+        )
+        super(ThumbnailDelegate, self).paint(painter, text, index)
@@ -0,0 +1,384 @@
+"""Qt models presenting saved networks to the GUIs."""
+
+import re
+import sys
+
+from PySide2 import QtCore
+
+HEADERS = ('Name', 'Houdini Version', 'Context', 'Description')
+FIELDS = (None, 'version', 'context', 'notes')
+
+FETCH_SIZE = 256
+
+DIGITS_PATTERN = re.compile(r'(\d+)')
+
+
+def _sort_key(value: str) -> tuple:
+    """Natural sort key, so 'v10' sorts after 'v9' and '20.0' after '9.5'.
+
+    Args:
+        value string: Cell value.
+    Returns:
+        tuple: Sort key of given value.
+    """
+
+    return tuple(
+        (0, int(part), '') if part.isdigit() else (1, 0, part)
+        for part in DIGITS_PATTERN.split(value.lower()) if part
+    )
+
+
+def _row_values(network_name: str, network_data: dict) -> list[str]:
+    """Fetch interned cell values of given network.
+
+    Args:
+        network_name string: Name of network.
+        network_data dict: Map of relevant network data.
+    Returns:
+        list: Cell values of network, one per column.
+    """
+
+    values: list[str] = [sys.intern(network_name)]
+    for field in FIELDS[1:]:
+        values.append(sys.intern(str(network_data.get(field) or '')))
+    return values
+
+
+def _extend_columns(columns: tuple[list], data: dict) -> None:
+    """Append cells of given networks to given columns.
+
+    Args:
+        columns tuple: Lists of cell values, one per column.
+        data dict: Map of network names to their relevant data.
+    """
+
+    for network_name, network_data in data.items():
+        for column, value in enumerate(_row_values(network_name, network_data)):
+            columns[column].append(value)
+
+
+class NetworkTableModel(QtCore.QAbstractTableModel):
+    """Table of saved networks, one row per network.
+
+    Rows are kept column by column in plain lists of interned strings
+    rather than as per-cell Qt items, and handed to views in pages through
+    canFetchMore/fetchMore as they scroll.
+    """
+    def __init__(self, parent: QtCore.QObject=None) -> None:
+        """Initializes empty model."""
+
+        super(NetworkTableModel, self).__init__(parent)
+
+        self._columns: tuple[list] = tuple(list() for _ in HEADERS)
+        self._fetched: int = 0
+        self._sort_column: int = -1
+        self._sort_order: QtCore.Qt.SortOrder = QtCore.Qt.AscendingOrder
+
+    def set_networks(self, data: dict) -> None:
+        """Replace every row with given networks, keeping the current sort.
+
+        Args:
+            data dict: Map of network names to their relevant data, in the
+                       order they should be displayed.
+        """
+
+        self.beginResetModel()
+        columns: tuple[list] = tuple(list() for _ in HEADERS)
+        _extend_columns(columns, data)
+        self._columns = self._sorted(columns)
+        self._fetched = min(FETCH_SIZE, len(columns[0]))
+        self.endResetModel()
+
+    def append_networks(self, data: dict) -> None:
+        """Add given networks after the rows already held.
+
+        Rows are only inserted into views while the first page is being
+        filled, the rest wait to be fetched. Sorted models are re-sorted as a
+        whole instead.
+
+        Args:
+            data dict: Map of network names to their relevant data.
+        """
+
+        if self._sort_column >= 0:
+            self.beginResetModel()
+            _extend_columns(self._columns, data)
+            self._columns = self._sorted(self._columns)
+            self._fetched = max(
+                self._fetched, min(FETCH_SIZE, self.network_count())
+            )
+            self.endResetModel()
+            return
+
+        _extend_columns(self._columns, data)
+        fetched: int = max(self._fetched, min(FETCH_SIZE, self.network_count()))
+        if fetched > self._fetched:
+            self.beginInsertRows(QtCore.QModelIndex(), self._fetched, fetched - 1)
+            self._fetched = fetched
+            self.endInsertRows()
+
+    def update_networks(self, data: dict) -> None:
+        """Bring rows in line with given networks, row by row.
+
+        Networks no longer given are removed, changed ones updated in place
+        and new ones inserted, at their sorted position if the model is
+        sorted or at the end otherwise. Views keep their selection and
+        scroll position throughout.
+
+        Args:
+            data dict: Map of every network to display to its relevant data.
+        """
+
+        names: list[str] = self._columns[0]
+
+        # removals, bottom up in contiguous ranges
+        row: int = len(names)
+        while row > 0:
+            row -= 1
+            if names[row] in data:
+                continue
+            end: int = row
+            while row > 0 and names[row - 1] not in data:
+                row -= 1
+            self._remove_rows(row, end)
+
+        # updates
+        rows: dict[str, int] = {name: row for row, name in enumerate(names)}
+        resort: bool = False
+        for network_name, row in rows.items():
+            values: list[str] = _row_values(network_name, data[network_name])
+            changed: list[int] = [
+                column for column, value in enumerate(values)
+                if self._columns[column][row] != value
+            ]
+            if not changed:
+                continue
+            for column in changed:
+                self._columns[column][row] = values[column]
+            resort = resort or self._sort_column in changed
+            if row < self._fetched:
+                self.dataChanged.emit(
+                    self.index(row, 0), self.index(row, len(HEADERS) - 1)
+                )
+        if resort:
+            self._resort()
+
+        # inserts
+        for network_name, network_data in data.items():
+            if network_name not in rows:
+                self._insert_row(_row_values(network_name, network_data))
+
+    def _remove_rows(self, first: int, last: int) -> None:
+        """Remove given range of rows, telling views about fetched ones.
+
+        Args:
+            first int: First row to remove.
+            last int: Last row to remove.
+        """
+
+        fetched_last: int = min(last, self._fetched - 1)
+        if first <= fetched_last:
+            self.beginRemoveRows(QtCore.QModelIndex(), first, fetched_last)
+        for values in self._columns:
+            del values[first:last + 1]
+        if first <= fetched_last:
+            self._fetched -= fetched_last - first + 1
+            self.endRemoveRows()
+
+    def _insert_row(self, values: list[str]) -> None:
+        """Insert row with given cell values where it belongs.
+
+        Args:
+            values list: Cell values of row, one per column.
+        """
+
+        row: int = self._insert_position(values)
+        fetched: bool = row <= self._fetched and (
+            row < self._fetched or not self.canFetchMore()
+        )
+        if fetched:
+            self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        for column, value in enumerate(values):
+            self._columns[column].insert(row, value)
+        if fetched:
+            self._fetched += 1
+            self.endInsertRows()
+
+    def _insert_position(self, values: list[str]) -> int:
+        """Find row a row with given cell values belongs at.
+
+        Args:
+            values list: Cell values of row, one per column.
+        Returns:
+            int: Row to insert at.
+        """
+
+        if self._sort_column < 0:
+            return self.network_count()
+        column: list[str] = self._columns[self._sort_column]
+        key: tuple = _sort_key(values[self._sort_column])
+        descending: bool = self._sort_order == QtCore.Qt.DescendingOrder
+        low, high = 0, len(column)
+        while low < high:
+            middle: int = (low + high) // 2
+            middle_key: tuple = _sort_key(column[middle])
+            if (middle_key < key) if descending else (key < middle_key):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def network_count(self) -> int:
+        """Number of networks held, whether fetched by views yet or not."""
+
+        return len(self._columns[0])
+
+    def network_name(self, row: int) -> str:
+        """Fetch name of network at given row.
+
+        Args:
+            row int: Row of network.
+        Returns:
+            str: Name of network.
+        """
+
+        return self._columns[0][row]
+
+    def rowCount(self, parent: QtCore.QModelIndex=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._fetched
+
+    def columnCount(self, parent: QtCore.QModelIndex=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(HEADERS)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex=QtCore.QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._fetched < self.network_count()
+
+    def fetchMore(self, parent: QtCore.QModelIndex=QtCore.QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        count: int = min(FETCH_SIZE, self.network_count() - self._fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(
+            QtCore.QModelIndex(), self._fetched, self._fetched + count - 1
+        )
+        self._fetched += count
+        self.endInsertRows()
+
+    def data(self, index: QtCore.QModelIndex, role: int=QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._fetched:
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.UserRole):
+            return self._columns[index.column()][index.row()]
+        if role == QtCore.Qt.ToolTipRole and index.column() == 3:
+            return self._columns[3][index.row()] or None
+        return None
+
+    def headerData(
+            self, section: int, orientation: QtCore.Qt.Orientation,
+            role: int=QtCore.Qt.DisplayRole
+        ):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlags:
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
+
+    def _sorted(self, columns: tuple[list]) -> tuple[list]:
+        """Reorder rows of given columns by the current sort column.
+
+        Args:
+            columns tuple: Lists of cell values, one per column.
+        Returns:
+            tuple: Given columns, reordered.
+        """
+
+        if self._sort_column < 0:
+            return columns
+        keys: list[tuple] = [
+            _sort_key(value) for value in columns[self._sort_column]
+        ]
+        rows: list[int] = sorted(
+            range(len(keys)), key=keys.__getitem__,
+            reverse=self._sort_order == QtCore.Qt.DescendingOrder
+        )
+        return tuple([values[row] for row in rows] for values in columns)
+
+    def _resort(self) -> None:
+        """Re-sort every row in place, keeping views' selection."""
+
+        self.layoutAboutToBeChanged.emit()
+        columns: tuple[list] = self._columns
+        self._columns = self._sorted(columns)
+        # map old rows to new ones through the row's name, which is unique
+        rows: dict[str, int] = {
+            name: row for row, name in enumerate(self._columns[0])
+        }
+        old_indexes: list = self.persistentIndexList()
+        self.changePersistentIndexList(old_indexes, [
+            self.index(rows[columns[0][index.row()]], index.column())
+            for index in old_indexes
+        ])
+        self.layoutChanged.emit()
+
+    def sort(
+            self, column: int, order: QtCore.Qt.SortOrder=QtCore.Qt.AscendingOrder
+        ) -> None:
+        """Reorder every row, fetched or not, by given column.
+
+        Args:
+            column int: Column to sort by, or -1 to keep rows as given.
+            order QtCore.Qt.SortOrder: Direction to sort in.
+        """
+
+        if column >= len(HEADERS):
+            return
+        self._sort_column = column
+        self._sort_order = order
+        if column >= 0:
+            self._resort()
+
+
+class NetworkFilterModel(QtCore.QSortFilterProxyModel):
+    """Proxy filtering a NetworkTableModel down to a set of network names.
+
+    Sorting is passed through to the source model, which reorders its
+    columns in one go rather than comparing rows cell by cell.
+    """
+    def __init__(self, parent: QtCore.QObject=None) -> None:
+        """Initializes proxy accepting every network."""
+
+        super(NetworkFilterModel, self).__init__(parent)
+
+        self._names: frozenset = None
+
+    def set_names(self, names: set[str]=None) -> None:
+        """Only accept networks with given names.
+
+        Args:
+            names set: Names of networks to accept, or None to accept all.
+        """
+
+        self._names = None if names is None else frozenset(names)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(
+            self, source_row: int, source_parent: QtCore.QModelIndex
+        ) -> bool:
+        if self._names is None:
+            return True
+        return self.sourceModel().network_name(source_row) in self._names
+
+    def sort(
+            self, column: int, order: QtCore.Qt.SortOrder=QtCore.Qt.AscendingOrder
+        ) -> None:
+        self.sourceModel().sort(column, order)
@@ -1,33 +1,69 @@
 """Contains a GUI allowing a user to load their saved networks into Houdini."""
 
+import concurrent.futures
 import os
-from getpass import getuser
 import shutil
+import tempfile
+import threading
+from getpass import getuser
 
 import hou
 
-from PySide2 import QtWidgets, QtCore, QtGui
+from PySide2 import QtWidgets, QtCore
 
+import network_saver.federation
+import network_saver.journal
+import network_saver.locks
+import network_saver.prefetch
+import network_saver.search
+import network_saver.trace
+import network_saver.trash
 import network_saver.utility
+import network_saver.ui.delegates
+import network_saver.ui.models
+import network_saver.ui.workers
+
+REFRESH_DELAY = 500
+
+STAGE_WORKERS = 4
+NETBOX_SPACING = 1.0
+
+# load networks straight from their files, rather than round trip them
+# through the clipboard file, where Houdini supports it
+LOAD_ITEMS = hasattr(hou.Node, 'loadItemsFromFile')
+
+# dialog kept around hidden between launches
+_dialog = None
 
 
 class NetLoadDialog(QtWidgets.QWidget):
     """GUI allowing user to load saved networks into Houdini."""
     def __init__(
-            self, parent: QtWidgets.QWidget=None, user: str=None, root: str=None
+            self, parent: QtWidgets.QWidget=None, user: str=None,
+            root: str=None, roots: list[str]=None
         ) -> None:
         """Initializes NetLoad GUI.
 
         Args:
             user str: User to initialize GUI under.
-            root str: Path-like object representing vault location.
+            root str: Path-like object representing single vault location to
+                      load from.
+            roots list: Path-like objects representing vault roots to merge,
+                        highest priority first. Defaults to configured ones.
         """
         super(NetLoadDialog, self).__init__(parent)
 
         self.setWindowTitle('Load Selected Network')
 
-        self.vault_dir: str = root or network_saver.utility.get_vault_dir()
+        self.vault_dirs: list[str] = [root] if root else (
+            roots or network_saver.utility.get_vault_dirs()
+        )
+        self.vault_dir: str = self.vault_dirs[0]
         self.user: str = user or getuser()
+        # vault root each listed network is served from
+        self._network_dirs: dict[str, str] = dict()
+        # generation each listed network was at when listed
+        self._network_generations: dict[str, int] = dict()
 
         vbox: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
 
@@ -38,21 +74,33 @@ class NetLoadDialog(QtWidgets.QWidget):
         self.user_combobox: QtWidgets.QComboBox = QtWidgets.QComboBox(self)
         hbox.addWidget(user_label)
         hbox.addWidget(self.user_combobox)
+
+        # network search
+        self.search_edit: QtWidgets.QLineEdit = QtWidgets.QLineEdit(self)
+        self.search_edit.setPlaceholderText('Search networks...')
+        self.search_edit.setClearButtonEnabled(True)
+        hbox.addWidget(self.search_edit)
         hbox.addStretch()
 
         # network removal
         self.remove_button: QtWidgets.QPushButton = QtWidgets.QPushButton('Remove Network', self)
         hbox.addWidget(self.remove_button)
 
-        # setup table model 
-        self.table_model: QtGui.QStandardItemModel = QtGui.QStandardItemModel()
-        self.table_model.setHorizontalHeaderLabels(
-            ['Name', 'Houdini Version', 'Context', 'Description']
-        )
+        # setup table model, filtered and sorted through a proxy
+        self.table_model: network_saver.ui.models.NetworkTableModel = \
+            network_saver.ui.models.NetworkTableModel(self)
+        self.proxy_model: network_saver.ui.models.NetworkFilterModel = \
+            network_saver.ui.models.NetworkFilterModel(self)
+        self.proxy_model.setSourceModel(self.table_model)
 
         # setup table view
         self.table_view: QtWidgets.QTableView = QtWidgets.QTableView()
-        self.table_view.setModel(self.table_model)
+        self.table_view.setModel(self.proxy_model)
+        # keep networks in saved order until a header is clicked
+        self.table_view.horizontalHeader().setSortIndicator(
+            -1, QtCore.Qt.AscendingOrder
+        )
+        self.table_view.setSortingEnabled(True)
         self.table_view.horizontalHeader().setStretchLastSection(True)
         self.table_view.horizontalHeader().setMaximumHeight(25)
         self.table_view.verticalHeader().setVisible(False)
@@ -66,7 +114,13 @@ class NetLoadDialog(QtWidgets.QWidget):
             QtCore.Qt.ScrollBarAlwaysOff
         )
         self.table_view.setWordWrap(True)
-        for index, width in [(0, 150), (1, 150), (2, 60), (3, 350)]:
+        # node graph thumbnails beside network names
+        self.thumbnail_delegate: network_saver.ui.delegates.ThumbnailDelegate = \
+            network_saver.ui.delegates.ThumbnailDelegate(
+                self._locate_network, self.table_view
+            )
+        self.table_view.setItemDelegateForColumn(0, self.thumbnail_delegate)
+        for index, width in [(0, 230), (1, 150), (2, 60), (3, 350)]:
             self.table_view.setColumnWidth(index, width)
         self.table_view.setShowGrid(False)
         self.table_view.setWordWrap(True)
@@ -75,21 +129,48 @@ class NetLoadDialog(QtWidgets.QWidget):
             QtWidgets.QAbstractItemView.SelectRows
         )
         self.table_view.setSelectionMode(
-            QtWidgets.QAbstractItemView.SingleSelection
+            QtWidgets.QAbstractItemView.ExtendedSelection
         )
 
+        # loading state
+        self.status_label: QtWidgets.QLabel = QtWidgets.QLabel(self)
+        self.status_label.setVisible(False)
+
         self.load_button: QtWidgets.QPushButton = QtWidgets.QPushButton('Load Network', self)
 
         # layout
         vbox.addLayout(hbox)
         vbox.addWidget(self.table_view)
+        vbox.addWidget(self.status_label)
         vbox.addWidget(self.load_button)
         self.setLayout(vbox)
 
-        # preflight 
-        self.refresh_networks()
-        self._populate_users()
-        self._set_current_user()
+        # background loading, results of stale loads are dropped by
+        # generation
+        self._generation: int = 0
+        self._loading: bool = False
+        self._cancelled: threading.Event = threading.Event()
+        self._loader_signals: network_saver.ui.workers.LoaderSignals = \
+            network_saver.ui.workers.LoaderSignals(self)
+        self._loader_signals.users_loaded.connect(self._handle_users_loaded)
+        self._loader_signals.networks_loaded.connect(
+            self._handle_networks_loaded
+        )
+        self._loader_signals.finished.connect(self._handle_load_finished)
+        self._loader_signals.failed.connect(self._handle_load_failed)
+        self._loader_signals.networks_listed.connect(
+            self._handle_networks_listed
+        )
+
+        # live refresh when the vault changes on disk, debounced as a single
+        # save touches several files in a row
+        self._watcher: QtCore.QFileSystemWatcher = QtCore.QFileSystemWatcher(self)
+        self._refresh_timer: QtCore.QTimer = QtCore.QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_DELAY)
+        self._refresh_timer.timeout.connect(self._start_refresh)
+        self._watcher.directoryChanged.connect(self._schedule_refresh)
+        self._watcher.fileChanged.connect(self._schedule_refresh)
 
         # connections
         self.load_button.clicked.connect(self.load_network)
@@ -97,17 +178,61 @@ class NetLoadDialog(QtWidgets.QWidget):
         self.user_combobox.currentIndexChanged.connect(
             self._handle_user_change
         )
+        self.search_edit.textChanged.connect(self._filter_networks)
+        self.proxy_model.rowsInserted.connect(self._resize_rows)
+
+        # start fetching networks as soon as they're selected
+        # networks may live in any root, each file finds its own
+        self._prefetcher: network_saver.prefetch.Prefetcher = \
+            network_saver.prefetch.Prefetcher()
+        self.table_view.selectionModel().selectionChanged.connect(
+            self._prefetch_selection
+        )
+
+        # preflight, without blocking Houdini on a slow share
+        self._start_load(list_users=True)
 
     def sizeHint(self) -> QtCore.QSize:
         """GUI dimensions."""
 
-        return QtCore.QSize(700, 250)
+        return QtCore.QSize(780, 300)
 
     def _handle_user_change(self) -> None:
         """Update relevant fields based on current user selection."""
 
         self.user: str = self.user_combobox.currentText()
-        self.refresh_networks()
+        self._start_load()
+
+    def _filter_networks(self) -> None:
+        """Hide networks not matching current search query."""
+
+        query: str = self.search_edit.text()
+        names: set[str] = None
+        if query.strip():
+            names = set()
+            for vault_dir in self.vault_dirs:
+                index: network_saver.search.SearchIndex = \
+                    network_saver.search.get_index(vault_dir, create=False)
+                if index is None:
+                    continue
+                # shadowed networks don't count, only what is displayed
+                names.update(
+                    name for _user, name in index.search(query, user=self.user)
+                    if self._network_dirs.get(name) == vault_dir
+                )
+        self.proxy_model.set_names(names)
+
+    def _resize_rows(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        """Fit rows fetched by the view to their contents.
+
+        Args:
+            parent QtCore.QModelIndex: Parent of inserted rows.
+            first int: First inserted row.
+            last int: Last inserted row.
+        """
+
+        for row in range(first, last + 1):
+            self.table_view.resizeRowToContents(row)
 
     def _set_current_user(self) -> None:
         """Set user property to current user. Meant to run once during init."""
@@ -116,29 +241,299 @@ class NetLoadDialog(QtWidgets.QWidget):
         if index != -1:
             self.user_combobox.setCurrentIndex(index)
 
-    def _validate_user_dir(self, folder: str) -> bool:
-        """Filter func to ensure user directory both exists and contains 
-           network json.
+    def _populate_users(self, users: list[str]) -> None:
+        """Populate user combobox with given users, selecting current user.
+
+        Args:
+            users list: Users of vault.
+        """
+
+        current: list[str] = [
+            self.user_combobox.itemText(index)
+            for index in range(self.user_combobox.count())
+        ]
+        if current == users:
+            return
+        self.user_combobox.blockSignals(True)
+        self.user_combobox.clear()
+        self.user_combobox.addItems(users)
+        self._set_current_user()
+        self.user_combobox.blockSignals(False)
+
+    def is_loading(self) -> bool:
+        """Check whether networks are being loaded in the background."""
+
+        return self._loading
+
+    def wait_for_load(self, timeout: float=30.0) -> bool:
+        """Process events until the background load in flight is done.
+
+        Args:
+            timeout float: Seconds to wait for at most.
+        Returns:
+            bool: Whether the load is done.
+        """
+
+        timer: QtCore.QElapsedTimer = QtCore.QElapsedTimer()
+        timer.start()
+        while self._loading and timer.elapsed() < timeout * 1000:
+            QtCore.QCoreApplication.processEvents(
+                QtCore.QEventLoop.AllEvents, 50
+            )
+            QtCore.QThread.msleep(5)
+        return not self._loading
+
+    def _set_loading(self, loading: bool, message: str='') -> None:
+        """Show or hide loading state.
+
+        Args:
+            loading bool: Whether a load is in flight.
+            message string: Status to display, hiding the status if empty.
+        """
+
+        self._loading = loading
+        self.status_label.setText(message)
+        self.status_label.setVisible(bool(message))
+
+    def _cancel_load(self) -> None:
+        """Cancel background load in flight, if any."""
+
+        self._cancelled.set()
+        self._cancelled = threading.Event()
+        self._generation += 1
+        self._set_loading(False)
+
+    def _start_load(self, list_users: bool=False) -> None:
+        """List networks of current user on a worker thread, replacing any
+           load still in flight.
+
+        Args:
+            list_users bool: Whether to list the users of the vault first.
+        """
+
+        self._cancel_load()
+        self._prefetcher.cancel()
+        self._watch_vault()
+        self.table_model.set_networks(dict())
+        self._network_dirs.clear()
+        self._network_generations.clear()
+        self._set_loading(True, 'Loading networks...')
+        loader: network_saver.ui.workers.NetworkLoader = \
+            network_saver.ui.workers.NetworkLoader(
+                self._loader_signals, self._generation, self.user,
+                self.vault_dirs, self._cancelled, list_users=list_users
+            )
+        QtCore.QThreadPool.globalInstance().start(loader)
+
+    def _watch_vault(self) -> None:
+        """Watch vault roots and current user's folders and vault files.
+
+        Files replaced on save drop out of the watcher, so this is re-run
+        after every change.
+        """
+
+        paths: list[str] = list()
+        for vault_dir in self.vault_dirs:
+            vault_file: str = network_saver.utility.get_vault_file(
+                user=self.user, vault_dir=vault_dir
+            )
+            paths.extend(
+                path for path in (
+                    vault_dir,
+                    os.path.dirname(vault_file),
+                    vault_file,
+                    network_saver.journal.get_journal_file(vault_file)
+                ) if os.path.exists(path)
+            )
+        watched: list[str] = self._watcher.files() + self._watcher.directories()
+        stale: list[str] = [path for path in watched if path not in paths]
+        if stale:
+            self._watcher.removePaths(stale)
+        new: list[str] = [path for path in paths if path not in watched]
+        if new:
+            self._watcher.addPaths(new)
+
+    def _schedule_refresh(self, path: str=None) -> None:
+        """Refresh networks once the vault settles down after a change.
+           Hidden dialogs catch up when they're shown again instead.
+
+        Args:
+            path string: Path-like object representing changed file or
+                         folder.
+        """
+
+        if self.isVisible():
+            self._refresh_timer.start()
+
+    def reopen(self) -> None:
+        """Show hidden dialog again, applying any change made to the vault
+           while it was hidden row by row.
+        """
+
+        self._start_refresh()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def _start_refresh(self) -> None:
+        """List users and networks on a worker thread, to apply any change
+           on disk to the displayed networks.
+        """
+
+        if self._loading:
+            # it may have listed networks before the change, retry after it
+            self._refresh_timer.start()
+            return
+        self._cancel_load()
+        self._watch_vault()
+        loader: network_saver.ui.workers.NetworkLoader = \
+            network_saver.ui.workers.NetworkLoader(
+                self._loader_signals, self._generation, self.user,
+                self.vault_dirs, self._cancelled, list_users=True, stream=False
+            )
+        QtCore.QThreadPool.globalInstance().start(loader)
+
+    def _get_network_dirs(self, data: dict) -> dict:
+        """Map given networks to the vault root they are served from.
+
+        Args:
+            data dict: Map of network names to their relevant data, as listed
+                       across vault roots.
+        Returns:
+            dict: Map of network names to vault roots.
+        """
+
+        return {
+            name: network_data.get('vault_dir', self.vault_dir)
+            for name, network_data in data.items()
+        }
+
+    def _locate_network(self, name: str) -> tuple:
+        """Fetch where given listed network lives, for its thumbnail.
 
         Args:
-            folder: String representing file/folder present in vault dir.
+            name string: Name of listed network.
         Returns:
-            bool: Value representing validation status.
+            str: User owning network.
+            str: Path-like object representing vault root it is served from.
+            int: Generation it was listed at.
+        """
+
+        return (
+            self.user, self._network_dirs.get(name, self.vault_dir),
+            self._network_generations.get(name, 0)
+        )
+
+    def _get_network_generations(self, data: dict) -> dict:
+        """Map given networks to the generation they were listed at.
+
+        Args:
+            data dict: Map of network names to their relevant data, as listed
+                       across vault roots.
+        Returns:
+            dict: Map of network names to generations.
+        """
+
+        return {
+            name: network_saver.locks.get_generation(network_data)
+            for name, network_data in data.items()
+        }
+
+    def _handle_networks_listed(self, generation: int, data: dict) -> None:
+        """Apply networks listed by a live refresh row by row.
+
+        Args:
+            generation int: Load networks were listed by.
+            data dict: Map of every network of current user to its data.
+        """
+
+        if generation != self._generation:
+            return
+        self._network_dirs = self._get_network_dirs(data)
+        self._network_generations = self._get_network_generations(data)
+        self.table_model.update_networks(data)
+        self._filter_networks()
+
+    def _handle_users_loaded(self, generation: int, users: list[str]) -> None:
+        """Populate users listed by a background load.
+
+        Args:
+            generation int: Load users were listed by.
+            users list: Users of vault.
+        """
+
+        if generation == self._generation:
+            self._populate_users(users)
+
+    def _handle_networks_loaded(self, generation: int, data: dict) -> None:
+        """Append a batch of networks streamed in by a background load.
+
+        Args:
+            generation int: Load networks were listed by.
+            data dict: Map of network names to their relevant data.
         """
 
-        full_path: str = os.path.join(self.vault_dir, folder)
-        if not os.path.isdir(full_path):
-            return False
-        children: list[str] = os.listdir(full_path)
-        if "networks.json" not in children:
-            return False
-        return True
+        if generation != self._generation:
+            return
+        self._network_dirs.update(self._get_network_dirs(data))
+        self._network_generations.update(self._get_network_generations(data))
+        self.table_model.append_networks(data)
+        if self.search_edit.text().strip():
+            # the index caught up with this user before the first batch
+            self._filter_networks()
+        self.status_label.setText('Loading networks... ({})'.format(
+            self.table_model.network_count()
+        ))
+
+    def _handle_load_finished(self, generation: int, count: int) -> None:
+        """Leave loading state once every network was streamed in.
 
-    def _populate_users(self) -> None:
-        """Populate user combobox based on contents of vault dir."""
+        Args:
+            generation int: Load that finished.
+            count int: Number of networks listed.
+        """
 
-        user_dirs: list[str] = filter(self._validate_user_dir, os.listdir(self.vault_dir))
-        self.user_combobox.addItems(user_dirs)
+        if generation != self._generation:
+            return
+        if count:
+            self._set_loading(False)
+            return
+
+        self._set_loading(False, 'No networks available to load.')
+        if hou.isUIAvailable():
+            hou.ui.displayMessage(
+                "No networks available to load!\n"
+                "Please first save a network using the network saver tool.",
+                severity=hou.severityType.Error
+            )
+
+    def _handle_load_failed(self, generation: int, message: str) -> None:
+        """Report a background load that failed.
+
+        Args:
+            generation int: Load that failed.
+            message string: Error raised by load.
+        """
+
+        if generation != self._generation:
+            return
+        print('Warning: Could not load networks of', self.user)
+        print(message)
+        self._set_loading(False, 'Failed to load networks.')
+        if hou.isUIAvailable():
+            hou.ui.displayMessage(
+                "Could not load networks!\n{}".format(message),
+                severity=hou.severityType.Error
+            )
+
+    def closeEvent(self, event) -> None:
+        """Cancel background work in flight when closing."""
+
+        self._refresh_timer.stop()
+        self._cancel_load()
+        self._prefetcher.cancel()
+        self.thumbnail_delegate.cancel()
+        super(NetLoadDialog, self).closeEvent(event)
 
     def get_current_selection(self) -> tuple[int]:
         """Get currently selected network as row of indexes.
@@ -158,19 +553,35 @@ class NetLoadDialog(QtWidgets.QWidget):
 
         return indexes
 
+    def get_selected_networks(self) -> list[tuple[str]]:
+        """Fetch data associated with every selected network.
+
+        Returns:
+            list: (name, category) tuples of selected networks, top to bottom.
+        """
+
+        self.get_current_selection()
+        indexes: list = sorted(
+            self.table_view.selectionModel().selectedRows(),
+            key=lambda index: index.row()
+        )
+        return [
+            (
+                index.data(QtCore.Qt.UserRole),
+                index.sibling(index.row(), 2).data(QtCore.Qt.UserRole)
+            ) for index in indexes
+        ]
+
     def get_network_data(self) -> tuple[str]:
-        """Fetch data associated with selected network.
+        """Fetch data associated with selected network, the topmost one if
+           several are selected.
 
         Returns:
             str: Name of selected network.
             str: Category of selected network.
         """
 
-        indexes: tuple[str] = self.get_current_selection()
-        name: str = indexes[0].data(QtCore.Qt.UserRole)
-        context: str = indexes[2].data(QtCore.Qt.UserRole)
-
-        return name, context
+        return self.get_selected_networks()[0]
 
     def _validate_root_network(self, current_network: hou.PaneTab, expected_context: str) -> str:
         """Ensure current network editor is same category as selected network.
@@ -202,33 +613,154 @@ class NetLoadDialog(QtWidgets.QWidget):
                 "Network editor category does not match network category"
             )
 
+    def _get_network_file(self, name: str) -> str:
+        """Fetch network file of given network of current user.
+
+        Args:
+            name string: Name of network.
+        Returns:
+            str: Path-like object representing network file.
+        """
+
+        vault_dir: str = self._network_dirs.get(name, self.vault_dir)
+        return os.path.join(vault_dir, self.user, name + '.cpio')
+
+    def _prefetch_selection(self) -> None:
+        """Start fetching selected networks, dropping stale prefetches."""
+
+        indexes: list = self.table_view.selectionModel().selectedRows()
+        self._prefetcher.prefetch([
+            self._get_network_file(index.data(QtCore.Qt.UserRole))
+            for index in indexes
+        ])
+
+    def _stage_networks(self, names: list[str], stage_dir: str) -> dict:
+        """Fetch network files of given networks all at once.
+
+        Args:
+            names list: Names of networks to stage.
+            stage_dir string: Path-like object representing folder to stage
+                              raw CPIO files in.
+        Returns:
+            dict: Map of network names to staged raw CPIO files.
+        """
+
+        staged: dict[str, str] = {
+            name: os.path.join(stage_dir, '{}.cpio'.format(index))
+            for index, name in enumerate(names)
+        }
+        with network_saver.trace.span(
+            'net_load.stage_networks', networks=len(names)
+        ) as span, concurrent.futures.ThreadPoolExecutor(
+            max_workers=STAGE_WORKERS
+        ) as executor:
+            futures: list = [
+                executor.submit(
+                    self._prefetcher.extract, self._get_network_file(name),
+                    staged_file
+                ) for name, staged_file in staged.items()
+            ]
+            for future in futures:
+                future.result()
+            if span:
+                span.add(bytes=sum(
+                    os.path.getsize(staged_file)
+                    for staged_file in staged.values()
+                ))
+        return staged
+
+    def _load_items(
+            self, name: str, cur_network: hou.Node, staged_file: str=None
+        ) -> None:
+        """Load selected network straight from its raw CPIO file, leaving
+           the clipboard alone. Loaded nodes end up selected, as if pasted.
+
+        Args:
+            name string: name of selected network
+            cur_network hou.Node: Current network location.
+            staged_file string: Path-like object representing raw CPIO file
+                                the network was already staged to, if any.
+        """
+
+        src: str = staged_file
+        tmp_file: str = None
+        if not src:
+            fd, tmp_file = tempfile.mkstemp(
+                dir=os.getenv('HOUDINI_TEMP_DIR'), suffix='.cpio'
+            )
+            os.close(fd)
+            with network_saver.trace.span(
+                'net_load.fetch_network_file', staged=False
+            ) as span:
+                self._prefetcher.extract(self._get_network_file(name), tmp_file)
+                if span:
+                    span.add(bytes=os.path.getsize(tmp_file))
+            src = tmp_file
+
+        try:
+            existing: set[hou.Node] = set(cur_network.children())
+            with network_saver.trace.span('hou.loadItemsFromFile'):
+                cur_network.loadItemsFromFile(src, ignore_load_warnings=True)
+        finally:
+            if tmp_file and os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
+        hou.clearAllSelected()
+        for node in cur_network.children():
+            if node not in existing:
+                node.setSelected(True)
+
     def _paste_selected_network(
-            self, name: str, context: str, 
-            cur_network: hou.paneTabType.NetworkEditor
+            self, name: str, context: str,
+            cur_network: hou.paneTabType.NetworkEditor, staged_file: str=None
         ) -> None:
-        """Load selected network from clipboard.
+        """Load selected network, straight from its file if possible and
+           through the clipboard otherwise.
 
         Args:
             name string: name of selected network
             context string: Representation of current network category.
             network_pane hou.paneTabType.NetworkEditor: Current network editor.
+            staged_file string: Path-like object representing raw CPIO file
+                                the network was already staged to, if any.
         """
 
+        if LOAD_ITEMS:
+            try:
+                self._load_items(name, cur_network, staged_file=staged_file)
+                return
+            except hou.OperationFailed as err:
+                print('Warning: Could not load items directly, '
+                      'falling back to the clipboard')
+                print(err)
+
         dst_file = '_'.join((context, 'copy.cpio'))
         dst = os.path.join(os.getenv('HOUDINI_TEMP_DIR'), dst_file)
-        src = os.path.join(self.vault_dir, self.user, name + '.cpio')
-        shutil.copy(src, dst)
-
-        hou.pasteNodesFromClipboard(cur_network)
+        with network_saver.trace.span(
+            'net_load.fetch_network_file', staged=bool(staged_file)
+        ) as span:
+            if staged_file:
+                os.replace(staged_file, dst)
+            else:
+                # prefetched on selection, or served from the local cache on
+                # repeat loads
+                self._prefetcher.extract(self._get_network_file(name), dst)
+            if span:
+                span.add(bytes=os.path.getsize(dst))
+
+        with network_saver.trace.span('hou.pasteNodesFromClipboard'):
+            hou.pasteNodesFromClipboard(cur_network)
 
     def _wrap_selection_in_netbox(
             self, name: str, cur_network: hou.Node
-        ) -> None:
+        ) -> hou.NetworkBox:
         """Create netbox around recently created network.
 
         Args:
             name string: Name of netbox.
             cur_network hou.Node: Current network location.
+        Returns:
+            hou.NetworkBox: Created netbox.
         """
 
         netbox: hou.NetworkBox = cur_network.createNetworkBox()
@@ -238,7 +770,29 @@ class NetLoadDialog(QtWidgets.QWidget):
         for node in hou.selectedNodes():
             netbox.addNode(node)
         netbox.fitAroundContents()
-    
+        return netbox
+
+    @staticmethod
+    def _place_netbox(netbox: hou.NetworkBox, previous: hou.NetworkBox) -> None:
+        """Move netbox and its contents right of previously loaded netbox, so
+           networks loaded together don't overlap.
+
+        Args:
+            netbox hou.NetworkBox: Netbox to move.
+            previous hou.NetworkBox: Netbox loaded before it.
+        """
+
+        # positions are bottom left corners, align the tops
+        offset: hou.Vector2 = hou.Vector2(
+            previous.position()[0] + previous.size()[0] + NETBOX_SPACING
+            - netbox.position()[0],
+            previous.position()[1] + previous.size()[1]
+            - netbox.position()[1] - netbox.size()[1]
+        )
+        for item in netbox.items():
+            item.move(offset)
+        netbox.fitAroundContents()
+
     @staticmethod
     def _get_cur_network() -> hou.Node:
         """Get root node of current active network editor pane
@@ -250,7 +804,12 @@ class NetLoadDialog(QtWidgets.QWidget):
         return network_pane.pwd()
 
     def load_network(self, root_network: hou.Node=None) -> None:
-        """Import selected network into active network editor pane."""
+        """Import selected networks into active network editor pane.
+
+        Every selected network is validated and fetched before any of them is
+        pasted, and they're pasted as a single undoable step, each in its own
+        netbox laid out next to the previous one.
+        """
 
         if not root_network and not hou.isUIAvailable():
             raise RuntimeError(
@@ -259,103 +818,112 @@ class NetLoadDialog(QtWidgets.QWidget):
             )
 
         try:
-            name, context = self.get_network_data()
+            networks: list[tuple[str]] = self.get_selected_networks()
             cur_network: hou.Node = root_network or self._get_cur_network()
-            self._validate_root_network(cur_network, context)
+            for context in sorted({context for _name, context in networks}):
+                self._validate_root_network(cur_network, context)
         except RuntimeError:
             # assume we failed network validation
             return
 
-        self._paste_selected_network(name, context, cur_network)
-
-        self._wrap_selection_in_netbox(name, cur_network)
+        stage_dir: str = tempfile.mkdtemp(dir=os.getenv('HOUDINI_TEMP_DIR'))
+        try:
+            staged: dict[str, str] = self._stage_networks(
+                [name for name, _context in networks], stage_dir
+            )
+            with network_saver.trace.span(
+                'net_load.paste_networks', networks=len(networks)
+            ), hou.undos.group('Load {} Network(s)'.format(len(networks))):
+                previous: hou.NetworkBox = None
+                for name, context in networks:
+                    self._paste_selected_network(
+                        name, context, cur_network, staged_file=staged[name]
+                    )
+                    netbox: hou.NetworkBox = self._wrap_selection_in_netbox(
+                        name, cur_network
+                    )
+                    if previous is not None:
+                        self._place_netbox(netbox, previous)
+                    previous = netbox
+        finally:
+            shutil.rmtree(stage_dir, ignore_errors=True)
 
         if hou.isUIAvailable():
             hou.ui.displayMessage(
-                "Successfully loaded network!"
+                "Successfully loaded network!" if len(networks) == 1 else
+                "Successfully loaded {} networks!".format(len(networks))
             )
         self.close()
 
     def remove_network(self) -> None:
-        """Remove network from GUI and associated json file."""
+        """Move selected networks to the vault's trash, removing them from
+           GUI and associated json file."""
 
         try:
-            name, _context = self.get_network_data()
+            networks: list[tuple[str]] = self.get_selected_networks()
         except RuntimeError:
             # assume no network was selected
             return
 
         if hou.isUIAvailable() and not hou.ui.displayConfirmation(
-            "Are you sure you want to remove this network?", 
+            "Are you sure you want to move this network to the trash?"
+            if len(networks) == 1 else
+            "Are you sure you want to move these {} networks to the "
+            "trash?".format(len(networks)),
             severity=hou.severityType.Warning
         ):
             return
 
-        # remove network from json
-        network_saver.utility.delete_network_data(
-            name, user=self.user, vault_dir=self.vault_dir
-        )
+        # networks may be served from several roots, each trashed in one go
+        by_root: dict[str, list[str]] = dict()
+        for name, _context in networks:
+            # from the root it's served from, which may uncover a network of
+            # the same name in a lower priority root
+            by_root.setdefault(
+                self._network_dirs.get(name, self.vault_dir), list()
+            ).append(name)
+
+        skipped: list[str] = list()
+        with network_saver.trace.span(
+            'net_load.remove_network', networks=len(networks)
+        ):
+            for vault_dir, names in by_root.items():
+                # kept if saved over since they were listed
+                _entries, kept = network_saver.trash.trash_networks(
+                    names, user=self.user, vault_dir=vault_dir,
+                    generations={
+                        name: self._network_generations.get(name)
+                        for name in names
+                    }
+                )
+                skipped.extend(kept)
+                network_saver.trash.collect_async(vault_dir)
 
-        # remove cpio file
-        network_saver.utility.remove_cpio_file(
-            name, user=self.user, vault_dir=self.vault_dir
-        )
+        if skipped and hou.isUIAvailable():
+            hou.ui.displayMessage(
+                "These networks were changed by another session and "
+                "were kept:\n{}".format('\n'.join(skipped)),
+                severity=hou.severityType.Warning
+            )
 
         try:
             self.refresh_networks()
         except RuntimeError:
             self.close()
 
-    def _construct_network_row(
-            self, network_name, network_data
-        ) -> list[QtGui.QStandardItem]:
-        """Create row representation of given network data.
-        
-        Args:
-            network_name str: Name of network being added.
-            network_data dict: Map of relevant network data, including Houdini
-                               version, category, and description.
-        Returns:
-            list: List of QStandardItems representing network row in GUI.
-        """
-
-        name_item: QtGui.QStandardItem = QtGui.QStandardItem(network_name)
-        name_item.setData(network_name, QtCore.Qt.UserRole)
-        version_item: QtGui.QStandardItem = QtGui.QStandardItem(network_data['version'])
-        context_item: QtGui.QStandardItem = QtGui.QStandardItem(network_data['context'])
-        context_item.setData(network_data['context'], QtCore.Qt.UserRole)
-        notes_item: QtGui.QStandardItem = QtGui.QStandardItem(network_data['notes'])
-
-        row: list[QtGui.QStandardItem] = [name_item, version_item, context_item, notes_item]
-        for item in row:
-            item.setEditable(False)
-
-        return row
-
-    def _append_network_row(self, network_name: str, network_data: dict) -> None:
-        """Add network as row to GUI, with relevant data stored in associated
-           columns.
-
-        Args:
-            network_name string: Name of network being added.
-            network_data dict: Map of relevant network data, including Houdini
-                               version, category, and description.
-        """
-
-        row: list[QtGui.QStandardItem] = self._construct_network_row(
-            network_name, network_data
-        )
-
-        self.table_model.appendRow(row)
-
     def refresh_networks(self) -> None:
-        """Refresh networks displayed by GUI."""
+        """Refresh networks displayed by GUI, blocking until done."""
 
-        self.table_model.setRowCount(0)
-
-        data: dict = network_saver.utility.read_user_data(
-            user=self.user, vault_dir=self.vault_dir
-        )
+        self._cancel_load()
+        with network_saver.trace.span('net_load.refresh_networks') as span:
+            data: dict = network_saver.federation.list_networks(
+                user=self.user, vault_dirs=self.vault_dirs
+            )
+            if span:
+                span.add(networks=len(data))
+        self._network_dirs = self._get_network_dirs(data)
+        self._network_generations = self._get_network_generations(data)
+        self.table_model.update_networks(data)
 
         if not data:
             if hou.isUIAvailable():
@@ -366,19 +934,37 @@ class NetLoadDialog(QtWidgets.QWidget):
                 )
             raise RuntimeError("Network vault empty")
 
-        for name, meta in data.items():
-            self._append_network_row(name, meta)
-
         self.table_view.resizeRowsToContents()
+        self._filter_networks()
 
 
 def launch() -> None:
-    """Launch GUI, parenting to Houdini main window."""
+    """Launch GUI, parenting to Houdini main window.
+
+    Closing the GUI only hides it, so later launches show the same, already
+    populated dialog again, refreshed in place.
+    """
+
+    global _dialog
+
+    vault_dirs: list[str] = network_saver.utility.get_vault_dirs()
+    if _dialog is not None:
+        try:
+            if _dialog.vault_dirs == vault_dirs:
+                _dialog.reopen()
+                return
+            _dialog.close()
+            _dialog.deleteLater()
+        except RuntimeError:
+            # deleted along with Houdini's main window
+            pass
+        _dialog = None
 
     try:
-        widget: NetLoadDialog = NetLoadDialog()
+        widget: NetLoadDialog = NetLoadDialog(roots=vault_dirs)
     except RuntimeError as err:
         print("Failed to open NetLoad dialog:\n{}".format(err))
         return
     widget.setParent(hou.qt.mainWindow(), QtCore.Qt.Window)
     widget.show()
+    _dialog = widget
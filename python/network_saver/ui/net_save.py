@@ -2,15 +2,27 @@
 
 import os
 from getpass import getuser
-import json
 import re
-import shutil
+import tempfile
 
 from PySide2 import QtCore, QtWidgets
 import hou
 
+import network_saver.files
+import network_saver.locks
+import network_saver.revisions
+import network_saver.storage
+import network_saver.thumbnails
+import network_saver.trace
 import network_saver.utility
 
+# write selected nodes straight to the vault, rather than round trip them
+# through the clipboard file, where Houdini supports it
+SAVE_ITEMS = hasattr(hou.Node, 'saveItemsToFile')
+
+# dialog kept around hidden between launches
+_dialog = None
+
 
 class NetSaveDialog(QtWidgets.QWidget):
     """GUI allowing user to save selected networks to be loaded later."""
@@ -116,7 +128,8 @@ class NetSaveDialog(QtWidgets.QWidget):
         return network_name
     
     def _move_network_file(self, vault_dir: str, context: str, network_name: str) -> None:
-        """Copy currently stored CPIO file to vault directory.
+        """Copy currently stored CPIO file to vault directory, compressing or
+           deduplicating it if the vault is set up to do so.
         
         Args:
             vault_dir string: Path-like object representing "vault" directory.
@@ -127,7 +140,91 @@ class NetSaveDialog(QtWidgets.QWidget):
         src_file: str = '_'.join((context, 'copy.cpio'))
         src: str = os.path.join(os.getenv('HOUDINI_TEMP_DIR'), src_file)
         dst: str = os.path.join(vault_dir, self.user, network_name + '.cpio')
-        shutil.copy(src, dst)
+        with network_saver.trace.span(
+            'net_save.store_network_file', path=dst
+        ) as span:
+            if span:
+                span.add(bytes=os.path.getsize(src))
+            network_saver.storage.store_network_file(
+                src, dst,
+                compression=network_saver.storage.get_compression(vault_dir),
+                deduplicate=network_saver.storage.is_deduplicated(vault_dir),
+                vault_dir=vault_dir
+            )
+
+    def _save_items(self, selection: tuple[hou.Node], network_name: str) -> None:
+        """Serialize selected nodes straight to vault directory, leaving the
+           clipboard alone.
+
+        Uncompressed networks are written next to their network file and
+        moved into place, so the contents are written exactly once. Anything
+        else is written to a temp file first and stored from there.
+
+        Args:
+            selection tuple: Collection of hou.Node objects representing
+                             currently selected network.
+            network_name string: Given name of network being saved.
+        """
+
+        dst: str = os.path.join(
+            self.vault_dir, self.user, network_name + '.cpio'
+        )
+        compression: str = network_saver.storage.get_compression(self.vault_dir)
+        deduplicate: bool = network_saver.storage.is_deduplicated(self.vault_dir)
+        direct: bool = compression == 'none' and not deduplicate
+        fd, tmp_file = tempfile.mkstemp(
+            dir=os.path.dirname(dst) if direct else os.getenv('HOUDINI_TEMP_DIR'),
+            suffix='.tmp'
+        )
+        os.close(fd)
+        try:
+            with network_saver.trace.span(
+                'hou.saveItemsToFile', nodes=len(selection)
+            ) as span:
+                selection[0].parent().saveItemsToFile(selection, tmp_file)
+                if span:
+                    span.add(bytes=os.path.getsize(tmp_file))
+            if direct:
+                network_saver.files.replace(tmp_file, dst)
+                return
+            with network_saver.trace.span(
+                'net_save.store_network_file', path=dst
+            ):
+                network_saver.storage.store_network_file(
+                    tmp_file, dst, compression=compression,
+                    deduplicate=deduplicate, vault_dir=self.vault_dir
+                )
+        finally:
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
+    def _save_network_file(
+            self, selection: tuple[hou.Node], context: str, network_name: str
+        ) -> None:
+        """Save selected nodes to vault directory, going through the
+           clipboard if they can't be serialized directly.
+
+        Args:
+            selection tuple: Collection of hou.Node objects representing
+                             currently selected network.
+            context string: Category of current network.
+            network_name string: Given name of network being saved.
+        """
+
+        if SAVE_ITEMS:
+            try:
+                self._save_items(selection, network_name)
+                return
+            except hou.OperationFailed as err:
+                print('Warning: Could not save items directly, '
+                      'falling back to the clipboard')
+                print(err)
+
+        with network_saver.trace.span(
+            'hou.copyNodesToClipboard', nodes=len(selection)
+        ):
+            hou.copyNodesToClipboard(selection)  # <-- creates CPIO file
+        self._move_network_file(self.vault_dir, context, network_name)
 
     def get_network_data(self, selection: tuple[hou.Node]) -> dict[str, str]:
         """Compile relevant data on current network.
@@ -146,7 +243,8 @@ class NetSaveDialog(QtWidgets.QWidget):
 
     def _write_network_data(
             self, config_file: str, data: dict[str, dict[str, str]], 
-            network_name: str, network_data: dict[str, str]
+            network_name: str, network_data: dict[str, str],
+            generation: int=None
         ) -> None:
         """Update network json with data associated with current network.
 
@@ -156,11 +254,80 @@ class NetSaveDialog(QtWidgets.QWidget):
             data dict: Map of previously saved networks to their relevant data.
             network_name string: Name of network currently being saved.
             network_data dict: Map of name of network to its relevant data.
+            generation int: Generation of network the save was decided on.
+        """
+
+        data.update({network_name: network_saver.utility.put_network_data(
+            network_name, network_data, user=self.user,
+            vault_dir=self.vault_dir, generation=generation
+        )})
+
+    def _commit_network(
+            self, selection: tuple[hou.Node], vault_file: str,
+            data: dict[str, dict[str, str]], network_name: str,
+            network_data: dict[str, str]
+        ) -> None:
+        """Write network file and data of current network, provided nobody
+           saved over it since given data was read.
+
+        Args:
+            selection tuple: Collection of hou.Node objects representing
+                             currently selected network.
+            vault_file string: Path-like object representing vault json.
+            data dict: Map of previously saved networks to their relevant data,
+                       as shown to the artist.
+            network_name string: Name of network currently being saved.
+            network_data dict: Map of name of network to its relevant data.
         """
 
-        data.update({network_name: network_data})
-        with open(config_file, 'w') as config_f:
-            json.dump(data, config_f)
+        generation: int = network_saver.locks.get_generation(
+            data.get(network_name)
+        )
+        with network_saver.utility.lock_network(
+            network_name, user=self.user, vault_dir=self.vault_dir
+        ):
+            # before touching the network file
+            current: dict = network_saver.utility.get_network_data(
+                network_name, user=self.user, vault_dir=self.vault_dir
+            )
+            network_saver.locks.check_generation(current, generation)
+
+            if current is not None:
+                # keep what is being saved over, without failing the save,
+                # diffing it against older revisions in the background
+                try:
+                    network_saver.revisions.queue_revision(
+                        network_name, current, user=self.user,
+                        vault_dir=self.vault_dir
+                    )
+                except (OSError, ValueError, RuntimeError) as err:
+                    print('Warning: Could not archive revision of ', network_name)
+                    print(err)
+
+            self._save_network_file(
+                selection, network_data['context'], network_name
+            )
+            try:
+                network_saver.thumbnails.update_thumbnail(
+                    network_name, user=self.user, vault_dir=self.vault_dir
+                )
+            except (OSError, ValueError) as err:
+                # drawn again when first shown
+                print('Warning: Could not draw thumbnail of ', network_name)
+                print(err)
+
+            self._write_network_data(
+                vault_file, data, network_name, network_data, generation
+            )
+
+    def reopen(self) -> None:
+        """Show hidden dialog again, cleared for the next network."""
+
+        self.title_edit.clear()
+        self.notes.clear()
+        self.show()
+        self.raise_()
+        self.activateWindow()
 
     def save_network(self) -> None:
         """Save network currently selected in GUI to json located on disk."""
@@ -170,23 +337,49 @@ class NetSaveDialog(QtWidgets.QWidget):
         except RuntimeError:
             return
 
-        vault_file: str = network_saver.utility.get_vault_file(user=self.user)
-        data: dict[str, dict[str, str]] = network_saver.utility.read_network_vault(vault_file, 'w')
-
-        try:
-            network_name: str = self.get_network_name(data)
-        except RuntimeError:
-            return
+        vault_file: str = network_saver.utility.get_vault_file(
+            user=self.user, vault_dir=self.vault_dir
+        )
 
-        network_data: dict[str, str] = self.get_network_data(selection)
+        # another session may save the same name while the artist is asked
+        # to confirm, in which case they are asked again
+        for _attempt in range(network_saver.locks.RETRIES):
+            data: dict[str, dict[str, str]] = network_saver.utility.read_network_vault(vault_file, 'w')
 
-        hou.copyNodesToClipboard(selection)  # <-- creates CPIO file
-        vault_dir: str = network_saver.utility.get_vault_dir()
-        self._move_network_file(
-            vault_dir, network_data['context'], network_name
-        )
+            try:
+                network_name: str = self.get_network_name(data)
+            except RuntimeError:
+                return
 
-        self._write_network_data(vault_file, data, network_name, network_data)
+            network_data: dict[str, str] = self.get_network_data(selection)
+
+            try:
+                with network_saver.trace.span('net_save.save_network'):
+                    self._commit_network(
+                        selection, vault_file, data, network_name,
+                        network_data
+                    )
+                break
+            except network_saver.locks.ConflictError as err:
+                print('Warning: Network was saved by another session ', network_name)
+                print(err)
+            except network_saver.locks.LockTimeout as err:
+                print(err)
+                if hou.isUIAvailable():
+                    hou.ui.displayMessage(
+                        "Network is being saved by another session!\n"
+                        "Please try again in a moment.",
+                        severity=hou.severityType.Warning
+                    )
+                return
+        else:
+            if hou.isUIAvailable():
+                hou.ui.displayMessage(
+                    "Network keeps being saved by another session!\n"
+                    "Please try again in a moment.",
+                    severity=hou.severityType.Warning
+                )
+            return
 
         if hou.isUIAvailable():
             hou.ui.displayMessage(
@@ -195,12 +388,31 @@ class NetSaveDialog(QtWidgets.QWidget):
         self.close()
 
 def launch() -> None:
-    """Launch GUI, parenting to Houdini main window."""
+    """Launch GUI, parenting to Houdini main window.
+
+    Closing the GUI only hides it, so later launches show the same dialog
+    again.
+    """
+
+    global _dialog
+
+    vault_dir: str = network_saver.utility.get_vault_dir()
+    if _dialog is not None:
+        try:
+            if _dialog.vault_dir == vault_dir:
+                _dialog.reopen()
+                return
+            _dialog.deleteLater()
+        except RuntimeError:
+            # deleted along with Houdini's main window
+            pass
+        _dialog = None
 
     try:
-        widget: NetSaveDialog = NetSaveDialog()
+        widget: NetSaveDialog = NetSaveDialog(root=vault_dir)
     except RuntimeError as err:
         print("Failed to open NetSave dialog:\n{}".format(err))
         return
     widget.setParent(hou.qt.mainWindow(), QtCore.Qt.Window)
     widget.show()
+    _dialog = widget
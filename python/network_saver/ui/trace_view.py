@@ -0,0 +1,111 @@
+"""Contains a GUI summarizing vault operations traced this session."""
+
+import hou
+
+from PySide2 import QtWidgets, QtCore
+
+import network_saver.trace
+
+HEADERS = ('Span', 'Count', 'Total ms', 'Mean ms', 'Max ms', 'Bytes', 'Errors')
+FIELDS = ('name', 'count', 'total_ms', 'mean_ms', 'max_ms', 'bytes', 'errors')
+
+
+class TraceSummaryDialog(QtWidgets.QWidget):
+    """GUI listing traced spans, slowest in total first."""
+    def __init__(self, parent: QtWidgets.QWidget=None) -> None:
+        """Initializes trace summary GUI."""
+
+        super(TraceSummaryDialog, self).__init__(parent)
+
+        self.setWindowTitle('Network Vault Trace')
+
+        layout: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
+
+        self.status_label: QtWidgets.QLabel = QtWidgets.QLabel(self)
+
+        self.table: QtWidgets.QTableWidget = QtWidgets.QTableWidget(self)
+        self.table.setColumnCount(len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(
+            0, QtWidgets.QHeaderView.Stretch
+        )
+
+        buttons: QtWidgets.QHBoxLayout = QtWidgets.QHBoxLayout()
+        self.toggle_button: QtWidgets.QPushButton = QtWidgets.QPushButton(self)
+        self.refresh_button: QtWidgets.QPushButton = \
+            QtWidgets.QPushButton('Refresh', self)
+        self.reset_button: QtWidgets.QPushButton = \
+            QtWidgets.QPushButton('Reset', self)
+        buttons.addWidget(self.toggle_button)
+        buttons.addStretch()
+        buttons.addWidget(self.refresh_button)
+        buttons.addWidget(self.reset_button)
+
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.toggle_button.clicked.connect(self.toggle_tracing)
+        self.refresh_button.clicked.connect(self.refresh)
+        self.reset_button.clicked.connect(self.reset)
+
+        self.refresh()
+
+    def sizeHint(self) -> QtCore.QSize:
+        """GUI dimensions."""
+
+        return QtCore.QSize(720, 400)
+
+    def refresh(self) -> None:
+        """Show spans traced so far."""
+
+        enabled: bool = network_saver.trace.is_enabled()
+        self.status_label.setText(
+            'Tracing to {}'.format(network_saver.trace.get_active_log_file())
+            if enabled else
+            'Tracing is off, set {} or start it here.'.format(
+                network_saver.trace.ENV_VAR
+            )
+        )
+        self.toggle_button.setText('Stop Tracing' if enabled else 'Start Tracing')
+
+        rows: list[dict] = network_saver.trace.summary()
+        self.table.setRowCount(len(rows))
+        for row, summary in enumerate(rows):
+            for column, field in enumerate(FIELDS):
+                value = summary[field]
+                item: QtWidgets.QTableWidgetItem = QtWidgets.QTableWidgetItem(
+                    '{:.2f}'.format(value) if isinstance(value, float)
+                    else str(value)
+                )
+                if column:
+                    item.setTextAlignment(
+                        QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
+                    )
+                self.table.setItem(row, column, item)
+
+    def reset(self) -> None:
+        """Forget spans traced so far."""
+
+        network_saver.trace.reset()
+        self.refresh()
+
+    def toggle_tracing(self) -> None:
+        """Start or stop tracing for the rest of the session."""
+
+        if network_saver.trace.is_enabled():
+            network_saver.trace.disable()
+        else:
+            network_saver.trace.enable()
+        self.refresh()
+
+
+def launch() -> None:
+    """Launch GUI, parenting to Houdini main window."""
+
+    widget: TraceSummaryDialog = TraceSummaryDialog()
+    widget.setParent(hou.qt.mainWindow(), QtCore.Qt.Window)
+    widget.show()
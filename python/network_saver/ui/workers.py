@@ -0,0 +1,150 @@
+"""Background workers keeping slow vault reads off Houdini's UI thread."""
+
+import itertools
+import threading
+
+from PySide2 import QtCore, QtGui
+
+import network_saver.federation
+import network_saver.thumbnails
+
+BATCH_SIZE = 256
+
+
+class LoaderSignals(QtCore.QObject):
+    """Signals emitted by a NetworkLoader, tagged with its generation.
+
+    QRunnable isn't a QObject, so its signals live on a separate object.
+    They are delivered to the receiving widget's thread through queued
+    connections.
+    """
+    users_loaded = QtCore.Signal(int, object)
+    networks_loaded = QtCore.Signal(int, object)
+    networks_listed = QtCore.Signal(int, object)
+    finished = QtCore.Signal(int, int)
+    failed = QtCore.Signal(int, str)
+
+
+class NetworkLoader(QtCore.QRunnable):
+    """Lists users and networks of vault roots, streaming networks in
+       batches.
+
+    Loaders are deleted by the thread pool once run, so results go out
+    through a signals object owned by the caller, and cancellation through
+    an event the caller holds on to.
+    """
+    def __init__(
+            self, signals: LoaderSignals, generation: int, user: str,
+            vault_dirs: list[str], cancelled: threading.Event,
+            list_users: bool=False, stream: bool=True
+        ) -> None:
+        """Initializes loader.
+
+        Args:
+            signals LoaderSignals: Signals to emit results through.
+            generation int: Load this loader belongs to, emitted along with
+                            every result so stale results can be told apart.
+            user string: User whose networks to list.
+            vault_dirs list: Path-like objects representing vault roots to
+                             merge, highest priority first.
+            cancelled threading.Event: Set to stop emitting results.
+            list_users bool: Whether to list the users of the vault first.
+            stream bool: Whether to stream networks in batches followed by
+                         finished, rather than emit them all at once through
+                         networks_listed.
+        """
+
+        super(NetworkLoader, self).__init__()
+
+        self.signals: LoaderSignals = signals
+        self.generation: int = generation
+        self.user: str = user
+        self.vault_dirs: list[str] = vault_dirs
+        self.cancelled: threading.Event = cancelled
+        self.list_users: bool = list_users
+        self.stream: bool = stream
+
+    def run(self) -> None:
+        """List users and networks, emitting results as they come in."""
+
+        try:
+            if self.list_users:
+                users: list[str] = network_saver.federation.list_users(
+                    self.vault_dirs
+                )
+                if self.cancelled.is_set():
+                    return
+                self.signals.users_loaded.emit(self.generation, users)
+
+            data: dict = network_saver.federation.list_networks(
+                user=self.user, vault_dirs=self.vault_dirs
+            )
+            if not self.stream:
+                if not self.cancelled.is_set():
+                    self.signals.networks_listed.emit(self.generation, data)
+                return
+
+            items = iter(data.items())
+            while not self.cancelled.is_set():
+                batch: dict = dict(itertools.islice(items, BATCH_SIZE))
+                if not batch:
+                    break
+                self.signals.networks_loaded.emit(self.generation, batch)
+            if not self.cancelled.is_set():
+                self.signals.finished.emit(self.generation, len(data))
+        except Exception as err:
+            if not self.cancelled.is_set():
+                self.signals.failed.emit(self.generation, str(err))
+
+
+class ThumbnailSignals(QtCore.QObject):
+    """Signals emitted by ThumbnailLoaders."""
+    loaded = QtCore.Signal(object, object)
+
+
+class ThumbnailLoader(QtCore.QRunnable):
+    """Reads, or draws if need be, the thumbnail of a single network."""
+    def __init__(
+            self, signals: ThumbnailSignals, key: tuple, network_name: str,
+            user: str, vault_dir: str
+        ) -> None:
+        """Initializes loader.
+
+        Args:
+            signals ThumbnailSignals: Signals to emit the thumbnail through.
+            key tuple: Emitted along with the thumbnail, identifying it.
+            network_name string: Name of network.
+            user string: User owning network.
+            vault_dir string: Path-like object representing vault root the
+                              network lives in.
+        """
+
+        super(ThumbnailLoader, self).__init__()
+
+        self.signals: ThumbnailSignals = signals
+        self.key: tuple = key
+        self.network_name: str = network_name
+        self.user: str = user
+        self.vault_dir: str = vault_dir
+
+    def run(self) -> None:
+        """Load thumbnail as an image, null if there is none.
+
+        Images, unlike pixmaps, can be made off the UI thread.
+        """
+
+        image: QtGui.QImage = QtGui.QImage()
+        try:
+            data: bytes = network_saver.thumbnails.read_thumbnail(
+                self.network_name, user=self.user, vault_dir=self.vault_dir
+            )
+            if data:
+                image.loadFromData(data, 'PNG')
+        except Exception as err:
+            print('Warning: Could not load thumbnail of ', self.network_name)
+            print(err)
+        try:
+            self.signals.loaded.emit(self.key, image)
+        except RuntimeError:
+            # receiver was deleted while loading
+            pass
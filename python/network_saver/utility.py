@@ -1,12 +1,19 @@
 """Common I/O functions and file read operations."""
 
+import contextlib
 from getpass import getuser
 import io
 import json
 import os
 from pathlib import Path
+import sys
+import threading
 
-import hou
+import network_saver.cache
+import network_saver.journal
+import network_saver.locks
+import network_saver.records
+import network_saver.trace
 
 CATEGORY_MAP = {
     'Shop': 'SHOP',
@@ -24,6 +31,14 @@ CATEGORY_MAP = {
     'Dop': 'DOP'
 }
 
+VAULT_PATH_VAR = 'NETWORK_VAULT_PATH'
+
+# vault roots by config file, with the stamp they were read at
+_VAULT_DIRS = dict()
+
+# user folders whose networks were given records this session
+_MIGRATED = set()
+
 
 def remap_node_categories(category_name: str) -> str:
     """Remap node type categories to naming convention used by CPIO files.
@@ -60,25 +75,88 @@ def get_data_dir() -> str:
     return os.path.join(cur_dir.parents[2], 'data')
 
 
-def get_vault_dir() -> str:
-    """Fetch vault directory from text file containing it.
+def _resolve_vault_path(vault_path: str) -> str:
+    """Resolve vault location given in config, relative to the project.
 
+    Args:
+        vault_path string: Vault location as configured.
     Returns:
-        str: First line in vault_dir.txt, ideally pointing to root vault 
-             vault directory.
+        str: Path-like object representing vault location.
+    """
+
+    path: Path = Path(vault_path)
+    if path.is_absolute():
+        return str(path)
+    cur_dir: Path = Path(__file__)
+    project_dir: str = cur_dir.parents[2]
+    return os.path.join(project_dir, str(path))
+
+
+def get_vault_dirs() -> list[str]:
+    """Fetch vault roots, highest priority first.
+
+    Roots listed in $NETWORK_VAULT_PATH, separated like $PATH, come first,
+    followed by every line of vault_dir.txt, so a show can put its own vault
+    ahead of the studio library and a local scratch vault. The first root is
+    the one networks are saved to. Roots are parsed once and only re-read
+    once the variable or file changes.
+
+    Returns:
+        list: Path-like objects representing vault roots.
     """
 
     vault_file: str = os.path.join(
         get_data_dir(),
         'vault_dir.txt'
     )
-    with open(vault_file, 'r') as f:
-        vault_path: Path = Path(f.readline().strip())
-    if vault_path.is_absolute():
-        return str(vault_path)
-    cur_dir: Path = Path(__file__)
-    project_dir: str = cur_dir.parents[2]
-    return os.path.join(project_dir, str(vault_path))
+    env_path: str = os.getenv(VAULT_PATH_VAR, '')
+    stamp: tuple = (env_path, get_file_stamp(vault_file))
+    cached: tuple = _VAULT_DIRS.get(vault_file)
+    if cached is not None and stamp[1] is not None and cached[0] == stamp:
+        return list(cached[1])
+
+    lines: list[str] = env_path.split(os.pathsep)
+    with network_saver.trace.span('utility.get_vault_dirs'):
+        try:
+            with open(vault_file, 'r') as f:
+                lines.extend(f.read().splitlines())
+        except FileNotFoundError:
+            pass
+
+    vault_dirs: list[str] = list()
+    seen: set[str] = set()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        vault_dir: str = _resolve_vault_path(line)
+        key: str = os.path.normcase(os.path.normpath(vault_dir))
+        if key not in seen:
+            seen.add(key)
+            vault_dirs.append(vault_dir)
+    if not vault_dirs:
+        raise RuntimeError(
+            'No vault configured in {} or ${}'.format(vault_file, VAULT_PATH_VAR)
+        )
+
+    _VAULT_DIRS[vault_file] = (stamp, vault_dirs)
+    return list(vault_dirs)
+
+
+def invalidate_vault_dirs() -> None:
+    """Force vault roots to be re-read on next use."""
+
+    _VAULT_DIRS.clear()
+
+
+def get_vault_dir() -> str:
+    """Fetch primary vault directory, the one networks are saved to.
+
+    Returns:
+        str: Path-like object representing highest priority vault root.
+    """
+
+    return get_vault_dirs()[0]
 
 
 def get_user_dir(user: str=None, vault_dir: str=None) -> str:
@@ -106,7 +184,110 @@ def get_vault_file(user=None, vault_dir=None) -> str:
     return os.path.join(user_dir, vault_name)
 
 
-def get_node_context(node: hou.Node) -> str:
+def get_internal_dir(vault_dir: str=None) -> str:
+    """Fetch directory holding vault-wide bookkeeping files.
+
+    Lives under the vault root but is hidden so it is never mistaken for a
+    user directory.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        str: Path-like object representing internal vault directory.
+    """
+
+    vault_dir: str = vault_dir or get_vault_dir()
+    return os.path.join(vault_dir, '.netvault')
+
+
+def get_file_stamp(filepath: str) -> str:
+    """Fetch modification time and size of given file.
+
+    Args:
+        filepath string: Path-like object representing file to stamp.
+    Returns:
+        str: Modification time and size of given file, or None if it does
+             not exist.
+    """
+
+    try:
+        stat: os.stat_result = os.stat(filepath)
+    except OSError:
+        return None
+    return '{}:{}'.format(stat.st_mtime_ns, stat.st_size)
+
+
+def get_vault_settings(vault_dir: str=None) -> dict:
+    """Read settings of given vault, such as how network files are stored.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        dict: Contents of vault's settings.json, empty if there is none.
+    """
+
+    settings_file: str = os.path.join(
+        get_internal_dir(vault_dir), 'settings.json'
+    )
+    try:
+        with open(settings_file, 'r') as settings_f:
+            return json.load(settings_f)
+    except FileNotFoundError:
+        return dict()
+
+
+def get_vault_stamp(vault_file: str) -> str:
+    """Fetch cheap change stamp of given vault json and its journal.
+
+    Args:
+        vault_file string: Path-like object representing vault json.
+    Returns:
+        str: Modification times and sizes of given file and its journal, or
+             None if the vault json does not exist.
+    """
+
+    stamp: str = get_file_stamp(vault_file)
+    if stamp is None:
+        return None
+    journal_stamp: str = get_file_stamp(
+        network_saver.journal.get_journal_file(vault_file)
+    )
+    return '{}|{}'.format(stamp, journal_stamp)
+
+
+def is_user_dir(folder: str, vault_dir: str=None) -> bool:
+    """Ensure given vault entry is a user directory containing network json.
+
+    Args:
+        folder string: Name of file/folder present in vault dir.
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        bool: Value representing validation status.
+    """
+
+    if folder.startswith('.'):
+        return False
+    return os.path.isfile(get_vault_file(user=folder, vault_dir=vault_dir))
+
+
+def list_user_dirs(vault_dir: str=None) -> list[str]:
+    """Scan vault directory for users with saved networks.
+
+    Args:
+        vault_dir string: Path-like object representing vault location.
+    Returns:
+        list: Sorted names of valid user directories.
+    """
+
+    vault_dir: str = vault_dir or get_vault_dir()
+    with network_saver.trace.span('utility.list_user_dirs', path=vault_dir):
+        return sorted(
+            folder for folder in os.listdir(vault_dir)
+            if is_user_dir(folder, vault_dir=vault_dir)
+        )
+
+
+def get_node_context(node: 'hou.Node') -> str:
     """Get network category of given node.
     
     Args:
@@ -118,7 +299,7 @@ def get_node_context(node: hou.Node) -> str:
     return remap_node_categories(node.type().category().name())
 
 
-def get_network_context(node: hou.Node) -> str:
+def get_network_context(node: 'hou.Node') -> str:
     """Get child network category of given node.
 
     Args:
@@ -126,7 +307,7 @@ def get_network_context(node: hou.Node) -> str:
     Returns: Remapped category of internal network of given node.
     """
 
-    category: hou.NodeTypeCategory = node.type().childTypeCategory()
+    category: 'hou.NodeTypeCategory' = node.type().childTypeCategory()
     if not category:
         return get_node_context(node)
     return remap_node_categories(category.name())
@@ -141,22 +322,42 @@ def _make(config_file: str) -> None:
     """
 
     user_dir: str = os.path.dirname(config_file)
-    if not os.path.isdir(user_dir):
-        os.makedirs(user_dir, mode=0o644)
-    with open(config_file, 'x') as config_f:
-        json.dump(dict(), config_f)
+    os.makedirs(user_dir, mode=0o644, exist_ok=True)
+    try:
+        with open(config_file, 'x') as config_f:
+            json.dump(dict(), config_f)
+    except FileExistsError:
+        # another session made it first
+        pass
+
+
+def is_ui_available() -> bool:
+    """Check whether running inside an interactive Houdini session.
+
+    Never imports hou itself, so vault I/O keeps working in plain Python.
+
+    Returns:
+        bool: Whether Houdini's UI can be used to notify the user.
+    """
+
+    hou = sys.modules.get('hou')
+    return hou is not None and hou.isUIAvailable()
 
 
 def _notify(config_file: str) -> None:
     """Notify user that no vault json currently exists.
-    
+
+    Houdini's UI may only be used from the main thread, so background reads
+    just raise, leaving it to whoever receives the error to notify the user.
+
     Args:
         config_file string: Path-like object representing vault json that
                             should exist but doesn't.
     """
 
-    if hou.isUIAvailable():
-        hou.ui.displayMessage(
+    if is_ui_available() and \
+            threading.current_thread() is threading.main_thread():
+        sys.modules['hou'].ui.displayMessage(
             "No networks available to load!\n"
             "Please first save a network using the network saver tool."
         )
@@ -167,7 +368,13 @@ def _notify(config_file: str) -> None:
 
 def read_network_vault(filepath: str, mode: str) -> dict:
     """Read contents of vault json to dict.
-    
+
+    Any changes recorded in the vault json's journal are folded over it. A
+    vault json that is missing or can't be read is rebuilt from the network
+    records beside it, if there are any.
+    Parsed contents are cached for the rest of the session and re-used for
+    as long as the file's modification time and size stay the same.
+
     Args:
         filepath string: Path-like object representing vault json to read.
         mode string: Determines how to react in the event that the file does
@@ -186,19 +393,141 @@ def read_network_vault(filepath: str, mode: str) -> dict:
     func: function = func_map.get(mode)
     if not func:
         raise ValueError("Invalid filemode {}".format(mode))
-    if not os.path.isfile(filepath):
+    stamp: str = get_vault_stamp(filepath)
+    if stamp is None:
+        data: dict = _rebuild_from_records(filepath)
+        if data:
+            return data
         func(filepath)
         return dict()
-    try:
-        with open(filepath, 'r') as config_f:
-            data: dict = json.load(config_f)
-    except (Exception, io.UnsupportedOperation) as err:
-        data: dict = dict()
-        print('Warning: Could not load config json at ', filepath)
-        print(err)
+    data: dict = network_saver.cache.VAULT_CACHE.get(filepath, stamp)
+    if data is not None:
+        return data
+    with network_saver.trace.span(
+        'utility.read_network_vault', path=filepath
+    ) as span:
+        try:
+            with open(filepath, 'r') as config_f:
+                data: dict = json.load(config_f)
+                size: int = config_f.tell()
+            network_saver.journal.fold(filepath, data)
+        except (Exception, io.UnsupportedOperation) as err:
+            print('Warning: Could not load config json at ', filepath)
+            print(err)
+            data: dict = _rebuild_from_records(filepath)
+        else:
+            network_saver.cache.VAULT_CACHE.put(filepath, stamp, data)
+            if span:
+                span.add(bytes=size, networks=len(data))
     return data
 
 
+def _rebuild_from_records(filepath: str) -> dict:
+    """Rewrite vault json from the network records beside it.
+
+    Args:
+        filepath string: Path-like object representing vault json that is
+                         missing or can't be read.
+    Returns:
+        dict: Map of saved networks to their relevant data, empty if there
+              are no records to rebuild from.
+    """
+
+    data: dict = network_saver.records.read_records(os.path.dirname(filepath))
+    if data:
+        print('Rebuilding ', filepath, ' from network records')
+        write_network_vault(filepath, data)
+    return data
+
+
+def write_network_vault(filepath: str, data: dict) -> None:
+    """Replace contents of vault json with given dict, keeping the vault
+       cache current.
+
+    Meant for wholesale rewrites, single changes should go through
+    append_network_record instead.
+
+    Args:
+        filepath string: Path-like object representing vault json to write.
+        data dict: Map of saved networks to their relevant data.
+    """
+
+    # stamped before releasing the lock, so the cached data can't be
+    # stamped with a record appended after it
+    with network_saver.journal.lock(filepath):
+        with network_saver.trace.span(
+            'utility.write_network_vault', path=filepath
+        ) as span:
+            network_saver.journal.write_snapshot(filepath, data)
+            network_saver.journal.reset(filepath)
+            if span:
+                span.add(bytes=os.path.getsize(filepath), networks=len(data))
+        network_saver.cache.VAULT_CACHE.put(
+            filepath, get_vault_stamp(filepath), data
+        )
+
+
+def _get_journal_size(stamp: str) -> int:
+    """Fetch size of journal given vault stamp was taken at.
+
+    Args:
+        stamp string: Change stamp of vault json.
+    Returns:
+        int: Size of journal, 0 if there was none.
+    """
+
+    journal_stamp: str = stamp.rsplit('|', 1)[1]
+    if journal_stamp == 'None':
+        return 0
+    return int(journal_stamp.rsplit(':', 1)[1])
+
+
+def append_network_record(filepath: str, record: dict) -> tuple[str]:
+    """Record single change to vault json by appending it to its journal.
+
+    Cached data of the vault json is only updated in place when the record
+    is the sole change made between both stamps. Changes appended by other
+    sessions in the meantime would otherwise be missing from it, under a
+    stamp that keeps it looking current, so it is dropped instead.
+
+    Args:
+        filepath string: Path-like object representing vault json.
+        record dict: Journal record describing the change.
+    Returns:
+        str: Change stamp of vault json prior to the change.
+        str: Change stamp of vault json after the change.
+    """
+
+    stamp: str = get_vault_stamp(filepath)
+    with network_saver.trace.span(
+        'utility.append_network_record', path=filepath
+    ):
+        offset, size = network_saver.journal.append(filepath, record)
+    new_stamp: str = get_vault_stamp(filepath)
+
+    if stamp is None or new_stamp is None or offset is None or \
+            stamp.split('|')[0] != new_stamp.split('|')[0] or \
+            _get_journal_size(stamp) != offset or \
+            _get_journal_size(new_stamp) != size:
+        invalidate_vault_cache(filepath)
+    else:
+        network_saver.cache.VAULT_CACHE.update(
+            filepath, stamp, new_stamp,
+            lambda data: network_saver.journal.apply(data, record)
+        )
+    return stamp, new_stamp
+
+
+def invalidate_vault_cache(filepath: str=None) -> None:
+    """Force given vault json, or every vault json, to be re-read from disk.
+
+    Args:
+        filepath string: Path-like object representing vault json.
+    """
+
+    network_saver.cache.VAULT_CACHE.invalidate(filepath)
+
+
 def read_user_data(user: str=None, vault_dir: str=None) -> dict:
     """Read network vault data for given user.
     
@@ -215,40 +544,297 @@ def read_user_data(user: str=None, vault_dir: str=None) -> dict:
     return read_network_vault(vault_file, 'r')
 
 
-def delete_network_data(
+def _ensure_records(vault_file: str) -> None:
+    """Write records for networks saved before records existed, once per
+       session for each user.
+
+    Args:
+        vault_file string: Path-like object representing user's vault json.
+    """
+
+    user_dir: str = os.path.dirname(vault_file)
+    if user_dir in _MIGRATED:
+        return
+    if os.path.isfile(vault_file):
+        with network_saver.trace.span(
+            'utility.migrate_records', path=user_dir
+        ) as span:
+            count: int = network_saver.records.migrate(
+                user_dir, read_network_vault(vault_file, 'r')
+            )
+            if span:
+                span.add(networks=count)
+    _MIGRATED.add(user_dir)
+
+
+def migrate_records(user: str=None, vault_dir: str=None) -> int:
+    """Write records for networks of given user that have none yet.
+
+    Each network is locked while its record is written, so records saved
+    by other sessions in the meantime are left alone.
+
+    Args:
+        user str: User whose networks to migrate.
+        vault_dir str: Path-like object representing vault location.
+    Returns:
+        int: Number of records written.
+    """
+
+    user_dir: str = get_user_dir(user=user, vault_dir=vault_dir)
+    missing: set[str] = set(read_user_data(user=user, vault_dir=vault_dir)) - \
+        set(network_saver.records.list_records(user_dir))
+    count: int = 0
+    for network_name in sorted(missing):
+        with lock_network(network_name, user=user, vault_dir=vault_dir):
+            # saved or removed by another session in the meantime
+            if network_saver.records.read_record(
+                user_dir, network_name
+            ) is not None:
+                continue
+            network_data: dict = get_network_data(
+                network_name, user=user, vault_dir=vault_dir
+            )
+            if network_data is None:
+                continue
+            network_saver.records.write_record(
+                user_dir, network_name, network_data
+            )
+            count += 1
+    _MIGRATED.add(user_dir)
+    return count
+
+
+def get_network_data(
         network_name: str, user: str=None, vault_dir: str=None
+    ) -> dict:
+    """Read data of single network, without reading the rest of the vault.
+
+    Args:
+        network_name str: Network to read.
+        user str: User owning network.
+        vault_dir str: Path-like object representing vault location.
+    Returns:
+        dict: Map of relevant network data, or None if no such network is
+              saved.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or get_vault_dir()
+    network_data: dict = network_saver.records.read_record(
+        get_user_dir(user=user, vault_dir=vault_dir), network_name
+    )
+    if network_data is not None:
+        return network_data
+    # not migrated yet
+    vault_file: str = get_vault_file(user=user, vault_dir=vault_dir)
+    if not os.path.isfile(vault_file):
+        return None
+    return read_network_vault(vault_file, 'r').get(network_name)
+
+
+def rebuild_user_data(user: str=None, vault_dir: str=None) -> dict:
+    """Rewrite vault json of given user from their network records.
+
+    Args:
+        user str: User to rebuild vault json of.
+        vault_dir str: Path-like object representing vault location.
+    Returns:
+        dict: Map of saved networks to their relevant data.
+    """
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or get_vault_dir()
+    vault_file: str = get_vault_file(user=user, vault_dir=vault_dir)
+    data: dict = network_saver.records.read_records(os.path.dirname(vault_file))
+    write_network_vault(vault_file, data)
+    return data
+
+
+def lock_network(
+        network_name: str, user: str=None, vault_dir: str=None,
+        timeout: float=network_saver.locks.LOCK_TIMEOUT
+    ) -> network_saver.locks.FileLock:
+    """Fetch lock guarding given network's record and CPIO file.
+
+    Hold it across every write making up one change to a network, such as
+    writing its CPIO file and then its record.
+
+    Args:
+        network_name str: Network to lock.
+        user str: User owning network.
+        vault_dir str: Path-like object representing vault location.
+        timeout float: Seconds to wait for the lock.
+    Returns:
+        FileLock: Lock, acquired by using it as a context manager.
+    """
+
+    user_dir: str = get_user_dir(user=user, vault_dir=vault_dir)
+    os.makedirs(user_dir, exist_ok=True)
+    return network_saver.locks.FileLock(
+        network_saver.records.get_record_file(user_dir, network_name),
+        timeout=timeout
+    )
+
+
+def put_network_data(
+        network_name: str, network_data: dict, user: str=None,
+        vault_dir: str=None, generation: int=None
+    ) -> dict:
+    """Add or replace given network's record and its entry in vault json.
+
+    Args:
+        network_name str: Network to add.
+        network_data dict: Map of relevant network data, including Houdini
+                           version, category, and description.
+        user str: User whose vault to add network to.
+        vault_dir str: Path-like object representing vault location.
+        generation int: Generation of the network the caller read before
+                        deciding to save it, 0 if it wasn't saved. Raises
+                        ConflictError if it changed since. Not checked if
+                        not given.
+    Returns:
+        dict: Network data as saved, with its new generation.
+    """
+
+    # the catalog pulls in sqlite, deferred until something is written
+    import network_saver.catalog
+
+    user: str = user or getuser()
+    vault_dir: str = vault_dir or get_vault_dir()
+
+    vault_file: str = get_vault_file(user=user, vault_dir=vault_dir)
+    _ensure_records(vault_file)
+    if not os.path.isfile(vault_file):
+        _make(vault_file)
+
+    with lock_network(network_name, user=user, vault_dir=vault_dir):
+        current: dict = get_network_data(
+            network_name, user=user, vault_dir=vault_dir
+        )
+        if generation is not None:
+            network_saver.locks.check_generation(current, generation)
+        network_data: dict = dict(
+            network_data,
+            generation=network_saver.locks.get_generation(current) + 1
+        )
+        network_saver.records.write_record(
+            os.path.dirname(vault_file), network_name, network_data
+        )
+        stamp, _new_stamp = append_network_record(
+            vault_file,
+            network_saver.journal.put_record(network_name, network_data)
+        )
+
+    network_saver.catalog.put_network(
+        network_name, network_data, user=user, vault_dir=vault_dir,
+        stamp=stamp
+    )
+    return network_data
+
+
+def delete_network_data(
+        network_name: str, user: str=None, vault_dir: str=None,
+        generation: int=None
     ) -> None:
-    """Delete given network's entry from vault json.
+    """Delete given network's entry from vault json and its record.
     
     Args:
         network_name str: Network to remove.
         user str: User whose vault to remove network from.
         vault_dir str: Path-like object representing vault location.
+        generation int: Generation of the network the caller read before
+                        deciding to remove it. Raises ConflictError if it
+                        was saved over since. Not checked if not given.
     """
 
+    delete_networks_data(
+        [network_name], user=user, vault_dir=vault_dir,
+        generations={network_name: generation}
+    )
+
+
+def delete_networks_data(
+        network_names: list[str], user: str=None, vault_dir: str=None,
+        generations: dict=None
+    ) -> None:
+    """Delete entries of given networks from vault json and their records,
+       as a single change.
+
+    Args:
+        network_names list: Networks to remove.
+        user str: User whose vault to remove networks from.
+        vault_dir str: Path-like object representing vault location.
+        generations dict: Map of networks to the generation the caller read
+                          before deciding to remove them. Raises
+                          ConflictError, removing none of them, if any was
+                          saved over since. Networks not in it, or mapped to
+                          None, aren't checked.
+    """
+
+    import network_saver.catalog
+
+    network_names: list[str] = list(dict.fromkeys(network_names))
+    if not network_names:
+        return
     user: str = user or getuser()
     vault_dir: str = vault_dir or get_vault_dir()
+    generations: dict = generations or dict()
 
     vault_file: str = get_vault_file(
         user=user, vault_dir=vault_dir
     )
-    data: dict = read_network_vault(vault_file, 'r')
+    if not os.path.isfile(vault_file):
+        _notify(vault_file)
+    _ensure_records(vault_file)
+
+    with contextlib.ExitStack() as locks:
+        # always locked in the same order, so sessions removing overlapping
+        # networks can't deadlock
+        for network_name in sorted(network_names):
+            locks.enter_context(
+                lock_network(network_name, user=user, vault_dir=vault_dir)
+            )
+            if generations.get(network_name) is None:
+                continue
+            current: dict = get_network_data(
+                network_name, user=user, vault_dir=vault_dir
+            )
+            # removing a network that's already gone is harmless, which we
+            # want anyway
+            if current is not None:
+                network_saver.locks.check_generation(
+                    current, generations[network_name]
+                )
+
+        deletes: list[dict] = [
+            network_saver.journal.delete_record(network_name)
+            for network_name in network_names
+        ]
+        stamp, _new_stamp = append_network_record(
+            vault_file,
+            deletes[0] if len(deletes) == 1 else
+            network_saver.journal.batch_record(deletes)
+        )
+        # after the vault json, so a session dying in between never leaves a
+        # listed network without a record
+        for network_name in network_names:
+            network_saver.records.remove_record(
+                os.path.dirname(vault_file), network_name
+            )
 
-    # update network data
-    try:
-        data.pop(network_name)
-    except KeyError:
-        # assume it's already gone somehow, which we want anyway
-        pass
-    with open(vault_file, 'w') as vault_f:
-        json.dump(data, vault_f)
+    network_saver.catalog.delete_networks(
+        network_names, user=user, vault_dir=vault_dir, stamp=stamp
+    )
 
 
 def remove_cpio_file(
         network_name: str, user: str=None, vault_dir: str=None
     ) -> None:
     """Remove given network's CPIO file from vault location.
-    
+
+    Leaves the network's entry in vault json and the catalog alone, which
+    delete_networks_data removes along with its record.
+
     Args:
         network_name str: Network to remove.
         user str: User whose vault to remove network from.
@@ -264,4 +850,8 @@ def remove_cpio_file(
     if not os.path.isfile(full_path):
         print("Unable to remove ", full_path, ": Does not exist!")
         return
-    os.remove(full_path)
+    with lock_network(network_name, user=user, vault_dir=vault_dir), \
+            network_saver.trace.span(
+                'utility.remove_cpio_file', path=full_path
+            ):
+        os.remove(full_path)
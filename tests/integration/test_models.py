@@ -0,0 +1,154 @@
+import sys
+import unittest
+
+from PySide2 import QtWidgets, QtCore
+
+from network_saver.ui.models import *
+
+
+def _make_networks(count):
+    return {
+        "network_{}".format(index): {
+            "context": "SOP" if index % 2 else "OBJ",
+            "notes": "notes {}".format(index),
+            "version": "20.0.{}".format(index)
+        } for index in range(count)
+    }
+
+
+class TestNetworkTableModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(
+            sys.argv
+        )
+
+    def setUp(self):
+        self.model = NetworkTableModel()
+        self.model.set_networks(_make_networks(FETCH_SIZE + 10))
+
+    def test_fetch_more(self):
+        self.assertEqual(self.model.network_count(), FETCH_SIZE + 10)
+        self.assertEqual(self.model.rowCount(), FETCH_SIZE)
+        self.assertTrue(self.model.canFetchMore(QtCore.QModelIndex()))
+        self.model.fetchMore(QtCore.QModelIndex())
+        self.assertEqual(self.model.rowCount(), FETCH_SIZE + 10)
+        self.assertFalse(self.model.canFetchMore(QtCore.QModelIndex()))
+
+    def test_append_networks(self):
+        model = NetworkTableModel()
+        model.append_networks(_make_networks(FETCH_SIZE - 1))
+        self.assertEqual(model.rowCount(), FETCH_SIZE - 1)
+        model.append_networks({"network_x": {"context": "SOP"}})
+        model.append_networks({"network_y": {"context": "SOP"}})
+        # rows past the first page wait to be fetched
+        self.assertEqual(model.rowCount(), FETCH_SIZE)
+        self.assertEqual(model.network_count(), FETCH_SIZE + 1)
+
+    def test_data(self):
+        self.assertEqual(self.model.columnCount(), 4)
+        index = self.model.index(1, 0)
+        self.assertEqual(index.data(QtCore.Qt.UserRole), "network_1")
+        self.assertEqual(self.model.index(1, 2).data(QtCore.Qt.UserRole), "SOP")
+        self.assertEqual(self.model.index(1, 3).data(), "notes 1")
+        self.assertFalse(self.model.flags(index) & QtCore.Qt.ItemIsEditable)
+
+    def test_sort(self):
+        self.model.sort(1, QtCore.Qt.DescendingOrder)
+        # versions sort numerically, not alphabetically
+        self.assertEqual(self.model.network_name(0), "network_{}".format(
+            FETCH_SIZE + 9
+        ))
+        self.model.set_networks(_make_networks(12))
+        self.assertEqual(self.model.network_name(0), "network_11")
+        self.model.sort(-1)
+        self.model.set_networks(_make_networks(12))
+        self.assertEqual(self.model.network_name(0), "network_0")
+
+
+class TestUpdateNetworks(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(
+            sys.argv
+        )
+
+    def setUp(self):
+        self.model = NetworkTableModel()
+        self.model.set_networks(_make_networks(5))
+        self.inserted = list()
+        self.removed = list()
+        self.changed = list()
+        self.model.rowsInserted.connect(
+            lambda parent, first, last: self.inserted.append((first, last))
+        )
+        self.model.rowsRemoved.connect(
+            lambda parent, first, last: self.removed.append((first, last))
+        )
+        self.model.dataChanged.connect(
+            lambda first, last, roles=None: self.changed.append(first.row())
+        )
+        self.resets = list()
+        self.model.modelReset.connect(lambda: self.resets.append(True))
+
+    def test_row_level(self):
+        data = _make_networks(5)
+        del data["network_1"]
+        del data["network_2"]
+        data["network_4"]["notes"] = "new notes"
+        data["network_5"] = {"context": "DOP"}
+        self.model.update_networks(data)
+
+        self.assertEqual(self.removed, [(1, 2)])
+        self.assertEqual(self.changed, [2])
+        self.assertEqual(self.inserted, [(3, 3)])
+        self.assertEqual(
+            [self.model.network_name(row) for row in range(4)],
+            ["network_0", "network_3", "network_4", "network_5"]
+        )
+        self.assertEqual(self.model.index(2, 3).data(), "new notes")
+        self.assertFalse(self.resets)
+
+    def test_sorted_insert(self):
+        self.model.sort(0, QtCore.Qt.DescendingOrder)
+        data = _make_networks(5)
+        data["network_2a"] = {"context": "DOP"}
+        self.model.update_networks(data)
+        self.assertEqual(self.inserted, [(2, 2)])
+        self.assertEqual(self.model.network_name(2), "network_2a")
+        self.assertFalse(self.resets)
+
+
+class TestNetworkFilterModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(
+            sys.argv
+        )
+
+    def setUp(self):
+        self.model = NetworkTableModel()
+        self.model.set_networks(_make_networks(5))
+        self.proxy = NetworkFilterModel()
+        self.proxy.setSourceModel(self.model)
+
+    def test_set_names(self):
+        self.assertEqual(self.proxy.rowCount(), 5)
+        self.proxy.set_names({"network_1", "network_3"})
+        self.assertEqual(self.proxy.rowCount(), 2)
+        self.assertEqual(
+            self.proxy.index(1, 0).data(QtCore.Qt.UserRole), "network_3"
+        )
+        self.proxy.set_names(None)
+        self.assertEqual(self.proxy.rowCount(), 5)
+
+    def test_sort(self):
+        self.proxy.sort(0, QtCore.Qt.DescendingOrder)
+        self.assertEqual(self.proxy.index(0, 0).data(), "network_4")
+
+
+if __name__ == '__main__':
+    unittest.main()
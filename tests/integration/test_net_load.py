@@ -5,18 +5,19 @@ from pathlib import Path
 from shutil import copy as shcopy
 import sys
 import unittest
+from unittest import mock
 
 import hou
 from PySide2 import QtWidgets, QtCore
 
+from network_saver.ui import net_load
 from network_saver.ui.net_load import NetLoadDialog
 from network_saver.utility import *
 
 def _add_network(file, name, data):
     network_data = read_network_vault(file, 'r')
     network_data.update({name: data})
-    with open(file, 'w') as f:
-        json.dump(network_data, f)
+    write_network_vault(file, network_data)
 
 def _remove_network(file, name):
     network_data = read_network_vault(file, 'r')
@@ -24,8 +25,7 @@ def _remove_network(file, name):
         network_data.pop(name)
     except KeyError:
         pass
-    with open(file, 'w') as f:
-        json.dump(network_data, f)
+    write_network_vault(file, network_data)
 
 class TestNetLoad(unittest.TestCase):
 
@@ -51,8 +51,7 @@ class TestNetLoad(unittest.TestCase):
             "notes": "notes C",
             "version": "20.0.506"
         }})
-        with open(cls.vault_file, 'w') as f:
-            json.dump(data, f)
+        write_network_vault(cls.vault_file, data)
         src = os.path.join(vault_dir, cls.user, "network_A.cpio")
         dst = os.path.join(vault_dir, cls.user, "network_C.cpio")
         shcopy(src, dst)
@@ -61,6 +60,7 @@ class TestNetLoad(unittest.TestCase):
             sys.argv
         )
         cls.dialog = NetLoadDialog(user=cls.user, root=vault_dir)
+        cls.dialog.wait_for_load()
     
     def test_get_current_selection(self):
 
@@ -102,6 +102,44 @@ class TestNetLoad(unittest.TestCase):
         self.assertIsNotNone(netbox)
         self.assertEqual(network_name, netbox.comment())
 
+    def test_load_network_clipboard(self):
+        self.dialog.table_view.selectRow(0)
+        network_name = self.dialog.get_network_data()[0]
+        with mock.patch.object(net_load, "LOAD_ITEMS", False):
+            self.dialog.load_network(root_network=hou.node('obj'))
+
+        self.assertEqual(len(hou.selectedNodes()), 1)
+        netbox = hou.selectedNodes()[0].parentNetworkBox()
+        self.assertEqual(network_name, netbox.comment())
+
+    def test_load_networks(self):
+        model = self.dialog.table_view.model()
+        selection = self.dialog.table_view.selectionModel()
+        selection.clearSelection()
+        for row in (2, 0):
+            selection.select(
+                model.index(row, 0),
+                QtCore.QItemSelectionModel.Select | QtCore.QItemSelectionModel.Rows
+            )
+        networks = self.dialog.get_selected_networks()
+        self.assertEqual(networks, [("network_A", "OBJ"), ("network_C", "OBJ")])
+
+        root = hou.node('obj').createNode('subnet')
+        self.dialog.load_network(root_network=root)
+
+        netboxes = {netbox.comment(): netbox for netbox in root.networkBoxes()}
+        netbox_a = netboxes["network_A"]
+        netbox_c = netboxes["network_C"]
+        # laid out side by side
+        self.assertLess(
+            netbox_a.position()[0] + netbox_a.size()[0], netbox_c.position()[0]
+        )
+        # and undone in one go
+        hou.undos.performUndo()
+        self.assertNotIn(
+            "network_C", [netbox.comment() for netbox in root.networkBoxes()]
+        )
+
     def test_refresh_networks(self):
         self.assertEqual(self.dialog.table_model.rowCount(), 3)
         network_name = "network_D"
@@ -116,6 +154,38 @@ class TestNetLoad(unittest.TestCase):
         self.assertEqual(self.dialog.table_model.rowCount(), 4)
         _remove_network(self.vault_file, network_name)
 
+    def test_background_load(self):
+        # a second load cancels the first, whose rows are never added
+        self.dialog._start_load()
+        self.dialog._start_load()
+        self.assertTrue(self.dialog.is_loading())
+        self.assertTrue(self.dialog.wait_for_load())
+        self.assertEqual(self.dialog.table_model.rowCount(), 3)
+        self.assertEqual(self.dialog.user_combobox.currentText(), self.user)
+
+    def test_reopen(self):
+        # changes made while hidden are picked up in place when reopened
+        self.dialog.hide()
+        network_name = "network_E"
+        _add_network(self.vault_file, network_name, {
+            "context": "SOP",
+            "notes": "notes E",
+            "version": "20.0.506"
+        })
+        self.dialog.reopen()
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        while (
+                self.dialog.table_model.rowCount() != 4
+                and timer.elapsed() < 10000
+            ):
+            QtCore.QCoreApplication.processEvents()
+        self.assertTrue(self.dialog.isVisible())
+        self.assertEqual(self.dialog.table_model.rowCount(), 4)
+        _remove_network(self.vault_file, network_name)
+        self.dialog.refresh_networks()
+        self.dialog.hide()
+
     def test_get_network_data(self):
 
         self.dialog.table_view.selectRow(1)
@@ -4,10 +4,12 @@ import json
 import shutil
 import sys
 import unittest
+from unittest import mock
 
 import hou
 from PySide2 import QtWidgets
 
+from network_saver.ui import net_save
 from network_saver.ui.net_save import NetSaveDialog
 from network_saver.utility import *
 
@@ -114,14 +116,42 @@ class TestNetSave(unittest.TestCase):
         _head, tail = os.path.splitext(vault_file)
         self.assertEqual(tail, ".json")
 
-        with open(vault_file, 'r') as f:
-            data = json.load(f)
+        # saves are journaled, so read back through the vault reader
+        data = read_network_vault(vault_file, 'r')
 
-            self.assertIn(conformed_name, data)
-            network_data = data[conformed_name]
-            self.assertEqual(network_data["notes"], notes)
-            self.assertEqual(network_data["context"], context)
-            self.assertEqual(network_data["version"], version)
+        self.assertIn(conformed_name, data)
+        network_data = data[conformed_name]
+        self.assertEqual(network_data["notes"], notes)
+        self.assertEqual(network_data["context"], context)
+        self.assertEqual(network_data["version"], version)
+
+    def test_save_network_clipboard(self):
+        network_name = "clipboard_name"
+        clipboard_file = os.path.join(
+            os.getenv("HOUDINI_TEMP_DIR"),
+            get_node_context(self.selection[0]) + "_copy.cpio"
+        )
+        if os.path.isfile(clipboard_file):
+            os.remove(clipboard_file)
+
+        # saved straight to the vault, the clipboard is left alone
+        self.dialog.title_edit.setPlainText(network_name)
+        self.dialog.save_network()
+        self.assertEqual(
+            os.path.isfile(clipboard_file), not net_save.SAVE_ITEMS
+        )
+
+        # and the clipboard is used where that isn't possible
+        with mock.patch.object(net_save, "SAVE_ITEMS", False):
+            self.dialog.title_edit.setPlainText(network_name + "_2")
+            self.dialog.save_network()
+        self.assertTrue(os.path.isfile(clipboard_file))
+
+        vault_dir = get_user_dir(user=self.user)
+        for name in (network_name, network_name + "_2"):
+            self.assertTrue(
+                os.path.isfile(os.path.join(vault_dir, name + ".cpio"))
+            )
 
     @classmethod
     def tearDownClass(cls):
@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.generate import CATEGORIES, generate_vault
+from benchmarks.run import compare, run
+from network_saver.cpio import CpioReader
+from network_saver.utility import list_user_dirs, read_user_data
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_generate_vault(self):
+        vault = generate_vault(
+            self.tmp_dir, users=2, networks=5, cpio_size=4096, seed=1
+        )
+        self.assertEqual(sorted(list_user_dirs(self.tmp_dir)), sorted(vault))
+        for user, data in vault.items():
+            self.assertEqual(read_user_data(user, self.tmp_dir), data)
+            for network_name in data:
+                cpio_file = os.path.join(
+                    self.tmp_dir, user, network_name + ".cpio"
+                )
+                self.assertGreaterEqual(os.path.getsize(cpio_file), 4096)
+                with CpioReader(cpio_file) as reader:
+                    self.assertEqual(
+                        reader.category(),
+                        CATEGORIES[data[network_name]["context"]][0]
+                    )
+                    self.assertTrue(list(reader.iter_nodes()))
+
+    def test_run(self):
+        results = run(users=2, networks=5, cpio_size=1024, repeat=1)
+        self.assertEqual(results["parameters"]["networks"], 10)
+        for name in ("list_networks", "search", "save", "load_staging"):
+            self.assertIn("median", results["results"][name]["warm"])
+        lines = compare(results, results)
+        self.assertFalse(any(line.endswith("REGRESSION") for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
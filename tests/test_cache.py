@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from network_saver.cache import *
+from network_saver.utility import (
+    read_network_vault, write_network_vault, invalidate_vault_cache
+)
+
+
+class TestStampedCache(unittest.TestCase):
+
+    def test_stamp(self):
+        cache = StampedCache()
+        cache.put("vault.json", "1:10", {"foo": {"context": "SOP"}})
+        self.assertEqual(
+            cache.get("vault.json", "1:10"), {"foo": {"context": "SOP"}}
+        )
+        self.assertIsNone(cache.get("vault.json", "2:10"))
+        # stale entries are dropped
+        self.assertEqual(len(cache), 0)
+
+    def test_copy(self):
+        cache = StampedCache()
+        cache.put("vault.json", "1:10", {"foo": {"context": "SOP"}})
+        data = cache.get("vault.json", "1:10")
+        data["foo"]["context"] = "DOP"
+        data.pop("foo")
+        self.assertEqual(
+            cache.get("vault.json", "1:10"), {"foo": {"context": "SOP"}}
+        )
+
+    def test_eviction(self):
+        cache = StampedCache(max_entries=2)
+        cache.put("a.json", "1", {})
+        cache.put("b.json", "1", {})
+        cache.get("a.json", "1")
+        cache.put("c.json", "1", {})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b.json", "1"))
+        self.assertIsNotNone(cache.get("a.json", "1"))
+
+    def test_invalidate(self):
+        cache = StampedCache()
+        cache.put("a.json", "1", {})
+        cache.put("b.json", "1", {})
+        cache.invalidate("a.json")
+        self.assertIsNone(cache.get("a.json", "1"))
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+
+class TestReadNetworkVaultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmp_dir, "networks.json")
+        shutil.copy(
+            os.path.join(
+                os.path.dirname(__file__), "fixtures", "_test", "networks.json"
+            ),
+            self.filepath
+        )
+        invalidate_vault_cache()
+
+    def test_parsed_once(self):
+        with mock.patch("json.load", wraps=json.load) as load:
+            read_network_vault(self.filepath, 'r')
+            data = read_network_vault(self.filepath, 'r')
+        self.assertEqual(load.call_count, 1)
+        self.assertIn("network_A", data)
+
+    def test_external_change(self):
+        read_network_vault(self.filepath, 'r')
+        with open(self.filepath, 'w') as f:
+            json.dump({"network_C": {}, "network_D": {}}, f)
+        data = read_network_vault(self.filepath, 'r')
+        self.assertEqual(list(data), ["network_C", "network_D"])
+
+    def test_write(self):
+        data = read_network_vault(self.filepath, 'r')
+        data.pop("network_A")
+        write_network_vault(self.filepath, data)
+        with mock.patch("json.load", wraps=json.load) as load:
+            data = read_network_vault(self.filepath, 'r')
+        self.assertEqual(load.call_count, 0)
+        self.assertEqual(list(data), ["network_B"])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from network_saver.catalog import *
+from network_saver.utility import (
+    delete_network_data, get_vault_file, get_vault_stamp, put_network_data,
+    remove_cpio_file
+)
+
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.user = "_test"
+        fixture_dir = os.path.join(
+            os.path.dirname(__file__),
+            "fixtures",
+        )
+        self.vault_dir = tempfile.mkdtemp()
+        shutil.copytree(
+            os.path.join(fixture_dir, self.user),
+            os.path.join(self.vault_dir, self.user)
+        )
+        self.vault_file = get_vault_file(
+            user=self.user, vault_dir=self.vault_dir
+        )
+
+    def test_list_users(self):
+        os.mkdir(os.path.join(self.vault_dir, "_empty"))
+        self.assertEqual(list_users(self.vault_dir), [self.user])
+        self.assertTrue(os.path.isfile(get_catalog_file(self.vault_dir)))
+
+        # new users are picked up from the vault root
+        shutil.copytree(
+            os.path.join(self.vault_dir, self.user),
+            os.path.join(self.vault_dir, "_alan")
+        )
+        self.assertEqual(list_users(self.vault_dir), ["_alan", self.user])
+
+        # folders getting their vault json later on are indexed on save,
+        # without the vault root changing
+        root_stat = os.stat(self.vault_dir)
+        put_network_data(
+            "network_C", {"context": "Sop", "notes": "", "version": "20.0"},
+            user="_empty", vault_dir=self.vault_dir
+        )
+        os.utime(
+            self.vault_dir, ns=(root_stat.st_atime_ns, root_stat.st_mtime_ns)
+        )
+        self.assertEqual(
+            list_users(self.vault_dir), ["_alan", "_empty", self.user]
+        )
+        self.assertEqual(
+            list(list_networks("_empty", self.vault_dir)), ["network_C"]
+        )
+
+        # while those written behind its back wait for a rebuild
+        os.mkdir(os.path.join(self.vault_dir, "_bob"))
+        root_stat = os.stat(self.vault_dir)
+        list_users(self.vault_dir)
+        shutil.copy(self.vault_file, os.path.join(self.vault_dir, "_bob"))
+        os.utime(
+            self.vault_dir, ns=(root_stat.st_atime_ns, root_stat.st_mtime_ns)
+        )
+        self.assertNotIn("_bob", list_users(self.vault_dir))
+        rebuild(self.vault_dir)
+        self.assertIn("_bob", list_users(self.vault_dir))
+
+    def test_list_networks(self):
+        data = list_networks(user=self.user, vault_dir=self.vault_dir)
+        self.assertEqual(list(data), ["network_A", "network_B"])
+        self.assertEqual(data["network_B"]["context"], "SOP")
+        self.assertEqual(list_networks(user="_alan", vault_dir=self.vault_dir), {})
+
+    def test_external_change(self):
+        list_networks(user=self.user, vault_dir=self.vault_dir)
+
+        # vault json edited behind the catalog's back
+        with open(self.vault_file, 'r') as f:
+            data = json.load(f)
+        data.update({"network_C": {
+            "context": "DOP", "notes": "notes C", "version": "20.0.506"
+        }})
+        with open(self.vault_file, 'w') as f:
+            json.dump(data, f)
+
+        data = list_networks(user=self.user, vault_dir=self.vault_dir)
+        self.assertIn("network_C", data)
+
+    def test_put_delete(self):
+        list_networks(user=self.user, vault_dir=self.vault_dir)
+
+        with open(self.vault_file, 'r') as f:
+            data = json.load(f)
+        data.pop("network_B")
+        data.update({"network_C": {
+            "context": "DOP", "notes": "notes C", "version": "20.0.506"
+        }})
+        stamp = get_vault_stamp(self.vault_file)
+        with open(self.vault_file, 'w') as f:
+            json.dump(data, f)
+        put_network(
+            "network_C", data["network_C"], user=self.user,
+            vault_dir=self.vault_dir, stamp=stamp
+        )
+        delete_network("network_B", user=self.user, vault_dir=self.vault_dir)
+
+        data = list_networks(user=self.user, vault_dir=self.vault_dir)
+        self.assertEqual(list(data), ["network_A", "network_C"])
+
+        # index was kept in step with the write, no re-index needed
+        with connect(self.vault_dir) as conn:
+            stamp, = conn.execute(
+                "SELECT stamp FROM users WHERE name = ?", (self.user,)
+            ).fetchone()
+        conn.close()
+        self.assertEqual(stamp, get_vault_stamp(self.vault_file))
+
+    def test_remove_file_then_record(self):
+        list_networks(user=self.user, vault_dir=self.vault_dir)
+        remove_cpio_file("network_B", user=self.user, vault_dir=self.vault_dir)
+        # still listed by vault json, so still listed by the catalog
+        self.assertEqual(
+            list(list_networks(user=self.user, vault_dir=self.vault_dir)),
+            ["network_A", "network_B"]
+        )
+        delete_network_data(
+            "network_B", user=self.user, vault_dir=self.vault_dir
+        )
+        self.assertEqual(
+            list(list_networks(user=self.user, vault_dir=self.vault_dir)),
+            ["network_A"]
+        )
+
+    def test_rebuild(self):
+        list_networks(user=self.user, vault_dir=self.vault_dir)
+        put_network(
+            "network_C", {"context": "DOP", "notes": "", "version": "20.0"},
+            user=self.user, vault_dir=self.vault_dir
+        )
+        rebuild(self.vault_dir)
+        data = list_networks(user=self.user, vault_dir=self.vault_dir)
+        self.assertEqual(list(data), ["network_A", "network_B"])
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
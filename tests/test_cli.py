@@ -0,0 +1,146 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from network_saver.cli import *
+from network_saver.utility import read_user_data
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.vault_dir = os.path.join(self.tmp_dir, "vault")
+        shutil.copytree(
+            os.path.join(os.path.dirname(__file__), "fixtures", "_test"),
+            os.path.join(self.vault_dir, "_test")
+        )
+        self.export_dir = os.path.join(self.tmp_dir, "export")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _run(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = main(["--vault", self.vault_dir] + list(argv))
+        return code, out.getvalue()
+
+    def test_list(self):
+        code, out = self._run("users")
+        self.assertEqual(code, 0)
+        self.assertEqual(out.split(), ["_test"])
+        code, out = self._run("list", "--user", "_test", "--json")
+        self.assertEqual(sorted(json.loads(out)), ["network_A", "network_B"])
+
+    def test_search(self):
+        code, out = self._run("search", "notes b")
+        self.assertEqual(out.split(), ["_test", "network_B"])
+
+    def test_export_import(self):
+        code, _out = self._run(
+            "export", "--user", "_test", "--all", "--dest", self.export_dir,
+            "--jobs", "2"
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual(
+            sorted(os.listdir(self.export_dir)),
+            ["network_A.cpio", "network_B.cpio", "networks.json"]
+        )
+
+        code, _out = self._run(
+            "import", "network_B", "--user", "_alan", "--src", self.export_dir
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual(list(read_user_data("_alan", self.vault_dir)), ["network_B"])
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.vault_dir, "_alan", "network_B.cpio"))
+        )
+
+    def test_import_checks(self):
+        with self.assertRaises(SystemExit):
+            self._run("import", "--all", "--user", "_alan", "--src", self.export_dir)
+
+        self._run("export", "--user", "_test", "--all", "--dest", self.export_dir)
+        with open(os.path.join(self.export_dir, "networks.json"), "w") as f:
+            json.dump({"../escaped": {}}, f)
+        with self.assertRaises(SystemExit):
+            self._run("import", "--all", "--user", "_alan", "--src", self.export_dir)
+        self.assertFalse(os.path.exists(os.path.join(self.vault_dir, "escaped.cpio")))
+        self.assertFalse(os.path.exists(os.path.join(self.vault_dir, "_alan")))
+
+    def test_copy_delete(self):
+        code, _out = self._run(
+            "copy", "--all", "--user", "_test", "--to-user", "_alan"
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual(
+            sorted(read_user_data("_alan", self.vault_dir)),
+            ["network_A", "network_B"]
+        )
+        code, _out = self._run("delete", "network_A", "--user", "_alan")
+        self.assertEqual(code, 0)
+        self.assertEqual(list(read_user_data("_alan", self.vault_dir)), ["network_B"])
+        self.assertFalse(
+            os.path.isfile(os.path.join(self.vault_dir, "_alan", "network_A.cpio"))
+        )
+
+    def test_trash(self):
+        code, _out = self._run("delete", "--all", "--user", "_test")
+        self.assertEqual(code, 0)
+        code, out = self._run("trash", "--json")
+        entries = json.loads(out)
+        self.assertEqual(
+            sorted(entry["name"] for entry in entries), ["network_A", "network_B"]
+        )
+        entry_id = [
+            entry["id"] for entry in entries if entry["name"] == "network_A"
+        ][0]
+        code, _out = self._run("untrash", entry_id, "--user", "_test")
+        self.assertEqual(code, 0)
+        self.assertEqual(list(read_user_data("_test", self.vault_dir)), ["network_A"])
+
+        # too recent to expire
+        code, out = self._run("gc")
+        self.assertEqual(code, 0)
+        code, out = self._run("trash")
+        self.assertEqual(len(out.splitlines()), 1)
+        code, out = self._run("gc", "--all")
+        self.assertEqual(code, 0)
+        code, out = self._run("trash")
+        self.assertEqual(out, "")
+
+    def test_fsck(self):
+        code, _out = self._run("fsck")
+        self.assertEqual(code, 0)
+        os.remove(os.path.join(self.vault_dir, "_test", "network_A.cpio"))
+        code, out = self._run("fsck", "--json")
+        self.assertEqual(code, 1)
+        self.assertEqual(
+            [(issue["kind"], issue["name"]) for issue in json.loads(out)],
+            [("missing network file", "network_A")]
+        )
+        code, _out = self._run("fsck", "--repair")
+        self.assertEqual(code, 0)
+        self.assertEqual(list(read_user_data("_test", self.vault_dir)), ["network_B"])
+
+    def test_migrate(self):
+        os.makedirs(os.path.join(self.vault_dir, ".netvault"))
+        with open(os.path.join(self.vault_dir, ".netvault", "settings.json"), 'w') as f:
+            json.dump({"compression": "gzip"}, f)
+        code, _out = self._run("migrate")
+        self.assertEqual(code, 0)
+        with open(os.path.join(self.vault_dir, "_test", "network_A.cpio"), 'rb') as f:
+            self.assertEqual(f.read(2), b'\x1f\x8b')
+
+    def test_missing_network(self):
+        with self.assertRaises(SystemExit):
+            self._run("delete", "network_Z", "--user", "_test")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from network_saver.cpio import *
+from network_saver.storage import store_network_file
+
+
+class TestCpioReader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixture_dir = os.path.join(
+            os.path.dirname(__file__), "fixtures", "_test"
+        )
+        cls.network_A = os.path.join(cls.fixture_dir, "network_A.cpio")
+        cls.network_B = os.path.join(cls.fixture_dir, "network_B.cpio")
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def test_records(self):
+        with CpioReader(self.network_B) as reader:
+            records = list(reader.iter_records())
+            self.assertEqual(
+                [record.name for record in records],
+                [
+                    "node_type", "box1.init", "box1.def", "box1.parm",
+                    "box1.userdata", "NON_COMMERCIAL_FILE!!!"
+                ]
+            )
+            # records are contiguous and cover the whole file
+            self.assertEqual(records[0].offset, 0)
+            for record, next_record in zip(records, records[1:]):
+                self.assertEqual(record.offset + record.size, next_record.offset)
+            self.assertEqual(records[-1].offset + records[-1].size, len(reader))
+            self.assertEqual(bytes(reader.data(records[0])), b"Sop\n")
+            self.assertEqual(reader.category(), "Sop")
+
+    def test_nodes(self):
+        with CpioReader(self.network_A) as reader:
+            nodes = list(reader.iter_nodes())
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(nodes[0].name, "geo1")
+        self.assertEqual(nodes[0].type, "geo")
+        self.assertEqual(len(nodes[0].records), 6)
+
+    def test_summary(self):
+        summary = read_summary(self.network_A)
+        self.assertEqual(summary["category"], "Object")
+        self.assertEqual(summary["nodes"], 1)
+        self.assertEqual(summary["types"], {"geo": 1})
+
+    def test_layout(self):
+        layout = read_layout(self.network_A)
+        self.assertEqual(len(layout), 1)
+        self.assertEqual(layout[0].name, "geo1")
+        self.assertEqual(layout[0].type, "geo")
+        self.assertAlmostEqual(layout[0].position[0], -4.05392)
+        self.assertAlmostEqual(layout[0].position[1], 1.01013)
+        self.assertEqual(layout[0].inputs, ())
+        self.assertTrue(layout[0].display)
+
+    def test_compressed(self):
+        dst = os.path.join(self.tmp_dir, "network_B.cpio")
+        store_network_file(self.network_B, dst, compression="gzip")
+        with CpioReader(dst) as reader:
+            self.assertEqual(
+                [node.type for node in reader.iter_nodes()], ["box"]
+            )
+
+    def test_malformed(self):
+        bad_file = os.path.join(self.tmp_dir, "bad.cpio")
+        with open(self.network_B, 'rb') as f:
+            contents = f.read()
+        for bad in (b"garbage" + contents, contents[:40]):
+            with open(bad_file, 'wb') as f:
+                f.write(bad)
+            with CpioReader(bad_file) as reader:
+                with self.assertRaises(CpioError):
+                    list(reader.iter_records())
+
+    def test_empty(self):
+        empty_file = os.path.join(self.tmp_dir, "empty.cpio")
+        open(empty_file, 'wb').close()
+        with CpioReader(empty_file) as reader:
+            self.assertEqual(len(reader), 0)
+            with self.assertRaises(CpioError):
+                list(reader.iter_records())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
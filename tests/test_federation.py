@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from network_saver import utility
+from network_saver.federation import *
+
+
+class TestGetVaultDirs(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.data_dir, "vault_dir.txt"), "w") as f:
+            f.write("/studio/library\n# scratch\n\n/show/vault\n")
+        utility.invalidate_vault_dirs()
+        self.patch = mock.patch.object(
+            utility, "get_data_dir", return_value=self.data_dir
+        )
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        utility.invalidate_vault_dirs()
+        shutil.rmtree(self.data_dir)
+
+    def test_order(self):
+        with mock.patch.dict(os.environ, {utility.VAULT_PATH_VAR: ""}):
+            self.assertEqual(
+                utility.get_vault_dirs(), ["/studio/library", "/show/vault"]
+            )
+        env_path = os.pathsep.join(["/show/vault", "/local/scratch"])
+        with mock.patch.dict(os.environ, {utility.VAULT_PATH_VAR: env_path}):
+            self.assertEqual(
+                utility.get_vault_dirs(),
+                ["/show/vault", "/local/scratch", "/studio/library"]
+            )
+            self.assertEqual(utility.get_vault_dir(), "/show/vault")
+
+    def test_cached(self):
+        with mock.patch.dict(os.environ, {utility.VAULT_PATH_VAR: ""}):
+            vault_dirs = utility.get_vault_dirs()
+            with mock.patch("builtins.open", wraps=open) as opened:
+                self.assertEqual(utility.get_vault_dirs(), vault_dirs)
+            self.assertEqual(opened.call_count, 0)
+
+
+class TestFederation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "_test")
+        self.show_dir = os.path.join(self.tmp_dir, "show")
+        self.library_dir = os.path.join(self.tmp_dir, "library")
+        shutil.copytree(fixture, os.path.join(self.library_dir, "_test"))
+        shutil.copytree(fixture, os.path.join(self.library_dir, "_lib"))
+
+        # the show overrides network_B and adds network_C
+        show_user_dir = os.path.join(self.show_dir, "_test")
+        os.makedirs(show_user_dir)
+        with open(os.path.join(show_user_dir, "networks.json"), "w") as f:
+            json.dump({
+                "network_B": {"context": "SOP", "notes": "show B"},
+                "network_C": {"context": "DOP", "notes": "show C"}
+            }, f)
+        self.vault_dirs = [
+            self.show_dir, os.path.join(self.tmp_dir, "missing"),
+            self.library_dir
+        ]
+
+    def tearDown(self):
+        utility.invalidate_vault_cache()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_list_users(self):
+        self.assertEqual(list_users(self.vault_dirs), ["_lib", "_test"])
+
+    def test_list_networks(self):
+        data = list_networks(user="_test", vault_dirs=self.vault_dirs)
+        self.assertEqual(
+            list(data), ["network_B", "network_C", "network_A"]
+        )
+        self.assertEqual(data["network_B"]["notes"], "show B")
+        self.assertEqual(data["network_B"]["vault_dir"], self.show_dir)
+        self.assertEqual(data["network_A"]["vault_dir"], self.library_dir)
+
+    def test_locate_network(self):
+        self.assertEqual(
+            locate_network("network_A", "_test", self.vault_dirs),
+            self.library_dir
+        )
+        self.assertEqual(
+            locate_network("network_C", "_test", self.vault_dirs),
+            self.show_dir
+        )
+        self.assertIsNone(locate_network("network_D", "_test", self.vault_dirs))
+
+    def test_unshadowed(self):
+        utility.delete_network_data(
+            "network_B", user="_test", vault_dir=self.show_dir
+        )
+        data = list_networks(user="_test", vault_dirs=self.vault_dirs)
+        self.assertEqual(data["network_B"]["notes"], "notes B")
+        self.assertEqual(data["network_B"]["vault_dir"], self.library_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
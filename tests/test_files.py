@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from network_saver.files import *
+from network_saver.files import _get_umask
+
+
+class TestFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmp_dir, "networks.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_write_file(self):
+        write_file(self.filepath, b"data")
+        with open(self.filepath, "rb") as f:
+            self.assertEqual(f.read(), b"data")
+        self.assertEqual(os.stat(self.filepath).st_mode & 0o777, FILE_MODE)
+
+    @unittest.skipUnless(os.path.isfile("/proc/self/status"), "needs /proc")
+    def test_umask_read(self):
+        umask = os.umask(0o027)
+        try:
+            self.assertEqual(_get_umask(), 0o027)
+        finally:
+            os.umask(umask)
+
+    def test_mode_kept_without_umask(self):
+        write_file(self.filepath, b"data")
+        os.chmod(self.filepath, 0o640)
+        with mock.patch("network_saver.files._UMASK", None):
+            write_file(self.filepath, b"more data")
+            self.assertEqual(os.stat(self.filepath).st_mode & 0o777, 0o640)
+            os.remove(self.filepath)
+            self.assertEqual(get_mode(self.filepath), FILE_MODE)
+
+    def test_failed_write(self):
+        write_file(self.filepath, b"data")
+        with self.assertRaises(ValueError):
+            with atomic_open(self.filepath, "w") as f:
+                f.write("partial")
+                raise ValueError
+        with open(self.filepath, "rb") as f:
+            self.assertEqual(f.read(), b"data")
+        self.assertEqual(os.listdir(self.tmp_dir), ["networks.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
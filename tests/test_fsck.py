@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from network_saver import journal, records, trash, utility
+from network_saver.files import FILE_MODE
+from network_saver.fsck import *
+
+
+class TestFsck(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp()
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "_test")
+        shutil.copytree(fixture, os.path.join(self.vault_dir, "_test"))
+        shutil.copytree(fixture, os.path.join(self.vault_dir, "_alan"))
+        self.user_dir = os.path.join(self.vault_dir, "_test")
+        self.vault_file = utility.get_vault_file("_test", self.vault_dir)
+        utility.invalidate_vault_cache()
+        utility._MIGRATED.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+        utility._MIGRATED.clear()
+
+    def _kinds(self, issues):
+        return sorted((issue.user, issue.kind, issue.name) for issue in issues)
+
+    def test_clean(self):
+        self.assertEqual(check(self.vault_dir), [])
+        self.assertTrue(os.path.isfile(get_state_file(self.vault_dir)))
+        self.assertEqual(
+            os.stat(get_state_file(self.vault_dir)).st_mode & 0o777, FILE_MODE
+        )
+
+    def test_incremental(self):
+        check(self.vault_dir)
+        with mock.patch(
+            "network_saver.fsck.check_network_file", return_value=None
+        ) as check_file:
+            check(self.vault_dir)
+            self.assertEqual(check_file.call_count, 0)
+            # changed files are parsed again
+            with open(os.path.join(self.user_dir, "network_A.cpio"), "ab") as f:
+                f.write(b"\n")
+            check(self.vault_dir)
+            self.assertEqual(check_file.call_count, 1)
+            check(self.vault_dir, full=True)
+            self.assertEqual(check_file.call_count, 5)
+
+    def test_inconsistencies(self):
+        os.rename(
+            os.path.join(self.user_dir, "network_A.cpio"),
+            os.path.join(self.user_dir, "network_C.cpio")
+        )
+        with open(os.path.join(self.user_dir, "network_B.cpio"), "r+b") as f:
+            f.truncate(40)
+        with open(records.get_record_file(self.user_dir, "network_D"), "w") as f:
+            f.write("{ truncated")
+        with open(journal.get_journal_file(self.vault_file), "w") as f:
+            f.write("garbage\n")
+        with open(utility.get_vault_file("_alan", self.vault_dir), "w") as f:
+            f.write("{ truncated")
+
+        issues = check(self.vault_dir)
+        self.assertEqual(self._kinds(issues), [
+            ("_alan", CORRUPT_SUMMARY, None),
+            ("_alan", ORPHAN_NETWORK, "network_A"),
+            ("_alan", ORPHAN_NETWORK, "network_B"),
+            ("_test", CORRUPT_JOURNAL, None),
+            ("_test", CORRUPT_NETWORK, "network_B"),
+            ("_test", CORRUPT_RECORD, "network_D"),
+            ("_test", MISSING_NETWORK, "network_A"),
+            ("_test", ORPHAN_NETWORK, "network_C"),
+            ("_test", ORPHAN_RECORD, "network_D"),
+        ])
+
+        self.assertEqual(repair(issues, self.vault_dir), 8)
+        utility.invalidate_vault_cache()
+        self.assertEqual(check(self.vault_dir, full=True), [])
+
+        data = utility.read_user_data("_test", self.vault_dir)
+        self.assertEqual(list(data), ["network_C"])
+        self.assertEqual(data["network_C"]["notes"], RECOVERED_NOTES)
+        self.assertEqual(data["network_C"]["context"], "OBJ")
+        self.assertEqual(
+            [entry["name"] for entry in trash.list_trash("_test", self.vault_dir)],
+            ["network_B"]
+        )
+        self.assertEqual(
+            sorted(utility.read_user_data("_alan", self.vault_dir)),
+            ["network_A", "network_B"]
+        )
+
+    def test_adopt_with_record(self):
+        data = utility.read_user_data("_test", self.vault_dir)
+        utility.put_network_data(
+            "network_B", data["network_B"], "_test", self.vault_dir
+        )
+        # as left by a session dying between its record and the vault json
+        with open(self.vault_file, "w") as f:
+            json.dump({"network_A": data["network_A"]}, f)
+        journal.reset(self.vault_file)
+        utility.invalidate_vault_cache()
+
+        issues = check(self.vault_dir, users=["_test"])
+        self.assertEqual(self._kinds(issues), [
+            ("_test", ORPHAN_NETWORK, "network_B"),
+            ("_test", ORPHAN_RECORD, "network_B"),
+        ])
+        self.assertEqual(repair(issues, self.vault_dir), 1)
+        self.assertEqual(
+            utility.read_user_data("_test", self.vault_dir)["network_B"]["notes"],
+            data["network_B"]["notes"]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
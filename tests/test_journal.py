@@ -0,0 +1,162 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from network_saver.files import FILE_MODE
+from network_saver.journal import *
+from network_saver.utility import (
+    read_network_vault, append_network_record, write_network_vault,
+    invalidate_vault_cache
+)
+
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmp_dir, "networks.json")
+        shutil.copy(
+            os.path.join(
+                os.path.dirname(__file__), "fixtures", "_test", "networks.json"
+            ),
+            self.filepath
+        )
+        self.data_C = {"context": "DOP", "notes": "notes C", "version": "20.0"}
+        invalidate_vault_cache()
+
+    def test_append(self):
+        append_network_record(self.filepath, put_record("network_C", self.data_C))
+        append_network_record(self.filepath, delete_record("network_A"))
+
+        # snapshot itself is left alone
+        with open(self.filepath, 'r') as f:
+            self.assertIn("network_A", json.load(f))
+        self.assertEqual(len(read_records(self.filepath)), 2)
+
+        invalidate_vault_cache()
+        data = read_network_vault(self.filepath, 'r')
+        self.assertEqual(list(data), ["network_B", "network_C"])
+        self.assertEqual(data["network_C"], self.data_C)
+
+    def test_batch(self):
+        append_network_record(self.filepath, batch_record([
+            put_record("network_C", self.data_C),
+            delete_record("network_A"),
+            delete_record("network_B")
+        ]))
+        self.assertEqual(len(read_records(self.filepath)), 1)
+        self.assertEqual(list(read_network_vault(self.filepath, 'r')), ["network_C"])
+        invalidate_vault_cache()
+        self.assertEqual(list(read_network_vault(self.filepath, 'r')), ["network_C"])
+
+    def test_cache_kept_warm(self):
+        read_network_vault(self.filepath, 'r')
+        append_network_record(self.filepath, delete_record("network_A"))
+        with mock.patch("json.load", wraps=json.load) as load:
+            data = read_network_vault(self.filepath, 'r')
+        self.assertEqual(load.call_count, 0)
+        self.assertEqual(list(data), ["network_B"])
+
+    def test_cache_dropped_on_foreign_append(self):
+        read_network_vault(self.filepath, 'r')
+
+        def append_alongside(vault_file, record):
+            # as if another session appended between both stamps
+            with open(get_journal_file(vault_file), 'a') as f:
+                f.write(json.dumps(put_record("network_C", self.data_C)) + "\n")
+            return append(vault_file, record)
+
+        with mock.patch(
+            "network_saver.journal.append", side_effect=append_alongside
+        ):
+            append_network_record(self.filepath, delete_record("network_A"))
+        self.assertEqual(
+            list(read_network_vault(self.filepath, 'r')),
+            ["network_B", "network_C"]
+        )
+
+    def test_replay_over_rewritten_snapshot(self):
+        # whole-file rewrites derived from the folded view stay consistent
+        append_network_record(self.filepath, put_record("network_C", self.data_C))
+        data = read_network_vault(self.filepath, 'r')
+        data.pop("network_A")
+        with open(self.filepath, 'w') as f:
+            json.dump(data, f)
+        self.assertEqual(
+            list(read_network_vault(self.filepath, 'r')),
+            ["network_B", "network_C"]
+        )
+
+    def test_partial_record(self):
+        append_network_record(self.filepath, delete_record("network_A"))
+        with open(get_journal_file(self.filepath), 'a') as f:
+            f.write('{"op": "delete", "na')
+        invalidate_vault_cache()
+        self.assertEqual(list(read_network_vault(self.filepath, 'r')), ["network_B"])
+
+    def test_compact(self):
+        append_network_record(self.filepath, put_record("network_C", self.data_C))
+        append_network_record(self.filepath, delete_record("network_A"))
+        with open(get_journal_file(self.filepath), 'a') as f:
+            f.write('{"op": "delete", "na')
+        compact(self.filepath)
+
+        with open(self.filepath, 'r') as f:
+            self.assertEqual(list(json.load(f)), ["network_B", "network_C"])
+        # only the incomplete record is carried over
+        with open(get_journal_file(self.filepath), 'r') as f:
+            self.assertEqual(f.read(), '{"op": "delete", "na')
+        # both stay readable by other users
+        for filepath in (self.filepath, get_journal_file(self.filepath)):
+            self.assertEqual(os.stat(filepath).st_mode & 0o777, FILE_MODE)
+
+    def test_append_waits_for_lock(self):
+        held, release = threading.Event(), threading.Event()
+
+        def compacting():
+            with lock(self.filepath):
+                held.set()
+                release.wait()
+
+        holder = threading.Thread(target=compacting)
+        holder.start()
+        held.wait()
+        appender = threading.Thread(
+            target=append, args=(self.filepath, delete_record("network_A"))
+        )
+        appender.start()
+        time.sleep(0.2)
+        self.assertFalse(os.path.isfile(get_journal_file(self.filepath)))
+        release.set()
+        holder.join()
+        appender.join()
+        self.assertEqual(len(read_records(self.filepath)), 1)
+
+    def test_compaction_threshold(self):
+        with mock.patch("network_saver.journal.compact_async") as compact_async:
+            append_network_record(self.filepath, delete_record("network_A"))
+            compact_async.assert_not_called()
+            append_network_record(
+                self.filepath,
+                put_record("network_C", {"notes": "x" * COMPACT_SIZE})
+            )
+            compact_async.assert_called_once_with(self.filepath)
+
+    def test_write_resets_journal(self):
+        append_network_record(self.filepath, delete_record("network_A"))
+        write_network_vault(self.filepath, {"network_A": {}})
+        self.assertFalse(os.path.isfile(get_journal_file(self.filepath)))
+        invalidate_vault_cache()
+        self.assertEqual(list(read_network_vault(self.filepath, 'r')), ["network_A"])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from network_saver.local_cache import *
+from network_saver.storage import store_network_file
+
+
+class TestLocalCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.vault_dir = os.path.join(self.tmp_dir, "vault")
+        os.makedirs(os.path.join(self.vault_dir, "_test"))
+        fixture = os.path.join(
+            os.path.dirname(__file__), "fixtures", "_test", "network_A.cpio"
+        )
+        with open(fixture, 'rb') as f:
+            self.contents = f.read()
+        self.src = os.path.join(self.vault_dir, "_test", "network_A.cpio")
+        store_network_file(fixture, self.src, compression="gzip")
+        self.dst = os.path.join(self.tmp_dir, "OBJ_copy.cpio")
+        self.cache = LocalCache(
+            cache_dir=os.path.join(self.tmp_dir, "cache"), max_size=MAX_SIZE
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _read_dst(self):
+        with open(self.dst, 'rb') as f:
+            return f.read()
+
+    def test_read_through(self):
+        self.cache.extract(self.src, self.dst, vault_dir=self.vault_dir)
+        self.assertEqual(self._read_dst(), self.contents)
+        self.cache.extract(self.src, self.dst, vault_dir=self.vault_dir)
+        self.assertEqual(self._read_dst(), self.contents)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["bytes_saved"], os.path.getsize(self.src))
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["size"], len(self.contents))
+
+    def test_changed_source(self):
+        self.cache.extract(self.src, self.dst, vault_dir=self.vault_dir)
+        with open(self.src, 'wb') as f:
+            f.write(self.contents[:100])
+        self.cache.extract(self.src, self.dst, vault_dir=self.vault_dir)
+        self.assertEqual(self._read_dst(), self.contents[:100])
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_trim(self):
+        self.cache.max_size = len(self.contents) + 1
+        other = os.path.join(self.vault_dir, "_test", "network_B.cpio")
+        shutil.copy(self.src, other)
+        first = self.cache.fetch(self.src, vault_dir=self.vault_dir)
+        second = self.cache.fetch(other, vault_dir=self.vault_dir)
+        # least recently used entry makes way for the new one
+        self.assertFalse(os.path.isfile(first))
+        self.assertTrue(os.path.isfile(second))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_disabled(self):
+        self.cache.max_size = 0
+        self.cache.extract(self.src, self.dst, vault_dir=self.vault_dir)
+        self.assertEqual(self._read_dst(), self.contents)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_missing_source(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.extract(
+                os.path.join(self.vault_dir, "_test", "network_C.cpio"),
+                self.dst, vault_dir=self.vault_dir
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
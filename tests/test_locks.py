@@ -0,0 +1,226 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from network_saver import journal, utility
+from network_saver.locks import *
+
+
+class TestFileLock(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmp_dir, "networks.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _hold_elsewhere(self, **owner):
+        lock_file = get_lock_file(self.filepath)
+        with open(lock_file, "w") as f:
+            json.dump(owner, f)
+        return lock_file
+
+    def test_exclusive(self):
+        lock = FileLock(self.filepath)
+        with lock:
+            self.assertTrue(os.path.isfile(lock.lock_file))
+            # re-entrant within a thread
+            with FileLock(self.filepath):
+                pass
+            self.assertTrue(os.path.isfile(lock.lock_file))
+
+            acquired = []
+            def other():
+                try:
+                    FileLock(self.filepath, timeout=0.1).acquire()
+                    acquired.append(True)
+                except LockTimeout:
+                    acquired.append(False)
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join()
+            self.assertEqual(acquired, [False])
+        self.assertFalse(os.path.isfile(lock.lock_file))
+
+    def test_stale_age(self):
+        lock_file = self._hold_elsewhere(host="elsewhere", pid=1, time=0)
+        with self.assertRaises(LockTimeout):
+            FileLock(self.filepath, timeout=0).acquire()
+        past = time.time() - STALE_AGE - 1
+        os.utime(lock_file, (past, past))
+        with FileLock(self.filepath, timeout=0):
+            pass
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+
+    def test_heartbeat(self):
+        acquired = []
+        def other():
+            try:
+                FileLock(self.filepath, timeout=0, stale_age=0.2).acquire()
+                acquired.append(True)
+            except LockTimeout:
+                acquired.append(False)
+        # held longer than the stale age, but kept fresh while held
+        with FileLock(self.filepath, stale_age=0.2):
+            time.sleep(0.5)
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join()
+        self.assertEqual(acquired, [False])
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+
+    def test_break_rechecks(self):
+        lock_file = self._hold_elsewhere(host="elsewhere", pid=1, time=0)
+        past = time.time() - STALE_AGE - 1
+        os.utime(lock_file, (past, past))
+        lock = FileLock(self.filepath, timeout=0)
+        self.assertTrue(lock.is_stale())
+
+        # owner let go and another session took the lock in between
+        os.remove(lock_file)
+        self._hold_elsewhere(host="elsewhere", pid=2, time=time.time())
+        lock._break()
+        with open(lock_file, "r") as f:
+            self.assertEqual(json.load(f)["pid"], 2)
+        self.assertEqual(os.listdir(self.tmp_dir), ["networks.json.lock"])
+        with self.assertRaises(LockTimeout):
+            lock.acquire()
+
+    @unittest.skipUnless(os.name == "posix", "needs posix pids")
+    def test_dead_owner(self):
+        import socket
+        import subprocess
+        import sys
+        proc = subprocess.Popen([sys.executable, "-c", "pass"])
+        proc.wait()
+        self._hold_elsewhere(
+            host=socket.gethostname(), pid=proc.pid, time=time.time()
+        )
+        with FileLock(self.filepath, timeout=0):
+            pass
+
+
+class TestGenerations(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp()
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "_test")
+        shutil.copytree(fixture, os.path.join(self.vault_dir, "_test"))
+        self.data_C = {"context": "DOP", "notes": "notes C", "version": "20.0"}
+        utility.invalidate_vault_cache()
+        utility._MIGRATED.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+        utility._MIGRATED.clear()
+
+    def test_put_conflict(self):
+        saved = utility.put_network_data(
+            "network_C", self.data_C, "_test", self.vault_dir, generation=0
+        )
+        self.assertEqual(saved["generation"], 1)
+        self.assertEqual(
+            utility.read_user_data("_test", self.vault_dir)["network_C"], saved
+        )
+
+        # another session saved in between
+        with self.assertRaises(ConflictError):
+            utility.put_network_data(
+                "network_C", self.data_C, "_test", self.vault_dir, generation=0
+            )
+        saved = utility.put_network_data(
+            "network_C", self.data_C, "_test", self.vault_dir, generation=1
+        )
+        self.assertEqual(saved["generation"], 2)
+
+        # networks saved before generations count as the first
+        saved = utility.put_network_data(
+            "network_A", self.data_C, "_test", self.vault_dir, generation=1
+        )
+        self.assertEqual(saved["generation"], 2)
+
+    def test_delete_conflict(self):
+        utility.put_network_data("network_C", self.data_C, "_test", self.vault_dir)
+        with self.assertRaises(ConflictError):
+            utility.delete_network_data(
+                "network_C", "_test", self.vault_dir, generation=3
+            )
+        self.assertIn("network_C", utility.read_user_data("_test", self.vault_dir))
+        utility.delete_network_data(
+            "network_C", "_test", self.vault_dir, generation=1
+        )
+        self.assertNotIn(
+            "network_C", utility.read_user_data("_test", self.vault_dir)
+        )
+
+    def test_retry(self):
+        calls = []
+        def save():
+            current = utility.get_network_data(
+                "network_C", "_test", self.vault_dir
+            )
+            if not calls:
+                # lose the race once
+                utility.put_network_data(
+                    "network_C", self.data_C, "_test", self.vault_dir
+                )
+            calls.append(True)
+            return utility.put_network_data(
+                "network_C", self.data_C, "_test", self.vault_dir,
+                generation=get_generation(current)
+            )
+        self.assertEqual(retry(save)["generation"], 2)
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_saves(self):
+        def save(name):
+            for _ in range(5):
+                retry(lambda: utility.put_network_data(
+                    name, self.data_C, "_test", self.vault_dir,
+                    generation=get_generation(utility.get_network_data(
+                        name, "_test", self.vault_dir
+                    ))
+                ), attempts=50)
+        threads = [
+            threading.Thread(target=save, args=(name,))
+            for name in ("network_C", "network_C", "network_D", "network_D")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        utility.invalidate_vault_cache()
+        data = utility.read_user_data("_test", self.vault_dir)
+        self.assertEqual(data["network_C"]["generation"], 10)
+        self.assertEqual(data["network_D"]["generation"], 10)
+        self.assertEqual(
+            [name for name in os.listdir(os.path.join(self.vault_dir, "_test"))
+             if name.endswith(".lock")],
+            []
+        )
+
+    def test_compact_skipped_while_locked(self):
+        vault_file = utility.get_vault_file("_test", self.vault_dir)
+        utility.put_network_data("network_C", self.data_C, "_test", self.vault_dir)
+        # another session is compacting
+        with open(get_lock_file(vault_file), "w") as f:
+            json.dump({"host": "elsewhere", "pid": 1, "time": time.time()}, f)
+        journal.compact(vault_file)
+        self.assertGreater(
+            os.path.getsize(journal.get_journal_file(vault_file)), 0
+        )
+        os.remove(get_lock_file(vault_file))
+        journal.compact(vault_file)
+        self.assertEqual(
+            os.path.getsize(journal.get_journal_file(vault_file)), 0
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from network_saver.files import FILE_MODE
+from network_saver.objects import *
+from network_saver.storage import store_network_file, extract_network_file
+
+
+class TestObjects(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp()
+        self.user_dir = os.path.join(self.vault_dir, "_test")
+        os.mkdir(self.user_dir)
+        self.fixture_dir = os.path.join(
+            os.path.dirname(__file__), "fixtures", "_test"
+        )
+        self.extracted = os.path.join(self.vault_dir, "OBJ_copy.cpio")
+
+    def _store(self, fixture, name, compression="none"):
+        dst = os.path.join(self.user_dir, name + ".cpio")
+        store_network_file(
+            os.path.join(self.fixture_dir, fixture), dst,
+            compression=compression, deduplicate=True, vault_dir=self.vault_dir
+        )
+        return dst
+
+    def _count_objects(self):
+        return sum(
+            len(files) for _root, _dirs, files
+            in os.walk(get_objects_dir(self.vault_dir))
+        )
+
+    def test_roundtrip(self):
+        for fixture in ("network_A.cpio", "network_B.cpio"):
+            for compression in ("none", "gzip"):
+                dst = self._store(fixture, "network", compression)
+                with open(dst, 'rb') as f:
+                    self.assertTrue(is_manifest(f.read()))
+                extract_network_file(dst, self.extracted, vault_dir=self.vault_dir)
+                with open(self.extracted, 'rb') as f, \
+                        open(os.path.join(self.fixture_dir, fixture), 'rb') as g:
+                    self.assertEqual(f.read(), g.read())
+
+    def test_deduplication(self):
+        self._store("network_A.cpio", "network_A")
+        count = self._count_objects()
+        # one chunk per node, plus the node type and license records
+        self.assertEqual(count, 3)
+        self._store("network_A.cpio", "network_A_fork")
+        self.assertEqual(self._count_objects(), count)
+
+        # only the node differs, the license record is shared
+        self._store("network_B.cpio", "network_B")
+        self.assertEqual(self._count_objects(), count + 2)
+
+    def test_verbatim(self):
+        src = os.path.join(self.vault_dir, "not_a_cpio")
+        with open(src, 'wb') as f:
+            f.write(b"not a cpio\0 at all")
+        dst = os.path.join(self.user_dir, "network.cpio")
+        store_network_file(src, dst, deduplicate=True, vault_dir=self.vault_dir)
+        self.assertEqual(len(read_manifest(dst)), 1)
+        extract_network_file(dst, self.extracted, vault_dir=self.vault_dir)
+        with open(self.extracted, 'rb') as f:
+            self.assertEqual(f.read(), b"not a cpio\0 at all")
+
+    def test_collect_garbage(self):
+        network_A = self._store("network_A.cpio", "network_A")
+        network_B = self._store("network_B.cpio", "network_B")
+        count = self._count_objects()
+
+        # recent chunks are kept regardless
+        os.remove(network_A)
+        self.assertEqual(collect_garbage(self.vault_dir), 0)
+
+        self.assertEqual(collect_garbage(self.vault_dir, grace_period=-1), 2)
+        self.assertEqual(self._count_objects(), count - 2)
+        extract_network_file(network_B, self.extracted, vault_dir=self.vault_dir)
+
+    def test_reused_chunks_kept(self):
+        network_A = self._store("network_A.cpio", "network_A")
+        past = time.time() - 2 * GRACE_PERIOD
+        for root, _dirs, files in os.walk(get_objects_dir(self.vault_dir)):
+            for name in files:
+                os.utime(os.path.join(root, name), (past, past))
+                self.assertEqual(
+                    os.stat(os.path.join(root, name)).st_mode & 0o777,
+                    FILE_MODE
+                )
+        self.assertEqual(os.stat(network_A).st_mode & 0o777, FILE_MODE)
+
+        # a save reusing old chunks restarts their grace period, so they
+        # survive until its manifest is written
+        os.remove(network_A)
+        self._store("network_A.cpio", "network_A_fork")
+        os.remove(os.path.join(self.user_dir, "network_A_fork.cpio"))
+        self.assertEqual(collect_garbage(self.vault_dir), 0)
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from network_saver.prefetch import *
+from network_saver.local_cache import LocalCache
+from network_saver.storage import store_network_file
+
+
+class TestPrefetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.vault_dir = os.path.join(self.tmp_dir, "vault")
+        os.makedirs(os.path.join(self.vault_dir, "_test"))
+        fixtures = os.path.join(os.path.dirname(__file__), "fixtures", "_test")
+        with open(os.path.join(fixtures, "network_A.cpio"), 'rb') as f:
+            self.contents = f.read()
+        self.src = os.path.join(self.vault_dir, "_test", "network_A.cpio")
+        self.other = os.path.join(self.vault_dir, "_test", "network_B.cpio")
+        store_network_file(
+            os.path.join(fixtures, "network_A.cpio"), self.src,
+            compression="gzip"
+        )
+        shutil.copy(os.path.join(fixtures, "network_B.cpio"), self.other)
+        self.dst = os.path.join(self.tmp_dir, "OBJ_copy.cpio")
+        self.cache = LocalCache(
+            cache_dir=os.path.join(self.tmp_dir, "cache"), max_size=0
+        )
+        self.prefetcher = Prefetcher(vault_dir=self.vault_dir, cache=self.cache)
+
+    def tearDown(self):
+        self.prefetcher.shutdown()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_take(self):
+        self.prefetcher.prefetch([self.src])
+        self.assertEqual(self.prefetcher.take(self.src), self.contents)
+        # nothing prefetched
+        self.assertIsNone(self.prefetcher.take(self.other))
+
+    def test_extract(self):
+        self.prefetcher.prefetch([self.src])
+        self.prefetcher.extract(self.src, self.dst)
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(f.read(), self.contents)
+        self.prefetcher.extract(self.other, self.dst)
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(f.read()[:5], b'HouNC')
+
+    def test_stale(self):
+        self.prefetcher.prefetch([self.src])
+        self.prefetcher.take(self.src)
+        with open(self.src, 'wb') as f:
+            f.write(self.contents[:100])
+        self.assertIsNone(self.prefetcher.take(self.src))
+
+    def test_cancel(self):
+        release = threading.Event()
+        self.prefetcher._executor.submit(release.wait)
+        self.prefetcher._executor.submit(release.wait)
+        # both workers are busy, so the prefetch is still queued when a new
+        # selection comes in
+        self.prefetcher.prefetch([self.src])
+        self.prefetcher.prefetch([self.other])
+        release.set()
+        self.assertIsNone(self.prefetcher.take(self.src))
+        self.assertIsNotNone(self.prefetcher.take(self.other))
+
+    def test_budget(self):
+        self.prefetcher.budget = len(self.contents) - 1
+        self.prefetcher.prefetch([self.src])
+        self.assertIsNone(self.prefetcher.take(self.src))
+
+    def test_budget_stored_size(self):
+        self.prefetcher.budget = os.path.getsize(self.other) - 1
+        with mock.patch(
+            "network_saver.storage.open_network_file"
+        ) as open_network_file:
+            self.prefetcher.prefetch([self.other])
+            self.assertIsNone(self.prefetcher.take(self.other))
+        # not even started, as the load would read it again
+        open_network_file.assert_not_called()
+
+    def test_budget_fills_local_cache(self):
+        self.cache.max_size = MEMORY_BUDGET
+        self.prefetcher.budget = len(self.contents) - 1
+        self.prefetcher.prefetch([self.src])
+        self.assertIsNone(self.prefetcher.take(self.src))
+        # read once, into the local cache
+        with open(self.cache.get_entry_file(self.src), 'rb') as f:
+            self.assertEqual(f.read(), self.contents)
+
+    def test_fills_local_cache(self):
+        self.cache.max_size = MEMORY_BUDGET
+        self.prefetcher.prefetch([self.src])
+        self.prefetcher.take(self.src)
+        self.assertTrue(os.path.isfile(self.cache.get_entry_file(self.src)))
+
+
+if __name__ == '__main__':
+    unittest.main()
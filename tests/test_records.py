@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from network_saver import utility
+from network_saver.files import FILE_MODE
+from network_saver.records import *
+
+
+class TestRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp()
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "_test")
+        shutil.copytree(fixture, os.path.join(self.vault_dir, "_test"))
+        self.user_dir = os.path.join(self.vault_dir, "_test")
+        self.vault_file = utility.get_vault_file("_test", self.vault_dir)
+        self.data_C = {"context": "DOP", "notes": "notes C", "version": "20.0"}
+        utility.invalidate_vault_cache()
+        utility._MIGRATED.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+        utility._MIGRATED.clear()
+
+    def test_roundtrip(self):
+        self.assertIsNone(read_record(self.user_dir, "network_C"))
+        write_record(self.user_dir, "network_C", self.data_C)
+        self.assertEqual(read_record(self.user_dir, "network_C"), self.data_C)
+        self.assertEqual(
+            os.stat(get_record_file(self.user_dir, "network_C")).st_mode
+            & 0o777,
+            FILE_MODE
+        )
+        self.assertEqual(list_records(self.user_dir), ["network_C"])
+        remove_record(self.user_dir, "network_C")
+        remove_record(self.user_dir, "network_C")
+        self.assertEqual(list_records(self.user_dir), [])
+
+    def test_migrated_on_write(self):
+        self.assertEqual(list_records(self.user_dir), [])
+        utility.put_network_data("network_C", self.data_C, "_test", self.vault_dir)
+        self.assertEqual(
+            sorted(list_records(self.user_dir)),
+            ["network_A", "network_B", "network_C"]
+        )
+        self.assertEqual(
+            read_records(self.user_dir),
+            utility.read_user_data("_test", self.vault_dir)
+        )
+
+        utility.delete_network_data("network_A", "_test", self.vault_dir)
+        self.assertIsNone(read_record(self.user_dir, "network_A"))
+        self.assertNotIn(
+            "network_A", utility.read_user_data("_test", self.vault_dir)
+        )
+
+    def test_get_network_data(self):
+        data = utility.read_user_data("_test", self.vault_dir)
+        # served from networks.json until migrated
+        self.assertEqual(
+            utility.get_network_data("network_A", "_test", self.vault_dir),
+            data["network_A"]
+        )
+        self.assertEqual(utility.migrate_records("_test", self.vault_dir), 2)
+        self.assertEqual(utility.migrate_records("_test", self.vault_dir), 0)
+        self.assertEqual(
+            utility.get_network_data("network_B", "_test", self.vault_dir),
+            data["network_B"]
+        )
+        self.assertIsNone(
+            utility.get_network_data("network_C", "_test", self.vault_dir)
+        )
+
+    def test_rebuild_summary(self):
+        utility.put_network_data("network_C", self.data_C, "_test", self.vault_dir)
+        expected = utility.read_user_data("_test", self.vault_dir)
+
+        with open(self.vault_file, "w") as f:
+            f.write("{ truncated")
+        utility.invalidate_vault_cache()
+        self.assertEqual(
+            utility.read_user_data("_test", self.vault_dir), expected
+        )
+        with open(self.vault_file, "r") as f:
+            self.assertEqual(json.load(f), expected)
+
+        os.remove(self.vault_file)
+        utility.invalidate_vault_cache()
+        self.assertEqual(
+            utility.read_user_data("_test", self.vault_dir), expected
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
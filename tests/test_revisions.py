@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from network_saver import utility
+from network_saver.files import FILE_MODE
+from network_saver.revisions import *
+
+
+class TestDelta(unittest.TestCase):
+
+    def test_roundtrip(self):
+        base = b"header\nparm 1\nparm 2\nbinary\x00blob\nfooter"
+        target = b"header\nparm 1\nparm 3\nnew line\nbinary\x00blob\nfooter\n"
+        self.assertEqual(apply_delta(base, make_delta(base, target)), target)
+        self.assertEqual(apply_delta(base, make_delta(base, b"")), b"")
+        self.assertEqual(apply_delta(b"", make_delta(b"", target)), target)
+
+
+class TestRevisions(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp()
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "_test")
+        shutil.copytree(fixture, os.path.join(self.vault_dir, "_test"))
+        self.network_file = os.path.join(
+            self.vault_dir, "_test", "network_A.cpio"
+        )
+        with open(self.network_file, "rb") as f:
+            self.original = f.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+
+    def set_retention(self, keep):
+        os.makedirs(utility.get_internal_dir(self.vault_dir), exist_ok=True)
+        with open(
+            os.path.join(utility.get_internal_dir(self.vault_dir), "settings.json"),
+            "w"
+        ) as f:
+            json.dump({"revisions": keep}, f)
+
+    def save(self, contents, notes):
+        record_revision(
+            "network_A", {"notes": notes}, user="_test", vault_dir=self.vault_dir
+        )
+        with open(self.network_file, "wb") as f:
+            f.write(contents)
+
+    def variant(self, i):
+        return self.original + b"\nparm %d\n" % i
+
+    def test_record_and_read(self):
+        saved = [self.original] + [self.variant(i) for i in range(12)]
+        for i, contents in enumerate(saved[1:]):
+            self.save(contents, str(i))
+
+        history = list_revisions("network_A", "_test", self.vault_dir)
+        self.assertEqual(len(history), MAX_REVISIONS)
+        self.assertEqual(history[-1]["revision"], 12)
+        self.assertEqual(history[0]["kind"], "full")
+        for entry in history:
+            self.assertEqual(
+                read_revision(
+                    "network_A", entry["revision"], "_test", self.vault_dir
+                ),
+                saved[entry["revision"] - 1]
+            )
+        history_dir = get_history_dir("network_A", "_test", self.vault_dir)
+        self.assertEqual(len(os.listdir(history_dir)), MAX_REVISIONS + 1)
+        for name in os.listdir(history_dir):
+            self.assertEqual(
+                os.stat(os.path.join(history_dir, name)).st_mode & 0o777,
+                FILE_MODE
+            )
+        with self.assertRaises(ValueError):
+            read_revision("network_A", 1, "_test", self.vault_dir)
+
+    def test_snapshot_interval(self):
+        for i in range(12):
+            self.save(self.variant(i), str(i))
+
+        history = list_revisions("network_A", "_test", self.vault_dir)
+        chain = 0
+        for entry in history:
+            chain = 0 if entry["kind"] == "full" else chain + 1
+            self.assertLess(chain, SNAPSHOT_INTERVAL)
+        self.assertIn("delta", [entry["kind"] for entry in history])
+
+    def test_large_revisions_in_full(self):
+        self.save(self.variant(0), "0")
+        with mock.patch(
+            "network_saver.revisions.MAX_DELTA_SIZE", len(self.original) - 1
+        ), mock.patch("network_saver.revisions.make_delta") as make_delta:
+            self.save(self.variant(1), "1")
+        # not even diffed
+        make_delta.assert_not_called()
+        history = list_revisions("network_A", "_test", self.vault_dir)
+        self.assertEqual([entry["kind"] for entry in history], ["full"] * 2)
+
+    def test_queue(self):
+        # held by another session, so the revision can only be stored once
+        # it lets go
+        lock = lock_history("network_A", "_test", self.vault_dir)
+        lock.acquire()
+        try:
+            future = queue_revision(
+                "network_A", {"notes": "queued"}, "_test", self.vault_dir
+            )
+            with open(self.network_file, "wb") as f:
+                f.write(self.variant(0))
+            self.assertFalse(future.done())
+        finally:
+            lock.release()
+        self.assertEqual(future.result()["data"]["notes"], "queued")
+        self.save(self.variant(1), "recorded")
+        history = list_revisions("network_A", "_test", self.vault_dir)
+        self.assertEqual(
+            [entry["data"]["notes"] for entry in history],
+            ["queued", "recorded"]
+        )
+        self.assertEqual(
+            read_revision("network_A", 1, "_test", self.vault_dir),
+            self.original
+        )
+
+    def test_retention(self):
+        self.set_retention(3)
+        for i in range(5):
+            self.save(self.variant(i), str(i))
+        history = list_revisions("network_A", "_test", self.vault_dir)
+        self.assertEqual([entry["revision"] for entry in history], [3, 4, 5])
+        self.assertEqual(history[0]["kind"], "full")
+        self.assertEqual(
+            read_revision("network_A", 3, "_test", self.vault_dir),
+            self.variant(1)
+        )
+
+        self.set_retention(0)
+        self.assertIsNone(
+            record_revision("network_A", {}, "_test", self.vault_dir)
+        )
+
+    def test_restore(self):
+        self.save(self.variant(0), "changed")
+        restore_revision("network_A", 1, "_test", self.vault_dir)
+        with open(self.network_file, "rb") as f:
+            self.assertEqual(f.read(), self.original)
+        self.assertEqual(
+            utility.read_user_data("_test", self.vault_dir)["network_A"]["notes"],
+            "changed"
+        )
+        history = list_revisions("network_A", "_test", self.vault_dir)
+        self.assertEqual(
+            read_revision("network_A", history[-1]["revision"], "_test",
+                          self.vault_dir),
+            self.variant(0)
+        )
+
+    def test_delete_history(self):
+        self.save(self.variant(0), "changed")
+        delete_history("network_A", "_test", self.vault_dir)
+        self.assertFalse(os.path.isdir(
+            get_history_dir("network_A", "_test", self.vault_dir)
+        ))
+        self.assertEqual(list_revisions("network_A", "_test", self.vault_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
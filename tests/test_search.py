@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from network_saver.search import *
+from network_saver.catalog import list_networks, put_network, delete_network
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_output(self):
+        self.assertEqual(tokenize("My_Rig_v2"), ["my", "rig", "v2"])
+        self.assertEqual(tokenize("19.5.435"), ["19", "5", "435"])
+        self.assertEqual(tokenize("  "), [])
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("_test", "pyro_rig_v2", {
+            "context": "DOP", "notes": "Big smoke plume", "version": "19.5.435"
+        })
+        self.index.add("_test", "flip_tank", {
+            "context": "DOP", "notes": "ocean tank", "version": "20.0.506"
+        })
+        self.index.add("_alan", "pyro_rig_v3", {
+            "context": "SOP", "notes": "", "version": "20.0.506"
+        })
+
+    def test_search(self):
+        self.assertEqual(
+            self.index.search("pyro"),
+            {("_test", "pyro_rig_v2"), ("_alan", "pyro_rig_v3")}
+        )
+        # every term has to prefix-match
+        self.assertEqual(self.index.search("py ri v2"), {("_test", "pyro_rig_v2")})
+        self.assertEqual(self.index.search("dop sm"), {("_test", "pyro_rig_v2")})
+        self.assertEqual(self.index.search("20.0"), {
+            ("_test", "flip_tank"), ("_alan", "pyro_rig_v3")
+        })
+        self.assertEqual(self.index.search("pyro ocean"), set())
+        self.assertEqual(len(self.index.search("")), 3)
+
+    def test_search_user(self):
+        self.assertEqual(
+            self.index.search("pyro", user="_alan"), {("_alan", "pyro_rig_v3")}
+        )
+        self.assertEqual(len(self.index.search("", user="_test")), 2)
+        self.assertEqual(self.index.search("pyro", user="_monty"), set())
+
+    def test_update(self):
+        self.index.add("_test", "flip_tank", {
+            "context": "SOP", "notes": "", "version": "20.0.506"
+        })
+        self.assertEqual(self.index.search("ocean"), set())
+        self.index.remove("_test", "flip_tank")
+        self.assertEqual(self.index.search("flip"), set())
+        self.assertEqual(len(self.index), 2)
+        # removing twice is harmless
+        self.index.remove("_test", "flip_tank")
+
+    def test_sync_user(self):
+        self.index.sync_user("_test", {
+            "flip_tank": {
+                "context": "DOP", "notes": "ocean tank", "version": "20.0.506"
+            },
+            "crowd_sim": {"context": "SOP", "notes": "", "version": "20.0.506"}
+        })
+        self.assertEqual(
+            self.index.search("", user="_test"),
+            {("_test", "flip_tank"), ("_test", "crowd_sim")}
+        )
+        self.assertEqual(len(self.index.search("pyro")), 1)
+
+
+class TestVaultIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.user = "_test"
+        self.vault_dir = tempfile.mkdtemp()
+        shutil.copytree(
+            os.path.join(os.path.dirname(__file__), "fixtures", self.user),
+            os.path.join(self.vault_dir, self.user)
+        )
+
+    def test_catalog_updates(self):
+        self.assertIsNone(get_index(self.vault_dir, create=False))
+        list_networks(user=self.user, vault_dir=self.vault_dir)
+        index = get_index(self.vault_dir)
+        self.assertEqual(len(index), 2)
+
+        put_network(
+            "network_C", {"context": "DOP", "notes": "", "version": "20.0"},
+            user=self.user, vault_dir=self.vault_dir
+        )
+        self.assertEqual(index.search("dop"), {(self.user, "network_C")})
+        delete_network("network_A", user=self.user, vault_dir=self.vault_dir)
+        self.assertEqual(index.search("obj"), set())
+
+    def test_index_vault(self):
+        shutil.copytree(
+            os.path.join(self.vault_dir, self.user),
+            os.path.join(self.vault_dir, "_alan")
+        )
+        index = index_vault(self.vault_dir)
+        self.assertEqual(sorted(index.users), ["_alan", self.user])
+        self.assertEqual(len(index.search("network_b")), 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from network_saver.files import FILE_MODE
+from network_saver.storage import *
+from network_saver.utility import get_internal_dir
+
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp()
+        self.src = os.path.join(
+            os.path.dirname(__file__), "fixtures", "_test", "network_A.cpio"
+        )
+        with open(self.src, 'rb') as f:
+            self.contents = f.read()
+        self.dst = os.path.join(self.vault_dir, "network_A.cpio")
+        self.extracted = os.path.join(self.vault_dir, "OBJ_copy.cpio")
+
+    def _set_compression(self, compression):
+        os.makedirs(get_internal_dir(self.vault_dir), exist_ok=True)
+        with open(os.path.join(get_internal_dir(self.vault_dir), "settings.json"), 'w') as f:
+            json.dump({"compression": compression}, f)
+
+    def test_get_compression(self):
+        self.assertEqual(get_compression(self.vault_dir), "none")
+        self._set_compression("gzip")
+        self.assertEqual(get_compression(self.vault_dir), "gzip")
+        self._set_compression("lzma")
+        with self.assertRaises(ValueError):
+            get_compression(self.vault_dir)
+
+    def test_raw(self):
+        store_network_file(self.src, self.dst)
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(f.read(), self.contents)
+        extract_network_file(self.dst, self.extracted)
+        with open(self.extracted, 'rb') as f:
+            self.assertEqual(f.read(), self.contents)
+
+    def test_gzip(self):
+        store_network_file(self.src, self.dst, "gzip")
+        self.assertLess(os.path.getsize(self.dst), len(self.contents))
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(sniff_compression(f.read(4)), "gzip")
+        self.assertEqual(os.stat(self.dst).st_mode & 0o777, FILE_MODE)
+        extract_network_file(self.dst, self.extracted)
+        with open(self.extracted, 'rb') as f:
+            self.assertEqual(f.read(), self.contents)
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd(self):
+        store_network_file(self.src, self.dst, "zstd")
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(sniff_compression(f.read(4)), "zstd")
+        with open_network_file(self.dst) as f:
+            self.assertEqual(f.read(), self.contents)
+
+    def test_no_partial_files(self):
+        with self.assertRaises(FileNotFoundError):
+            store_network_file("missing.cpio", self.dst, "gzip")
+        self.assertEqual(os.listdir(self.vault_dir), [])
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
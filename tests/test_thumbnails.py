@@ -0,0 +1,73 @@
+import os
+import shutil
+import struct
+import tempfile
+import time
+import unittest
+
+from network_saver.cpio import NodeLayout
+from network_saver.files import FILE_MODE
+from network_saver.thumbnails import *
+
+
+class TestThumbnails(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp()
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "_test")
+        shutil.copytree(fixture, os.path.join(self.vault_dir, "_test"))
+        self.network_file = os.path.join(
+            self.vault_dir, "_test", "network_A.cpio"
+        )
+        self.thumbnail_file = get_thumbnail_file(
+            "network_A", "_test", self.vault_dir
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+
+    def test_render(self):
+        layout = [
+            NodeLayout("box1", "box", (0.0, 1.0), (), False),
+            NodeLayout("null1", "null", (0.0, -1.0), ("box1",), True),
+        ]
+        for nodes in (layout, layout[:1], []):
+            data = render(nodes)
+            self.assertTrue(data.startswith(PNG_SIGNATURE))
+            width, height = struct.unpack(">II", data[16:24])
+            self.assertEqual((width, height), (WIDTH, HEIGHT))
+
+    def test_read_thumbnail(self):
+        self.assertFalse(os.path.isfile(self.thumbnail_file))
+        data = read_thumbnail("network_A", "_test", self.vault_dir)
+        self.assertTrue(data.startswith(PNG_SIGNATURE))
+        self.assertEqual(os.stat(self.thumbnail_file).st_mode & 0o777, FILE_MODE)
+
+        # served from the stored thumbnail while it is current
+        with open(self.thumbnail_file, "wb") as f:
+            f.write(b"cached")
+        self.assertEqual(
+            read_thumbnail("network_A", "_test", self.vault_dir), b"cached"
+        )
+
+        # drawn again once the network is saved over
+        future = time.time() + 10
+        os.utime(self.network_file, (future, future))
+        self.assertEqual(
+            read_thumbnail("network_A", "_test", self.vault_dir), data
+        )
+
+        remove_thumbnail("network_A", "_test", self.vault_dir)
+        remove_thumbnail("network_A", "_test", self.vault_dir)
+        self.assertFalse(os.path.isfile(self.thumbnail_file))
+
+    def test_unreadable(self):
+        self.assertIsNone(read_thumbnail("network_C", "_test", self.vault_dir))
+        with open(self.network_file, "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(read_thumbnail("network_A", "_test", self.vault_dir))
+        self.assertFalse(os.path.isfile(self.thumbnail_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
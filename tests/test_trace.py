@@ -0,0 +1,81 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from network_saver import trace
+from network_saver.cli import main
+from network_saver.utility import get_vault_file, read_network_vault, invalidate_vault_cache
+
+
+class TestTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "trace.jsonl")
+        self.vault_dir = os.path.join(self.tmp_dir, "vault")
+        shutil.copytree(
+            os.path.join(os.path.dirname(__file__), "fixtures", "_test"),
+            os.path.join(self.vault_dir, "_test")
+        )
+        trace.reset()
+
+    def tearDown(self):
+        trace.disable()
+        trace.reset()
+        invalidate_vault_cache()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_disabled(self):
+        trace.disable()
+        with trace.span("test.op") as span:
+            self.assertFalse(span)
+            span.add(bytes=10)
+        self.assertEqual(trace.summary(), [])
+        self.assertFalse(os.path.exists(self.log_file))
+
+    def test_span(self):
+        trace.enable(self.log_file)
+        with trace.span("test.op", path="a") as span:
+            self.assertTrue(span)
+            span.add(bytes=10)
+        with self.assertRaises(KeyError):
+            with trace.span("test.op"):
+                raise KeyError("b")
+
+        records = trace.read_log(self.log_file)
+        self.assertEqual([record["name"] for record in records], ["test.op"] * 2)
+        self.assertEqual(records[0]["path"], "a")
+        self.assertEqual(records[1]["error"], "KeyError")
+
+        row, = trace.summary()
+        self.assertEqual(row["count"], 2)
+        self.assertEqual(row["bytes"], 10)
+        self.assertEqual(row["errors"], 1)
+        self.assertEqual(trace.summarize(records)[0]["count"], 2)
+        self.assertIn("test.op", trace.format_summary(trace.summary()))
+
+    def test_vault_io(self):
+        trace.enable(self.log_file)
+        invalidate_vault_cache()
+        vault_file = get_vault_file(user="_test", vault_dir=self.vault_dir)
+        read_network_vault(vault_file, "r")
+        record, = trace.read_log(self.log_file)
+        self.assertEqual(record["name"], "utility.read_network_vault")
+        self.assertEqual(record["bytes"], os.path.getsize(vault_file))
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = main([
+                "--vault", self.vault_dir, "trace", "--log", self.log_file,
+                "--json"
+            ])
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out.getvalue())[0]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from network_saver import journal, revisions, thumbnails, utility
+from network_saver.files import FILE_MODE
+from network_saver.locks import ConflictError, get_lock_file
+from network_saver.trash import *
+
+
+class TestTrash(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp()
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "_test")
+        shutil.copytree(fixture, os.path.join(self.vault_dir, "_test"))
+        self.user_dir = os.path.join(self.vault_dir, "_test")
+        self.vault_file = utility.get_vault_file("_test", self.vault_dir)
+        self.data = utility.read_user_data("_test", self.vault_dir)
+        utility.invalidate_vault_cache()
+        utility._MIGRATED.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir)
+        utility._MIGRATED.clear()
+
+    def _network_file(self, name):
+        return os.path.join(self.user_dir, name + ".cpio")
+
+    def test_trash_and_restore(self):
+        revisions.record_revision(
+            "network_A", self.data["network_A"], "_test", self.vault_dir
+        )
+        thumbnails.update_thumbnail("network_A", "_test", self.vault_dir)
+
+        entries, skipped = trash_networks(
+            ["network_A", "network_B"], "_test", self.vault_dir
+        )
+        self.assertEqual(skipped, [])
+        self.assertEqual(utility.read_user_data("_test", self.vault_dir), {})
+        # removed as a single change
+        self.assertEqual(
+            [record["op"] for record in journal.read_records(self.vault_file)],
+            ["batch"]
+        )
+        self.assertFalse(os.path.isfile(self._network_file("network_A")))
+        self.assertEqual(
+            revisions.list_revisions("network_A", "_test", self.vault_dir), []
+        )
+        self.assertEqual(
+            [entry["name"] for entry in list_trash(vault_dir=self.vault_dir)],
+            ["network_A", "network_B"]
+        )
+
+        entry_A = entries[0]
+        entry_file = os.path.join(
+            get_trash_dir("_test", self.vault_dir), entry_A["id"], ENTRY_NAME
+        )
+        self.assertEqual(os.stat(entry_file).st_mode & 0o777, FILE_MODE)
+        self.assertEqual(
+            restore_network(entry_A["id"], "_test", self.vault_dir),
+            "network_A"
+        )
+        restored = utility.read_user_data("_test", self.vault_dir)
+        self.assertEqual(list(restored), ["network_A"])
+        self.assertEqual(
+            restored["network_A"]["notes"], self.data["network_A"]["notes"]
+        )
+        self.assertTrue(os.path.isfile(self._network_file("network_A")))
+        self.assertEqual(
+            len(revisions.list_revisions("network_A", "_test", self.vault_dir)),
+            1
+        )
+        self.assertTrue(os.path.isfile(thumbnails.get_thumbnail_file(
+            "network_A", "_test", self.vault_dir
+        )))
+        self.assertEqual(
+            [entry["name"] for entry in list_trash("_test", self.vault_dir)],
+            ["network_B"]
+        )
+        with self.assertRaises(ValueError):
+            restore_network(entry_A["id"], "_test", self.vault_dir)
+
+    def test_restore_conflict(self):
+        entries, _skipped = trash_networks(
+            ["network_B"], "_test", self.vault_dir
+        )
+        utility.put_network_data(
+            "network_B", self.data["network_A"], "_test", self.vault_dir
+        )
+        with self.assertRaises(ConflictError):
+            restore_network(entries[0]["id"], "_test", self.vault_dir)
+        # still trashed, and restorable under another name
+        self.assertEqual(
+            restore_network(
+                entries[0]["id"], "_test", self.vault_dir,
+                network_name="network_C"
+            ),
+            "network_C"
+        )
+        self.assertEqual(
+            utility.get_network_data("network_C", "_test", self.vault_dir)
+            ["notes"],
+            self.data["network_B"]["notes"]
+        )
+        self.assertTrue(os.path.isfile(self._network_file("network_C")))
+
+    def test_skipped(self):
+        entries, skipped = trash_networks(
+            ["network_A", "network_B"], "_test", self.vault_dir,
+            generations={"network_A": 5}
+        )
+        self.assertEqual(skipped, ["network_A"])
+        self.assertEqual([entry["name"] for entry in entries], ["network_B"])
+        self.assertEqual(
+            list(utility.read_user_data("_test", self.vault_dir)),
+            ["network_A"]
+        )
+
+    def test_collect(self):
+        entries, _skipped = trash_networks(
+            ["network_A", "network_B"], "_test", self.vault_dir
+        )
+        self.assertEqual(collect(self.vault_dir), 0)
+
+        # age one entry past the retention
+        entry_dir = os.path.join(
+            get_trash_dir("_test", self.vault_dir), entries[0]["id"]
+        )
+        with open(os.path.join(entry_dir, ENTRY_NAME), "r") as f:
+            entry = json.load(f)
+        entry["trashed"] = time.time() - get_retention(self.vault_dir) - 1
+        with open(os.path.join(entry_dir, ENTRY_NAME), "w") as f:
+            json.dump(entry, f)
+        self.assertEqual(collect(self.vault_dir), 1)
+        self.assertFalse(os.path.isdir(entry_dir))
+
+        # entries another session is restoring are left alone
+        entry_dir = os.path.join(
+            get_trash_dir("_test", self.vault_dir), entries[1]["id"]
+        )
+        with open(get_lock_file(entry_dir), "w") as f:
+            json.dump({"host": "elsewhere", "pid": 1, "time": time.time()}, f)
+        self.assertEqual(collect(self.vault_dir, max_age=0), 0)
+        os.remove(get_lock_file(entry_dir))
+        self.assertEqual(collect(self.vault_dir, max_age=0, batch_size=1), 1)
+        self.assertEqual(list_trash(vault_dir=self.vault_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
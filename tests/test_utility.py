@@ -1,7 +1,9 @@
 
 import json
 import os
+import threading
 import unittest
+from unittest import mock
 
 import hou
 
@@ -46,6 +48,12 @@ class TestGetVaultDir(unittest.TestCase):
         vault_dir = get_vault_dir()
         self.assertTrue(os.path.isdir(vault_dir))
 
+    def test_get_vault_dir_cached(self):
+        vault_dir = get_vault_dir()
+        with mock.patch("builtins.open", wraps=open) as opened:
+            self.assertEqual(get_vault_dir(), vault_dir)
+        self.assertEqual(opened.call_count, 0)
+
 class TestGetUserDir(unittest.TestCase):
 
     @classmethod
@@ -84,6 +92,9 @@ class TestGetVaultFiles(unittest.TestCase):
             "fixtures"
         )
         for user in os.listdir(vault_dir):
+            if user.startswith('.'):
+                # internal vault bookkeeping, e.g. the catalog
+                continue
             vault_file = get_vault_file(user=user, vault_dir=vault_dir)
             self.assertTrue(os.path.isfile(vault_file))
 
@@ -193,6 +204,23 @@ class TestReadNetworkVault(unittest.TestCase):
         with self.assertRaises(ValueError):
             read_network_vault("monty", 'r')
 
+    def test_missing_off_main_thread(self):
+        missing = os.path.join(self.fixture_dir, "_nobody", "networks.json")
+        errors = []
+        def read():
+            try:
+                read_network_vault(missing, 'r')
+            except RuntimeError as err:
+                errors.append(err)
+        with mock.patch.object(hou, "isUIAvailable", return_value=True), \
+                mock.patch.object(hou, "ui") as ui:
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+            # raised for the receiving thread to report instead
+            ui.displayMessage.assert_not_called()
+        self.assertEqual(len(errors), 1)
+
 
 class TestReadUserData(unittest.TestCase):
 